@@ -0,0 +1,58 @@
+# bench_async_sites.py
+# Runs forecast.py's async runtime (--async) for a few cycles against the stub
+# InfluxDB and stub MQTT broker. Checks every site is published while the
+# InfluxDB requests stay at one per cycle, shared by all sites, rather than
+# one per site. Uses the inline AR(2) forecaster so ARIMA fits in the
+# process pool don't stretch the cycles.
+#
+# Run from the repository root: python benchmarks/bench_async_sites.py
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import forecast
+from influx_stub import StubInflux, make_points
+from mqtt_stub import StubBroker
+
+CYCLES = 10
+CYCLE_SECONDS = 0.2
+SITES = ["Summerhouse", "Garden", "Garage", "Loft", "Cellar", "Shed"]
+
+async def run(seconds):
+    try:
+        await asyncio.wait_for(forecast.main_async(), seconds)
+    except asyncio.TimeoutError:
+        pass
+
+def main():
+    now = 1_790_000_000 + 1200
+    influx = StubInflux(make_points(SITES, now, hours=26), now).start()
+    broker = StubBroker().start()
+    forecast.SITES = SITES
+    forecast.cache = forecast.HourlyCache(SITES, forecast.FIELDS)
+    forecast.INFLUXDB_HOST, forecast.INFLUXDB_PORT = "127.0.0.1", influx.port
+    forecast.MQTT_HOST, forecast.MQTT_PORT = "127.0.0.1", broker.port
+    forecast.CYCLE_SECONDS = CYCLE_SECONDS
+    forecast.FORECASTER = "ar2"
+    try:
+        start = time.perf_counter()
+        asyncio.run(run(CYCLES * CYCLE_SECONDS))
+        elapsed = time.perf_counter() - start
+    finally:
+        influx.stop()
+        broker.stop()
+
+    cycles = elapsed / CYCLE_SECONDS
+    requests = influx.requests - 1  # Less the quick current-hour fetch at startup
+    published = {topic.split("/")[1] for topic in broker.retained if topic.startswith("weather/")}
+    assert published >= set(SITES), set(SITES) - published
+    assert requests <= cycles + 1, (requests, cycles)
+    print(f"{len(SITES)} sites, {cycles:.0f} cycles: {requests} InfluxDB requests, {requests / cycles:.1f} per cycle; "
+          f"all sites published")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# bench_card_text.py
+# Redraws the weather_presto.py dashboard (two charts, a forecast card and a
+# current-temperature card) on the stub display and counts measure_text
+# calls and time per frame, with the forecast text changing every tenth
+# frame. Also checks nothing is printed while rendering.
+#
+# Run from the repository root: python benchmarks/bench_card_text.py
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pichart
+from display_stub import StubDisplay
+
+FRAMES = 500
+FORECASTS = ("Stable conditions", "Fair weather, rising pressure", "Rain likely, pressure falling")
+
+def dashboard():
+    display = StubDisplay()
+    container = pichart.Container(display)
+    container.cols = 2
+    for title in ("Pressure (hPa)", "Temp °C"):
+        chart = pichart.Chart(display, title=title, capacity=24)
+        chart.set_values([1000 + n % 5 for n in range(24)])
+        container.add_chart(chart)
+    forecast = pichart.Card(display, title="Forecast")
+    current = pichart.Card(display, title="21.5")
+    container.add_chart(forecast)
+    container.add_chart(current)
+    return display, container, forecast
+
+def main():
+    display, container, forecast = dashboard()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        container.update()
+        display.reset()
+        start = time.perf_counter()
+        for frame in range(FRAMES):
+            forecast.title = FORECASTS[frame // 10 % len(FORECASTS)]
+            for item in container.charts:
+                item.mark_dirty()  # Full redraw every frame
+            container.update()
+        elapsed = (time.perf_counter() - start) / FRAMES
+    assert not output.getvalue(), "render path printed output"
+    print(f"{display.counts['measure_text'] / FRAMES:5.2f} measure_text calls per frame, "
+          f"{elapsed * 1e6:6.0f} us per frame, nothing printed")
+
+if __name__ == "__main__":
+    main()
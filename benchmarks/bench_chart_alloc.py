@@ -0,0 +1,67 @@
+# bench_chart_alloc.py
+# Measures memory allocated while pichart draws, using tracemalloc on the stub
+# display: a full Container redraw (every chart marked dirty) and an idle
+# update. On MicroPython any allocation in these paths is heap churn for the
+# gc.collect() weather_presto.py runs every loop.
+#
+# CPython boxes every int above 256, so a few dozen bytes of short-lived ints
+# show up in the peak that small-int builds of MicroPython do not allocate.
+#
+# Run from the repository root: python benchmarks/bench_chart_alloc.py
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pichart
+from display_stub import StubDisplay
+
+FRAMES = 200
+
+def make_container():
+    display = StubDisplay()
+    container = pichart.Container(display)
+    container.cols = 2
+    for title, values in (("Pressure", [1000 + n % 7 for n in range(24)]),
+                          ("Temp", [20 + n % 5 for n in range(24)])):
+        chart = pichart.Chart(display, title=title, capacity=24)
+        chart.set_values(values)
+        chart.show_lines = chart.show_datapoints = True
+        chart.scale_to_fit = True
+        container.add_chart(chart)
+    container.data_colour = {'red': 255, 'green': 165, 'blue': 0}
+    container.update()  # First frame lays everything out
+    return container
+
+def measure(container, redraw):
+    peaks = []
+    tracemalloc.start()
+    for _ in range(FRAMES):
+        if redraw:
+            for chart in container.charts:
+                chart.mark_dirty()
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        container.update()
+        current, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+    retained = current - before
+    tracemalloc.stop()
+    return max(peaks), sum(peaks) / len(peaks), retained
+
+def main():
+    container = make_container()
+    prims = container._display
+    prims.reset()
+    container.charts[0].mark_dirty()
+    container.charts[1].mark_dirty()
+    container.update()
+    print(f"full redraw: {prims.primitives} primitives per frame")
+    for label, redraw in (("full redraw", True), ("idle update", False)):
+        worst, mean, retained = measure(container, redraw)
+        print(f"{label:<12}: peak {mean:6.0f} B mean, {worst:6.0f} B worst, {retained} B retained after the last frame")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# bench_chart_append.py
+# Streams hourly readings into a pichart.Chart: replacing the whole list with
+# set_values() each time (what weather_presto.py used to do) against a chart
+# created with a capacity and fed with append(). Reports time and allocated
+# bytes per reading, excluding drawing, then checks both charts draw the same.
+# Once a series is decimated, a rolling chart buckets it on absolute sample
+# numbers while a list chart starts at its first value, so the rolling chart
+# is then compared with one rebuilt from the same sample numbers instead.
+#
+# Run from the repository root: python benchmarks/bench_chart_append.py
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pichart
+from display_stub import StubDisplay
+
+CAPACITIES = (24, 240, 1440)
+READINGS = 2000
+
+def reading(n):
+    # Multiples of 0.25 survive the float32 ring buffer exactly
+    return 1000 + (n * 37 % 97) * 0.25
+
+def make_chart(capacity=None):
+    chart = pichart.Chart(StubDisplay(), title="Pressure", capacity=capacity)
+    chart.width, chart.height = 240, 240
+    chart.scale_to_fit = True
+    return chart
+
+def rebuilt(capacity, last):
+    """ A rolling chart given readings up to last without the incremental path """
+    chart = make_chart(capacity)
+    for n in range(capacity, last):
+        chart.values.append(reading(n))  # Same absolute sample numbers as the stream
+    chart._scale_data()
+    return chart
+
+def stream_list(chart, capacity, start):
+    values = [reading(n) for n in range(start - capacity, start)]
+    for n in range(start, start + READINGS):
+        values = values[1:] + [reading(n)]
+        chart.set_values(values)
+        chart._layout()
+
+def stream_ring(chart, capacity, start):
+    for n in range(start, start + READINGS):
+        chart.append(reading(n))
+        chart._layout()
+
+def measure(stream, chart, capacity):
+    stream(chart, capacity, capacity)  # Warm up, fill the buffer
+    start = time.perf_counter()
+    stream(chart, capacity, capacity + READINGS)
+    elapsed = (time.perf_counter() - start) / READINGS
+    tracemalloc.start()
+    stream(chart, capacity, capacity + 2 * READINGS)
+    allocated = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, allocated
+
+def drawn(chart):
+    chart._display.record = True
+    chart._display.reset()
+    chart.draw()
+    return [call for call in chart._display.calls if call[0] not in ("create_pen", "measure_text")]
+
+def main():
+    print(f"{'capacity':>8} | {'set_values':>24} | {'append':>24}")
+    for capacity in CAPACITIES:
+        listed, ringed = make_chart(), make_chart(capacity)
+        list_time, list_bytes = measure(stream_list, listed, capacity)
+        ring_time, ring_bytes = measure(stream_ring, ringed, capacity)
+        assert list(ringed.values) == listed.values
+        ring_calls = drawn(ringed)
+        if ringed._buckets is None:
+            assert ring_calls == drawn(listed)
+        else:
+            assert ring_calls == drawn(rebuilt(capacity, capacity + 3 * READINGS))
+        print(f"{capacity:>8} | {list_time * 1e6:8.1f} us {list_bytes:8d} B peak | "
+              f"{ring_time * 1e6:8.1f} us {ring_bytes:8d} B peak")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# bench_chart_decimation.py
+# Frame time of a 240-pixel pichart.Chart as the series grows, drawing one
+# primitive per value (as Chart.update() used to) against the min/max column
+# decimation. Then streams readings into a rolling chart of each length and
+# checks the incrementally maintained columns match a from-scratch rebuild.
+#
+# Run from the repository root: python benchmarks/bench_chart_decimation.py
+
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pichart
+from display_stub import StubDisplay
+
+LENGTHS = (240, 1000, 10_000, 100_000)
+FRAMES = 20
+APPENDS = 200
+
+class EveryPointChart(pichart.Chart):
+    """ Draws every value, one primitive each, however many there are """
+    def _layout_columns(self, x_pos, plot_area_width, plot_area_height):
+        last = len(self.values) - 1
+        lo, hi = self._min_val, self._max_val
+        self._xs = [x_pos + i * plot_area_width // last for i in range(len(self.values))]
+        self._heights = [int(self.map_value(v, lo, hi, 0, plot_area_height)) for v in self.values]
+        self._sources = None
+
+def reading(n):
+    # A week of minute data: daily cycle, a storm dip and quantised noise
+    value = 1012 + 6 * math.sin(n / 1440 * 2 * math.pi) - 15 * math.exp(-((n % 10_080 - 6000) / 300) ** 2)
+    return round(value * 4 + (n * 7919 % 13 - 6) * 0.3) / 4  # Exact in float32
+
+def make_chart(chart_class, length, capacity=None):
+    chart = chart_class(StubDisplay(), title="Pressure", capacity=capacity)
+    chart.width, chart.height = 240, 240
+    chart.show_bars = False
+    chart.show_lines = True
+    chart.scale_to_fit = True
+    chart.set_values([reading(n) for n in range(length)])
+    return chart
+
+def frame_time(chart):
+    chart.draw()  # Lay out once
+    chart._display.reset()
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        chart.mark_dirty()
+        chart.draw()
+    return (time.perf_counter() - start) / FRAMES, chart._display.primitives / FRAMES
+
+def drawn(chart):
+    chart._display.record = True
+    chart._display.reset()
+    chart.draw()
+    chart._display.record = False
+    return [call for call in chart._display.calls if call[0] not in ("create_pen", "measure_text")]
+
+def stream(length):
+    """ Time append + draw on a full rolling chart, then compare with a rebuild """
+    chart = make_chart(pichart.Chart, length, capacity=length)
+    chart.draw()
+    start = time.perf_counter()
+    for n in range(length, length + APPENDS):
+        chart.append(reading(n))
+        chart.draw()
+    elapsed = (time.perf_counter() - start) / APPENDS
+
+    rebuilt = pichart.Chart(StubDisplay(), title="Pressure", capacity=length)
+    rebuilt.width, rebuilt.height = 240, 240
+    rebuilt.show_bars, rebuilt.show_lines, rebuilt.scale_to_fit = False, True, True
+    for n in range(length + APPENDS):
+        rebuilt.values.append(reading(n))  # Same absolute sample numbers, no incremental path
+    rebuilt._scale_data()
+    assert drawn(chart) == drawn(rebuilt), length
+    return elapsed
+
+def main():
+    print(f"{'points':>7} | {'every point':>22} | {'min/max columns':>22} | {'append + draw':>14}")
+    for length in LENGTHS:
+        every_time, every_prims = frame_time(make_chart(EveryPointChart, length))
+        column_time, column_prims = frame_time(make_chart(pichart.Chart, length))
+        append_time = stream(length)
+        print(f"{length:>7} | {every_time * 1000:8.2f} ms {every_prims:7.0f} pr | "
+              f"{column_time * 1000:8.2f} ms {column_prims:7.0f} pr | {append_time * 1000:11.2f} ms")
+
+if __name__ == "__main__":
+    main()
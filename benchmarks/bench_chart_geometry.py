@@ -0,0 +1,127 @@
+# bench_chart_geometry.py
+# Times pichart.Chart redraws against a counting stub display, with the point
+# geometry recomputed every frame (as Chart.update() used to) and replayed
+# from the layout cache, and the layout step on its own. Also times changing one value with set_value()
+# against replacing the whole list with set_values(). Checks every variant
+# issues exactly the same drawing calls, and that values edited in place are
+# picked up by mark_dirty() and by passing the edited list to set_values().
+#
+# Run from the repository root: python benchmarks/bench_chart_geometry.py
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pichart
+from display_stub import StubDisplay
+
+LENGTHS = (24, 120, 240)
+FRAMES = 300
+
+def make_chart(display, length):
+    random.seed(length)
+    chart = pichart.Chart(display, title="Pressure (hPa)")
+    chart.set_values([round(1010 + random.uniform(-8, 8), 1) for _ in range(length)])
+    chart.width, chart.height = 240, 240
+    chart.show_lines = True
+    chart.show_datapoints = True
+    chart.scale_to_fit = True
+    return chart
+
+def time_frames(chart, before_frame):
+    display = chart._display
+    display.reset()
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        before_frame(chart, frame)
+        chart.draw()
+    elapsed = (time.perf_counter() - start) / FRAMES
+    return elapsed, display.primitives / FRAMES
+
+def recorded(chart):
+    chart._display.record = True
+    chart._display.reset()
+    chart.draw()
+    chart._display.record = False
+    return [call for call in chart._display.calls if call[0] not in ("create_pen", "measure_text")]
+
+def uncached(chart, frame):
+    chart._layout_key = None
+
+def cached(chart, frame):
+    pass
+
+def one_value_incremental(chart, frame):
+    index = frame % (len(chart.values) - 2) + 1
+    chart.set_value(index, (chart._min_val + chart._max_val) / 2 + frame % 3 * 0.1)
+
+def one_value_full(chart, frame):
+    index = frame % (len(chart.values) - 2) + 1
+    values = list(chart.values)
+    values[index] = (chart._min_val + chart._max_val) / 2 + frame % 3 * 0.1
+    chart.set_values(values)
+
+def time_layout(length, invalidate):
+    chart = make_chart(StubDisplay(), length)
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        if invalidate:
+            chart._layout_key = None
+        chart._layout()
+    return (time.perf_counter() - start) / FRAMES
+
+def edited_in_place(length):
+    chart = make_chart(StubDisplay(), length)
+    chart.draw()
+    chart.values[length // 2] = chart._max_val + 5  # Past the old range
+    chart.mark_dirty()
+    reference = make_chart(StubDisplay(), length)
+    reference.set_values(list(chart.values))
+    assert recorded(chart) == recorded(reference), length
+
+def list_edited_in_place(length):
+    values = [round(1010 + n % 7 * 0.5, 1) for n in range(length)]
+    chart = make_chart(StubDisplay(), length)
+    chart.set_values(values)
+    chart.draw()
+    values[length // 2] = 1030
+    chart.set_values(values)
+    assert chart.dirty, length
+    reference = make_chart(StubDisplay(), length)
+    reference.set_values(list(values))
+    assert recorded(chart) == recorded(reference), length
+    chart.set_values(values)
+    assert not chart.dirty, length
+
+def main():
+    for length in LENGTHS:
+        edited_in_place(length)
+        list_edited_in_place(length)
+    print("values edited in place: mark_dirty() and set_values() draw as a fresh chart")
+
+    print("\nlayout step per frame")
+    for length in LENGTHS:
+        print(f"{length:>6} points | recomputed {time_layout(length, True) * 1e6:6.1f} us"
+              f" | cached {time_layout(length, False) * 1e6:6.1f} us")
+
+    print("\nframe time and primitives per frame")
+    print(f"{'points':>6} | {'uncached':>17} | {'cached':>17} | {'set_values + draw':>17} | {'set_value + draw':>17}")
+    for length in LENGTHS:
+        results = []
+        for before_frame in (uncached, cached, one_value_full, one_value_incremental):
+            chart = make_chart(StubDisplay(), length)
+            results.append(time_frames(chart, before_frame))
+            if before_frame is cached:
+                reference = make_chart(StubDisplay(), length)
+                assert recorded(chart) == recorded(reference)
+            elif before_frame is one_value_incremental:
+                reference = make_chart(StubDisplay(), length)
+                reference.set_values(list(chart.values))
+                assert recorded(chart) == recorded(reference)
+        print(f"{length:>6} | " + " | ".join(f"{seconds * 1e6:7.0f} us {prims:5.0f} pr" for seconds, prims in results))
+
+if __name__ == "__main__":
+    main()
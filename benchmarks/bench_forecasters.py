@@ -0,0 +1,85 @@
+# bench_forecasters.py
+# Backtests every engine in forecast.FORECASTERS over hourly pressure series.
+# Each rolling 25-hour window is forecast FORECAST_STEPS ahead and turned into
+# an interpret_weather() category. Reports fit latency, peak memory per fit,
+# and how often each engine lands in the same category as ARIMA.
+#
+# Run from the repository root:
+#   python benchmarks/bench_forecasters.py [series.json ...]
+# Each JSON file holds a list of hourly mean pressures, oldest first, e.g. a
+# dump of the weather/<location>/pressure history. Without files, a month of
+# synthetic data is used.
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+
+import forecast
+
+WINDOW = 25  # Hourly buckets per forecast, as published
+MEMORY_SAMPLES = 50  # Windows fitted again under tracemalloc
+
+def synthetic_series(hours=24 * 30, seed=7):
+    """ Pressure with weather-system swings, a daily tide and sensor noise """
+    rng = np.random.default_rng(seed)
+    t = np.arange(hours)
+    systems = np.cumsum(rng.normal(0, 0.35, hours))
+    systems -= np.convolve(systems, np.ones(72) / 72, mode="same") * 0.5
+    tide = 0.6 * np.sin(2 * np.pi * t / 12)
+    return np.round(1013 + systems + tide + rng.normal(0, 0.1, hours), 1)
+
+def backtest(engine, series):
+    """ Return (categories, mean fit seconds, peak fit bytes) for one engine """
+    windows = [series[end - WINDOW:end] for end in range(WINDOW, len(series) + 1)]
+    categories = []
+    fit_time = 0.0
+    for values in windows:
+        start = time.perf_counter()
+        predicted, _ = engine.fit(values, forecast.FORECAST_STEPS)
+        fit_time += time.perf_counter() - start
+        categories.append(forecast.interpret_weather(values[-1], round(predicted, 1)))
+
+    # Memory is measured separately, tracemalloc slows allocation-heavy fits
+    peak = 0
+    for values in windows[:MEMORY_SAMPLES]:
+        tracemalloc.start()
+        engine.fit(values, forecast.FORECAST_STEPS)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return categories, fit_time / len(windows), peak
+
+def main(paths):
+    if paths:
+        series = [np.asarray(json.load(open(path)), dtype=float) for path in paths]
+    else:
+        series = [synthetic_series()]
+
+    results = {}
+    for name, engine_class in forecast.FORECASTERS.items():
+        engine = engine_class()
+        engine.fit(series[0][:WINDOW], forecast.FORECAST_STEPS)  # Warm up imports
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # statsmodels convergence chatter
+            runs = [backtest(engine, values) for values in series]
+        results[name] = (
+            [category for categories, _, _ in runs for category in categories],
+            sum(latency for _, latency, _ in runs) / len(runs),
+            max(peak for _, _, peak in runs),
+        )
+
+    reference = results["arima"][0]
+    print(f"{len(reference)} forecasts over {len(series)} series, {forecast.FORECAST_STEPS} h ahead")
+    print(f"{'engine':<8} {'fit latency':>12} {'peak memory':>12} {'agrees with ARIMA':>18}")
+    for name, (categories, latency, peak) in results.items():
+        agreement = sum(a == b for a, b in zip(categories, reference)) / len(reference)
+        print(f"{name:<8} {latency * 1e6:>9.0f} us {peak / 1024:>9.1f} KiB {agreement:>17.1%}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
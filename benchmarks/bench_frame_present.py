@@ -0,0 +1,89 @@
+# bench_frame_present.py
+# Checks that pichart presents each frame exactly once on the stub display:
+# one present per Container.update() however many tiles it redraws, none
+# while a caller's frame is open, and a closed frame after every update,
+# including on an empty container. Also counts the presents per dashboard
+# frame with and without a partial_update() presenter.
+#
+# Run from the repository root: python benchmarks/bench_frame_present.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pichart
+from display_stub import StubDisplay
+
+class Presenter:
+    """ Stands in for Presto, counting full and partial presents """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.updates = 0
+        self.partial = []
+
+    def update(self):
+        self.updates += 1
+
+    def partial_update(self, x, y, w, h):
+        self.partial.append((x, y, w, h))
+
+def chart(display, n):
+    return pichart.Chart(display, title=f"Chart {n}", values=[n, n + 2, n + 1, n + 3])
+
+def empty_container():
+    display = StubDisplay()
+    container = pichart.Container(display)
+    assert container.update() is False
+    assert not pichart.frame_open(display), "empty update left the frame open"
+    assert display.counts["update"] == 0
+    container.add_chart(chart(display, 0))
+    assert container.update() is True
+    assert not pichart.frame_open(display)
+    assert display.counts["update"] == 1, "chart added after an empty update was not presented"
+    print("empty container: no frame left open, later charts presented once")
+
+def caller_frame():
+    display = StubDisplay()
+    container = pichart.Container(display)
+    for n in range(4):
+        container.add_chart(chart(display, n))
+    pichart.begin_frame(display)
+    container.update()
+    assert pichart.frame_open(display) and display.counts["update"] == 0
+    assert pichart.end_frame(display) is True
+    assert not pichart.frame_open(display) and display.counts["update"] == 1
+    print("caller's frame: container draws without presenting, end_frame() presents once")
+
+def presents(tiles, changed, presenter):
+    display = StubDisplay()
+    container = pichart.Container(display, presenter=presenter)
+    container.cols = 3
+    for n in range(tiles):
+        container.add_chart(chart(display, n))
+    container.update()
+    display.reset()
+    if presenter is not None:
+        presenter.reset()
+    for item in container.charts[:changed]:
+        item.mark_dirty()
+    container.update()
+    assert not pichart.frame_open(display)
+    if presenter is None:
+        return display.counts["update"], 0
+    return presenter.updates, len(presenter.partial)
+
+def main():
+    empty_container()
+    caller_frame()
+    for changed in (1, 3, 9):
+        full, _ = presents(9, changed, None)
+        updates, partial = presents(9, changed, Presenter())
+        assert full == 1 and updates + partial == 1
+        print(f"9 tiles, {changed} changed | display: {full} update | presenter: {updates} update, {partial} partial_update")
+
+if __name__ == "__main__":
+    main()
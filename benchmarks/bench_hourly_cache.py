@@ -0,0 +1,76 @@
+# bench_hourly_cache.py
+# Drives forecast.HourlyCache against the stub InfluxDB for a few simulated
+# hours, checking every cycle that the whole series, including the partial
+# oldest bucket the forecast model sees, match a fresh 24h query.
+# Reports response bytes and raw points scanned per cycle for both, and the
+# part of the cached response that is per-series JSON framing. InfluxDB 1.x
+# sends that framing however few rows there are, so it caps the byte cut.
+#
+# Run from the repository root: python benchmarks/bench_hourly_cache.py
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+from influxdb import InfluxDBClient
+
+import forecast
+from influx_stub import HOUR, StubInflux, make_points
+
+CYCLE_SECONDS = 5
+SIMULATED_HOURS = 3
+
+def measure(stub, totals, fetch, *args):
+    stub.bytes_sent = stub.points_scanned = 0
+    frame = fetch(*args)
+    totals["bytes"] += stub.bytes_sent
+    totals["points"] += stub.points_scanned
+    return frame
+
+def framing_bytes(stub, cache):
+    """ Size of a cached-refresh response with every row removed """
+    answer = stub.answer("; ".join(query for query, _ in cache.queries()), "s")
+    for result in answer["results"]:
+        for series in result.get("series", []):
+            series["values"] = []
+    return len(json.dumps(answer).encode())
+
+def main():
+    start = 1_790_000_000 + 1200
+    end = start + SIMULATED_HOURS * HOUR
+    stub = StubInflux(make_points(forecast.SITES, end, hours=24 + SIMULATED_HOURS + 2), start).start()
+    forecast.client = InfluxDBClient(host="127.0.0.1", port=stub.port, database="weather")
+    cache = forecast.HourlyCache(forecast.SITES, forecast.FIELDS)
+
+    cached = {"bytes": 0, "points": 0}
+    full = {"bytes": 0, "points": 0}
+    cycles = 0
+    try:
+        while stub.now < end:
+            cached_frame = measure(stub, cached, cache.refresh)
+            frame = measure(stub, full, forecast.fetch_hourly, forecast.SITES, forecast.FIELDS)
+
+            for location in forecast.SITES:
+                for field in forecast.FIELDS:
+                    a = forecast.get_hourly_data(cached_frame, location, field)
+                    b = forecast.get_hourly_data(frame, location, field)
+                    assert np.array_equal(a.values, b.values, equal_nan=True), (stub.now, location, field)
+                    assert np.array_equal(a.times, b.times), (stub.now, location, field)
+            cycles += 1
+            stub.now += CYCLE_SECONDS
+        framing = framing_bytes(stub, cache)
+    finally:
+        stub.stop()
+
+    print(f"{cycles} cycles over {SIMULATED_HOURS} h, series identical to the full query, oldest bucket included")
+    print(f"full 24h query : {full['bytes'] / cycles:8.0f} B/cycle {full['points'] / cycles:8.0f} points scanned/cycle")
+    print(f"hourly cache   : {cached['bytes'] / cycles:8.0f} B/cycle {cached['points'] / cycles:8.0f} points scanned/cycle")
+    print(f"reduction      : {full['bytes'] / cached['bytes']:8.1f}x bytes {full['points'] / cached['points']:8.1f}x points")
+    print(f"series framing : {framing:8d} B of each cached response, "
+          f"so even empty rows would cap the byte cut at {full['bytes'] / cycles / framing:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# bench_image_tile.py
+# Redraws a row of weather icon tiles every frame against a counting stub
+# display and jpegdec stub: the old ImageTile draw (new decoder, file opened
+# from flash, always half scale) against the cached one, on a display without
+# a framebuffer and on one with a byte framebuffer the decoded pixels are
+# copied back from. Reports decoders created, file reads, bytes read, decodes
+# and decoded pixels per frame, and frame time. One tile changes icon every
+# 10 frames. Frame time on the framebuffer display includes its own
+# rasterising, so only its counts compare. Checks a redraw restores exactly
+# the pixels a decode wrote.
+#
+# Run from the repository root: python benchmarks/bench_image_tile.py
+
+import builtins
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pichart
+import jpegdec_stub
+from display_stub import FakePicoGraphics, StubDisplay
+
+ICONS = ("sun", "cloud", "rain", "storm")
+ICON_SIZE = (200, 200)
+TILE_SIZE = 96
+FRAMES = 500
+
+def legacy_draw(tile):
+    """ The ImageTile draw pichart used to do """
+    j = jpegdec_stub.JPEG(tile._display)
+    j.open_file(tile.filename)
+    tile._display.set_clip(tile.x, tile.y, tile.x + tile.width, tile.y + tile.height)
+    j.decode(tile.x, tile.y, jpegdec_stub.JPEG_SCALE_HALF)
+    tile._display.remove_clip()
+    tile.draw_border()
+
+def counting_open(filename, mode="r"):
+    f = builtins.open(filename, mode)
+    if "b" in mode:
+        jpegdec_stub.counts["file_reads"] += 1
+        jpegdec_stub.counts["bytes_read"] += os.path.getsize(filename)
+    return f
+
+def fake_framebuffer(display):
+    """ pichart.framebuffer for FakePicoGraphics: its NumPy framebuffer as bytes """
+    if getattr(display, "framebuffer", None) is None:
+        return None
+    return memoryview(display.framebuffer).cast("B")
+
+def run(paths, draw, display):
+    tiles = [pichart.ImageTile(display, paths[i], x=i * TILE_SIZE, width=TILE_SIZE, height=TILE_SIZE)
+             for i in range(len(paths))]
+    pichart._jpeg_files.clear()
+    del pichart._jpeg_order[:]
+    pichart._jpeg_bytes = 0
+    jpegdec_stub.reset()
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        if frame % 10 == 9:
+            tiles[0].filename = paths[frame // 10 % len(paths)]
+        for tile in tiles:
+            draw(tile)
+    elapsed = (time.perf_counter() - start) / FRAMES
+    return elapsed, {name: count / FRAMES for name, count in jpegdec_stub.counts.items()}
+
+def restored(paths):
+    """ Decode each tile, wipe the framebuffer, redraw: the image must come back """
+    display = FakePicoGraphics(framebuffer=True)
+    tiles = [pichart.ImageTile(display, paths[i], x=i * TILE_SIZE, width=TILE_SIZE, height=TILE_SIZE)
+             for i in range(len(paths))]
+    jpegdec_stub.reset()
+    for tile in tiles:
+        tile.draw()
+    decoded = display.framebuffer.copy()
+    display.framebuffer[:] = 0
+    for tile in tiles:
+        tile.draw()
+    assert jpegdec_stub.counts["decodes"] == len(tiles)
+    assert (display.framebuffer == decoded).all()
+    print("redraw after wiping the framebuffer restores the decoded pixels without decoding")
+
+def main():
+    pichart.jpegdec = jpegdec_stub
+    pichart.open = counting_open
+    pichart.framebuffer = fake_framebuffer
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for name in ICONS:
+            path = os.path.join(directory, name + ".jpg")
+            with open(path, "wb") as f:
+                f.write(jpegdec_stub.make_jpeg(*ICON_SIZE))
+            paths.append(path)
+
+        print(f"{len(paths)} tiles of {TILE_SIZE}x{TILE_SIZE}, {ICON_SIZE[0]}x{ICON_SIZE[1]} icons, per frame")
+        for label, draw, display in (("legacy", legacy_draw, StubDisplay()),
+                                     ("cached", pichart.ImageTile.draw, StubDisplay()),
+                                     ("copied", pichart.ImageTile.draw, FakePicoGraphics(framebuffer=True))):
+            elapsed, counts = run(paths, draw, display)
+            print(f"{label:>6} | {elapsed * 1e6:6.1f} us | " +
+                  " | ".join(f"{name} {value:8.2f}" for name, value in counts.items()))
+        restored(paths)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# bench_influx_query.py
+# Compares the old one-query-per-site-and-field fetch with forecast.fetch_hourly()
+# against a local stub InfluxDB endpoint. Checks both return the same series
+# and reports round trips, response bytes and time per cycle.
+#
+# Run from the repository root: python benchmarks/bench_influx_query.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+import pandas as pd
+from influxdb import InfluxDBClient
+
+import forecast
+from influx_stub import StubInflux, make_points
+
+CYCLES = 20
+SITE_COUNTS = (2, 8, 32)
+
+def legacy_fetch(client, location, field):
+    """ The per-site, per-field query and DataFrame build forecast.py used to run """
+    query = f"""
+        SELECT MEAN("{field}") AS "{field}"
+        FROM "weather"
+        WHERE "location" = '{location}'
+        AND time > now() - 24h
+        GROUP BY time(1h)
+        ORDER BY time ASC
+    """
+    result = client.query(query)
+    data = list(result.get_points())
+    df = pd.DataFrame(data)
+    df["time"] = pd.to_datetime(df["time"])
+    df.set_index("time", inplace=True)
+    df = df.sort_index()
+    return df[field].round(1)
+
+def run(site_count):
+    locations = [f"Site{n}" for n in range(site_count)]
+    now = 1_790_000_000 + 1800
+    stub = StubInflux(make_points(locations, now), now).start()
+    client = InfluxDBClient(host="127.0.0.1", port=stub.port, database="weather")
+    forecast.client = client
+    try:
+        start = time.perf_counter()
+        for _ in range(CYCLES):
+            legacy = {(loc, field): legacy_fetch(client, loc, field)
+                      for loc in locations for field in forecast.FIELDS}
+        legacy_time = (time.perf_counter() - start) / CYCLES
+        legacy_requests, legacy_bytes = stub.requests / CYCLES, stub.bytes_sent / CYCLES
+
+        stub.requests = stub.bytes_sent = 0
+        start = time.perf_counter()
+        for _ in range(CYCLES):
+            frame = forecast.fetch_hourly(locations, forecast.FIELDS)
+        batched_time = (time.perf_counter() - start) / CYCLES
+        batched_requests, batched_bytes = stub.requests / CYCLES, stub.bytes_sent / CYCLES
+
+        for (location, field), series in legacy.items():
+            batched = forecast.get_hourly_data(frame, location, field)
+            assert np.array_equal(series.to_numpy(), batched.values, equal_nan=True), (location, field)
+            assert (series.index.as_unit("s").asi8 == batched.times).all(), (location, field)
+    finally:
+        stub.stop()
+
+    print(f"{site_count:>5} sites | legacy {legacy_requests:4.0f} req {legacy_bytes:8.0f} B {legacy_time * 1000:7.1f} ms"
+          f" | batched {batched_requests:4.0f} req {batched_bytes:8.0f} B {batched_time * 1000:7.1f} ms")
+
+if __name__ == "__main__":
+    for site_count in SITE_COUNTS:
+        run(site_count)
@@ -0,0 +1,84 @@
+# bench_mqtt_drain.py
+# Replays weather_presto.py's main loop, one MQTT poll per one-second tick,
+# against the stub broker while forecast.py publishes its five-topic burst.
+# Counts the ticks until the whole burst is applied with one check_msg() per
+# tick and with one drain() per tick. Then feeds drain() a packet split across
+# calls and checks it is delivered once, intact.
+#
+# Run from the repository root: python benchmarks/bench_mqtt_drain.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import umqttsimple
+import usocket_shim
+from mqtt_stub import StubBroker, publish_packet
+
+BURST = [
+    ("weather/pressure", '{"last_24_pressures": [1012.5, 1012.7]}'),
+    ("weather/current_pressure", '{"current_pressure": 1012.7}'),
+    ("weather/temperature", '{"last_24_temperatures": [20.1, 20.4]}'),
+    ("weather/current_temperature", '{"current_temperature": 20.4}'),
+    ("weather/prediction", "Stable conditions"),
+]
+BURSTS = 20
+
+def client_for(broker, received):
+    client = umqttsimple.MQTTClient("bench", "127.0.0.1", port=broker.port)
+    client.set_callback(lambda topic, msg: received.append((topic, msg)))
+    client.connect()
+    client.subscribe(b"weather/#")
+    return client
+
+def ticks_to_apply(broker, poll):
+    received = []
+    client = client_for(broker, received)
+    ticks = 0
+    elapsed = 0.0
+    for _ in range(BURSTS):
+        del received[:]
+        for topic, payload in BURST:
+            broker.broadcast(topic, payload)
+        time.sleep(0.01)  # Let the burst land, as it would during a tick's sleep(1)
+        while len(received) < len(BURST):
+            start = time.perf_counter()
+            poll(client)
+            elapsed += time.perf_counter() - start
+            ticks += 1
+    client.disconnect()
+    return ticks / BURSTS, elapsed / ticks
+
+def split_packet(broker):
+    received = []
+    client = client_for(broker, received)
+    packet = publish_packet("weather/prediction", "Rain likely, pressure falling")
+    session = broker._sessions[0]
+    for cut in (1, 2, 10, len(packet) - 1):
+        del received[:]
+        session.send(packet[:cut])
+        time.sleep(0.01)
+        assert client.drain() == 0 and not received
+        session.send(packet[cut:] + packet)
+        time.sleep(0.01)
+        assert client.drain() == 2
+        assert received == [(b"weather/prediction", b"Rain likely, pressure falling")] * 2
+    client.disconnect()
+    print("packets split after 1, 2, 10 and all but one byte delivered once each, intact")
+
+def main():
+    umqttsimple.socket = usocket_shim
+    broker = StubBroker().start()
+    try:
+        print(f"{len(BURST)}-message burst, one poll per 1 s tick")
+        for label, poll in (("check_msg", lambda c: c.check_msg()), ("drain", lambda c: c.drain())):
+            ticks, per_poll = ticks_to_apply(broker, poll)
+            print(f"{label:>9} | {ticks:4.1f} ticks (~{ticks:.0f} s) to apply | {per_poll * 1e6:6.1f} us per poll")
+        split_packet(broker)
+    finally:
+        broker.stop()
+
+if __name__ == "__main__":
+    main()
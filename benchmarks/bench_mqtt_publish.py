@@ -0,0 +1,110 @@
+# bench_mqtt_publish.py
+# Compares the old connect / publish x5 / disconnect cycle with
+# forecast.MQTTPublisher against the in-process stub broker. Then takes the
+# broker down for several cycles to check nothing queues up during the
+# outage and, after reconnecting, only the latest payload per topic is sent.
+#
+# Run from the repository root: python benchmarks/bench_mqtt_publish.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import paho.mqtt.client as mqtt
+
+import forecast
+from mqtt_stub import StubBroker
+
+CYCLES = 200
+OUTAGE_CYCLES = 20
+
+def messages(cycle):
+    return [
+        ("weather/pressure", f'{{"last_24_pressures": [{cycle}]}}'),
+        ("weather/current_pressure", f'{{"current_pressure": {cycle}}}'),
+        ("weather/temperature", f'{{"last_24_temperatures": [{cycle}]}}'),
+        ("weather/current_temperature", f'{{"current_temperature": {cycle}}}'),
+        ("weather/prediction", f"Stable conditions {cycle}"),
+    ]
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError
+        time.sleep(0.01)
+
+def legacy(broker):
+    """ The per-cycle connection forecast.py used to make """
+    client = mqtt.Client(callback_api_version=mqtt.CallbackAPIVersion.VERSION2, protocol=mqtt.MQTTv311)
+    start = time.perf_counter()
+    for cycle in range(CYCLES):
+        client.connect("127.0.0.1", broker.port)
+        for topic, payload in messages(cycle):
+            client.publish(topic, payload)
+        client.disconnect()
+    return (time.perf_counter() - start) / CYCLES * 1000
+
+def persistent(broker):
+    publisher = forecast.MQTTPublisher("127.0.0.1", broker.port)
+    publisher.start()
+    publisher.connected.wait(10)
+    start = time.perf_counter()
+    for cycle in range(CYCLES):
+        sent = messages(cycle)
+        assert publisher.publish(sent) == sent
+    elapsed = (time.perf_counter() - start) / CYCLES * 1000
+    stats = dict(publisher.stats)
+    outage(broker, publisher)
+    publisher.stop()
+    return elapsed, stats
+
+def outage(broker, publisher):
+    """ Run cycles as forecast.publish_changes does while the broker is down """
+    tracker = forecast.PublishTracker()
+
+    def cycle(n):
+        delivered = publisher.publish(tracker.changed(messages(n)))
+        tracker.mark_sent(delivered)
+        return delivered
+
+    assert len(cycle(0)) == 5
+    broker.refusing = True
+    broker.drop_clients()
+    wait_for(lambda: not publisher.connected.is_set())
+    publisher.timeout = 0.2
+    for n in range(1, OUTAGE_CYCLES + 1):
+        assert cycle(n) == []
+        assert len(publisher._client._out_messages) <= forecast.MQTT_MAX_QUEUED
+    queued = len(publisher._client._out_messages)
+
+    broker.refusing = False
+    before = len(broker.published)
+    publisher.timeout = 20
+    latest = messages(OUTAGE_CYCLES + 1)
+    assert cycle(OUTAGE_CYCLES + 1) == latest
+    time.sleep(0.5)
+    resent = broker.published[before:]
+    assert [(topic, payload.decode()) for topic, payload, _, _ in resent] == latest, resent
+    print(f"{OUTAGE_CYCLES} cycles with the broker down: {queued} messages queued, "
+          f"{len(resent)} sent on reconnect, the latest payload for each topic")
+
+def main():
+    broker = StubBroker().start()
+    try:
+        legacy_ms = legacy(broker)
+        time.sleep(0.5)  # Let the broker finish with the last connections
+        legacy_connections = broker.connections
+        broker.connections = 0
+        persistent_ms, stats = persistent(broker)
+    finally:
+        broker.stop()
+
+    print(f"legacy     : {legacy_ms:6.2f} ms/cycle, {legacy_connections} connections, QoS 0 unacknowledged")
+    print(f"persistent : {persistent_ms:6.2f} ms/cycle, {broker.connections} connections (incl. 1 reconnect), QoS 1 acknowledged")
+    print(f"persistent per-cycle latency: avg {stats['total_ms'] / stats['cycles']:.2f} ms, max {stats['max_ms']:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# bench_mqtt_qos.py
+# Publishes sensor bursts with umqttsimple.MQTTClient to the stub broker,
+# whose acks are delayed to stand in for a network round trip. Compares
+# waiting for each acknowledgement (as publish(qos=1) used to) with the
+# in-flight window, at QoS 1 and 2. Then drops the connection with messages
+# unacknowledged and checks they are resent on reconnect, and checks a QoS 2
+# message sent to the client twice is delivered once.
+#
+# Run from the repository root: python benchmarks/bench_mqtt_qos.py
+
+import os
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import umqttsimple
+import usocket_shim
+from mqtt_stub import StubBroker
+
+ACK_DELAY = 0.005  # Seconds, a LAN round trip to a busy broker
+MESSAGES = 200
+WINDOWS = (8, 32)
+
+def connected(broker, **kwargs):
+    client = umqttsimple.MQTTClient("bench", "127.0.0.1", port=broker.port, **kwargs)
+    client.connect()
+    return client
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError
+        time.sleep(0.01)
+
+def throughput(broker, qos, window):
+    """ Messages per second; window None waits for each acknowledgement """
+    client = connected(broker, max_inflight=window or 1)
+    del broker.published[:]
+    start = time.perf_counter()
+    for n in range(MESSAGES):
+        client.publish(b"sensors/summerhouse/pressure", b"%d" % (1000 + n), qos=qos)
+        if window is None:
+            client.flush()
+    client.flush()
+    elapsed = time.perf_counter() - start
+    client.disconnect()
+    assert [payload for _, payload, _, _ in broker.published] == [b"%d" % (1000 + n) for n in range(MESSAGES)]
+    return MESSAGES / elapsed
+
+def resend_on_reconnect(broker):
+    broker.ack_delay = 1.0  # No acks before the connection drops
+    client = connected(broker, max_inflight=16)
+    del broker.published[:]
+    for qos in (1, 2):
+        for n in range(5):
+            client.publish(b"sensors/summerhouse/temperature", b"q%d-%d" % (qos, n), qos=qos)
+    wait_for(lambda: len(broker.published) == 10)
+    assert client.inflight == 10
+    broker.drop_clients()
+    broker.ack_delay = ACK_DELAY
+    client.connect(clean_session=False)
+    client.flush()
+    client.disconnect()
+    payloads = [payload for _, payload, _, _ in broker.published]
+    assert all(payloads.count(b"q%d-%d" % (qos, n)) == 2 for qos in (1, 2) for n in range(5))
+    print("10 unacknowledged messages resent with DUP after reconnect and acknowledged")
+
+def qos2_delivered_once(broker):
+    received = []
+    client = connected(broker)
+    client.set_callback(lambda topic, msg: received.append(msg))
+    client.subscribe(b"weather/#")
+    session = broker._sessions[0]
+    body = struct.pack("!H", 18) + b"weather/prediction" + struct.pack("!H", 7) + b"Rain likely"
+    packet = bytes([0x34, len(body)]) + body
+    session.send(packet)
+    session.send(bytes([0x3c, len(body)]) + body)  # Redelivered with DUP
+    session.send(b"\x62\x02\x00\x07")  # PUBREL
+    wait_for(lambda: client.drain() == 0 and 7 not in client._received_qos2)
+    client.disconnect()
+    assert received == [b"Rain likely"]
+    print("QoS 2 message received twice delivered once, then released")
+
+def main():
+    umqttsimple.socket = usocket_shim
+    broker = StubBroker(ack_delay=ACK_DELAY).start()
+    try:
+        print(f"{MESSAGES} publishes, acks delayed {ACK_DELAY * 1000:.0f} ms")
+        for qos in (1, 2):
+            results = [("wait for each ack", throughput(broker, qos, None))]
+            results += [(f"window {window}", throughput(broker, qos, window)) for window in WINDOWS]
+            print(f"QoS {qos} | " + " | ".join(f"{label} {rate:7.0f} msg/s" for label, rate in results))
+        resend_on_reconnect(broker)
+        qos2_delivered_once(broker)
+    finally:
+        broker.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+# bench_mqtt_receive.py
+# Receives the dashboard's MQTT traffic with umqttsimple.MQTTClient over
+# MicroPython-style sockets (usocket_shim) from the stub broker: the old
+# wait_msg(), which read each field with its own sock.read() on a blocking
+# socket, against the buffered reader on a non-blocking one. Reports socket
+# read calls, recv() system calls and time per message, for blocking
+# wait_msg() and for check_msg() polling, and checks both deliver the same
+# messages. Then compares the peak temporary allocation per message with
+# bytes and zero-copy callbacks, and checks a payload over max_packet_size
+# is dropped without growing the buffer.
+#
+# Run from the repository root: python benchmarks/bench_mqtt_receive.py
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import umqttsimple
+import usocket_shim
+from mqtt_stub import StubBroker
+
+MESSAGES = 2000
+
+class LegacyClient(umqttsimple.MQTTClient):
+    """ wait_msg() and check_msg() as umqttsimple used to have them """
+
+    def _read(self, n):
+        # CONNACK and SUBACK were read straight from a blocking socket too
+        self.sock.setblocking(True)
+        return self.sock.read(n)
+
+    def _recv_len(self):
+        n = 0
+        sh = 0
+        while 1:
+            b = self.sock.read(1)[0]
+            n |= (b & 0x7f) << sh
+            if not b & 0x80:
+                return n
+            sh += 7
+
+    def wait_msg(self):
+        res = self.sock.read(1)
+        self.sock.setblocking(True)
+        if res is None:
+            return None
+        if res == b"":
+            raise OSError(-1)
+        if res == b"\xd0":  # PINGRESP
+            sz = self.sock.read(1)[0]
+            assert sz == 0
+            return None
+        op = res[0]
+        if op & 0xf0 != 0x30:
+            return op
+        sz = self._recv_len()
+        topic_len = self.sock.read(2)
+        topic_len = (topic_len[0] << 8) | topic_len[1]
+        topic = self.sock.read(topic_len)
+        sz -= topic_len + 2
+        if op & 6:
+            self.sock.read(2)  # Packet id; the benchmark traffic is QoS 0
+            sz -= 2
+        msg = self.sock.read(sz)
+        self.cb(topic, msg)
+
+    def check_msg(self):
+        self.sock.setblocking(False)
+        return self.wait_msg()
+
+def traffic(count):
+    """ The topics and payloads forecast.py publishes, repeated """
+    out = []
+    for n in range(count):
+        kind = n % 4
+        if kind == 0:
+            out.append(("weather/pressure", json.dumps({"last_24_pressures": [1010.1 + i / 10 for i in range(24)]})))
+        elif kind == 1:
+            out.append(("weather/temperature", json.dumps({"last_24_temperatures": [18.5 + i / 10 for i in range(24)]})))
+        elif kind == 2:
+            out.append(("weather/current_temperature", json.dumps({"current_temperature": 21.4})))
+        else:
+            out.append(("weather/prediction", "Stable conditions"))
+    return out
+
+def run(broker, client_class, polling):
+    received = []
+    client = client_class("bench", "127.0.0.1", port=broker.port)
+    client.set_callback(lambda topic, msg: received.append((topic, msg)))
+    client.connect()
+    client.subscribe(b"weather/#")
+    messages = traffic(MESSAGES)
+    sender = threading.Thread(target=lambda: [broker.broadcast(t, p) for t, p in messages])
+    usocket_shim.reset()
+    start = time.perf_counter()
+    sender.start()
+    while len(received) < MESSAGES:
+        if polling:
+            client.check_msg()
+        else:
+            client.wait_msg()
+    elapsed = time.perf_counter() - start
+    sender.join()
+    client.disconnect()
+    expected = [(topic.encode(), payload.encode()) for topic, payload in messages]
+    assert received == expected
+    return elapsed / MESSAGES, {name: count / MESSAGES for name, count in usocket_shim.stats.items()}
+
+def allocations(broker, zero_copy):
+    """ Mean (bytes copied for the callback, peak bytes allocated) per message
+
+    The peak includes the socket shim's own CPython objects.
+    """
+    received = [0]
+    copied = [0]
+    def callback(topic, msg):
+        received[0] += 1
+        for arg in (topic, msg):
+            if isinstance(arg, bytes):
+                copied[0] += len(arg)
+    client = umqttsimple.MQTTClient("bench", "127.0.0.1", port=broker.port)
+    client.set_callback(callback, zero_copy=zero_copy)
+    client.connect()
+    client.subscribe(b"weather/#")
+    messages = traffic(MESSAGES // 10)
+    sender = threading.Thread(target=lambda: [broker.broadcast(t, p) for t, p in messages])
+    sender.start()
+    sender.join()
+    total = 0
+    tracemalloc.start()
+    while received[0] < len(messages):
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        client.wait_msg()
+        total += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    client.disconnect()
+    return copied[0] / len(messages), total / len(messages)
+
+def oversized(broker):
+    """ A payload over max_packet_size is dropped and the next one still arrives """
+    received = []
+    client = umqttsimple.MQTTClient("bench", "127.0.0.1", port=broker.port, max_packet_size=1024)
+    client.set_callback(lambda topic, msg: received.append((topic, msg)))
+    client.connect()
+    client.subscribe(b"weather/#")
+    broker.broadcast("weather/prediction", "x" * 8000)
+    broker.broadcast("weather/prediction", "Stable conditions")
+    while not received:
+        client.wait_msg()
+    client.disconnect()
+    assert received == [(b"weather/prediction", b"Stable conditions")]
+    assert client.skipped == 1 and len(client._buf) == 512
+    print("8000 byte payload over max_packet_size=1024 dropped, buffer stayed at 512 bytes")
+
+def main():
+    umqttsimple.socket = usocket_shim
+    broker = StubBroker().start()
+    try:
+        print(f"{MESSAGES} messages, per message")
+        for mode, polling in (("wait_msg", False), ("check_msg", True)):
+            for label, client_class in (("legacy", LegacyClient), ("buffered", umqttsimple.MQTTClient)):
+                elapsed, stats = run(broker, client_class, polling)
+                print(f"{mode:>9} {label:>8} | {stats['reads']:5.2f} reads | {stats['recv']:5.2f} recv"
+                      f" | {stats['bytes']:5.0f} B | {elapsed * 1e6:6.1f} us")
+        print()
+        for label, zero_copy in (("bytes", False), ("zero-copy", True)):
+            copied, peak = allocations(broker, zero_copy)
+            print(f"{label:>9} callback | {copied:4.0f} B copied | {peak:4.0f} B peak allocation per message")
+        oversized(broker)
+    finally:
+        broker.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# bench_mqtt_router.py
+# Compares weather_presto.py's old MQTT setup, four subscribe() calls and an
+# if-chain callback, with a TopicRouter and one subscribe_many(). Measures
+# the connect-and-subscribe time against the stub broker with a simulated
+# round trip, the SUBSCRIBE packets sent, and the per-message dispatch time
+# as the number of filters grows, with exact filters and with wildcards.
+# Checks dispatch allocates nothing for memoryview topics, and that the
+# router's +/# matching agrees with the stub broker's.
+#
+# Run from the repository root: python benchmarks/bench_mqtt_router.py
+
+import itertools
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import umqttsimple
+import usocket_shim
+from mqtt_stub import StubBroker, topic_matches
+
+TOPICS = [b"weather/prediction", b"weather/pressure", b"weather/temperature", b"weather/current_temperature"]
+ROUND_TRIP = 0.02  # Seconds, a slow Wi-Fi hop to the broker
+DISPATCHES = 20000
+
+def connect(broker, batched):
+    client = umqttsimple.MQTTClient("bench", "127.0.0.1", port=broker.port)
+    router = umqttsimple.TopicRouter()
+    for topic in TOPICS:
+        router.add(topic, lambda topic, msg: None)
+    client.set_callback(router.dispatch)
+    start = time.perf_counter()
+    client.connect()
+    if batched:
+        client.subscribe_many(router.filters)
+    else:
+        for topic in TOPICS:
+            client.subscribe(topic)
+    elapsed = time.perf_counter() - start
+    client.disconnect()
+    return elapsed
+
+def startup():
+    broker = StubBroker(ack_delay=ROUND_TRIP).start()
+    try:
+        print(f"connect and subscribe to {len(TOPICS)} topics, {ROUND_TRIP * 1000:.0f} ms per SUBACK")
+        for label, batched in (("subscribe x4", False), ("subscribe_many", True)):
+            before = broker.subscribe_packets
+            elapsed = min(connect(broker, batched) for _ in range(5))
+            packets = (broker.subscribe_packets - before) // 5
+            print(f"{label:>14} | {packets} SUBSCRIBE | {elapsed * 1000:6.1f} ms")
+    finally:
+        broker.stop()
+
+def if_chain(filters):
+    """ The old sub_cb: copy the topic, then compare it with every topic """
+    def sub_cb(topic, msg):
+        topic = bytes(topic)
+        for f in filters:
+            if topic == f:
+                pass
+    return sub_cb
+
+def dispatch():
+    print(f"\nper-message dispatch, memoryview topics, {DISPATCHES} messages")
+    for extra in (0, 28, 252):
+        filters = TOPICS + [b"sensor/%d/reading" % i for i in range(extra)]
+        router = umqttsimple.TopicRouter()
+        for f in filters:
+            router.add(f, lambda topic, msg: None)
+        msg = memoryview(b"{}")
+        topics = [memoryview(t) for t in TOPICS]
+        for label, cb in (("if-chain", if_chain(filters)), ("router", router.dispatch)):
+            start = time.perf_counter()
+            for i in range(DISPATCHES):
+                cb(topics[i & 3], msg)
+            elapsed = time.perf_counter() - start
+            print(f"{len(filters):4} filters {label:>8} | {elapsed / DISPATCHES * 1e6:5.2f} us")
+    router = umqttsimple.TopicRouter()
+    for f in (b"weather/+", b"weather/#", b"+/pressure"):
+        router.add(f, lambda topic, msg: None)
+    topics = [memoryview(t) for t in TOPICS]
+    start = time.perf_counter()
+    for i in range(DISPATCHES):
+        router.dispatch(topics[i & 3], msg)
+    elapsed = time.perf_counter() - start
+    print(f"   3 wildcard filters    | {elapsed / DISPATCHES * 1e6:5.2f} us")
+
+class NoCopyTopic:
+    """ A topic that can be measured, indexed and compared, but not sliced or copied """
+
+    def __init__(self, view):
+        self._view = view
+
+    def __len__(self):
+        return len(self._view)
+
+    def __getitem__(self, index):
+        if not isinstance(index, int):
+            raise AssertionError("topic sliced")
+        return self._view[index]
+
+    def __eq__(self, other):
+        return self._view == other
+
+    def __iter__(self):
+        raise AssertionError("topic copied")
+
+def allocations():
+    """ Check dispatch never copies or slices the topic, and retains nothing """
+    router = umqttsimple.TopicRouter()
+    calls = []
+    for topic in TOPICS:
+        router.add(topic, lambda topic, msg: calls.append(1))
+    router.add(b"weather/+", lambda topic, msg: calls.append(1))
+    router.add(b"$SYS/#", lambda topic, msg: None)
+    buffer = bytearray(b"".join(TOPICS))
+    views, offset = [], 0
+    for topic in TOPICS:
+        views.append(memoryview(buffer)[offset:offset + len(topic)])
+        offset += len(topic)
+    for view in views:
+        del calls[:]
+        router.dispatch(NoCopyTopic(view), b"")
+        assert len(calls) == (2 if view.tobytes().count(b"/") == 1 else 1), bytes(view)
+
+    msg = memoryview(buffer)[:2]
+    sequence = views * 250
+    router = umqttsimple.TopicRouter()
+    for topic in TOPICS + [b"weather/+", b"$SYS/#"]:
+        router.add(topic, lambda topic, msg: None)
+    router.dispatch(views[0], msg)  # Warm up
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for view in sequence:
+        router.dispatch(view, msg)
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    assert retained == 0, retained
+    print("\nmemoryview topics, exact and wildcard filters: never sliced or copied, 0 B retained")
+
+def matching():
+    levels = ["a", "b", "+", "#", "$SYS"]
+    filters = set()
+    for depth in (1, 2, 3):
+        for combo in itertools.product(levels, repeat=depth):
+            if "#" in combo[:-1] or "$SYS" in combo[1:]:
+                continue
+            filters.add("/".join(combo))
+    topics = ["/".join(c) for depth in (1, 2, 3) for c in itertools.product(["a", "b", "", "$SYS"], repeat=depth)]
+    for f in sorted(filters):
+        router = umqttsimple.TopicRouter()
+        hits = []
+        router.add(f, lambda topic, msg: hits.append(bytes(topic)))
+        for topic in topics:
+            del hits[:]
+            router.dispatch(memoryview(topic.encode()), b"")
+            expected = topic_matches(f, topic) and not (topic.startswith("$") and f[0] in "+#")
+            assert bool(hits) == expected, (f, topic)
+    router = umqttsimple.TopicRouter()
+    for f in sorted(filters):
+        router.add(f, lambda topic, msg: None)
+    for topic in topics:
+        expected = sum(topic_matches(f, topic) and not (topic.startswith("$") and f[0] in "+#") for f in filters)
+        assert router.dispatch(memoryview(topic.encode()), b"") == expected, topic
+    print(f"{len(filters)} filters x {len(topics)} topics match as the stub broker does, alone and together")
+
+def main():
+    umqttsimple.socket = usocket_shim
+    startup()
+    dispatch()
+    allocations()
+    matching()
+
+if __name__ == "__main__":
+    main()
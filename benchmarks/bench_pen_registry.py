@@ -0,0 +1,102 @@
+# bench_pen_registry.py
+# Counts the pens a pichart dashboard creates on the stub display: nine
+# tiles, a shared container palette and a few per-chart data colours. Then
+# drives a small recycling registry (as for a palette display mode) past its
+# limit and checks every pen it hands out holds the requested colour.
+# Finally redraws every tile of a dashboard on a recycling registry with
+# room for the old and new highlight while a highlight colour changes every frame, and checks at
+# most one pen is recycled per frame, never one the other tiles draw with.
+#
+# Run from the repository root: python benchmarks/bench_pen_registry.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pichart
+from display_stub import StubDisplay
+
+FRAMES = 100
+DATA_COLOURS = (0xFFA500, 0x10E68F, 0x0096FF)
+
+def dashboard():
+    display = StubDisplay()
+    container = pichart.Container(display)
+    container.cols = 3
+    for n in range(8):
+        chart = pichart.Chart(display, title=f"Chart {n}", values=[n, n + 2, n + 1, n + 3])
+        chart.show_y_axis = True
+        container.add_chart(chart)
+    container.add_chart(pichart.ImageTile(display))
+    container.background_colour = 0xFFFFFF
+    container.title_colour = 0x0096FF
+    container.grid_colour = 0xF2F2F2
+    container.border_colour = 0xF2F2F2
+    for n, chart in enumerate(container.charts[:8]):
+        chart.data_colour = DATA_COLOURS[n % len(DATA_COLOURS)]
+    for _ in range(FRAMES):
+        for item in container.charts:
+            item.mark_dirty()
+        container.update()
+    return display
+
+def recycling(limit, colours, rounds):
+    """ Mostly the first few colours, as a dashboard with the odd highlight would use """
+    display = StubDisplay()
+    registry = pichart.PenRegistry(display, limit=limit, recycle=True)
+    for n in range(rounds):
+        colour = colours[n % 6] if n % 5 else colours[n * 7 % len(colours)]
+        pen = registry.get(colour)
+        assert display.pen_colours[pen] == (colour >> 16, (colour >> 8) & 0xFF, colour & 0xFF)
+    return registry, len(display.pen_colours)
+
+def highlighted(frames):
+    """ Pens recycled per frame, and how many of them other tiles were drawing with """
+    display = StubDisplay()
+    registry = pichart._pen_registries[id(display)] = pichart.PenRegistry(display, recycle=True)
+    container = pichart.Container(display)
+    charts = [pichart.Chart(display, title=f"Chart {n}", values=[n, n + 2, n + 1, n + 3]) for n in range(3)]
+    card = pichart.Card(display, title="Alert")
+    for item in charts + [card]:
+        container.add_chart(item)
+    for n, chart in enumerate(charts):
+        chart.data_colour = DATA_COLOURS[n]
+    container.update()
+    registry.limit = len(registry) + 2  # The outgoing highlight and the new one
+    display.reset()
+
+    in_use = 0
+    update_pen = display.update_pen
+
+    def recycle(pen, r, g, b):
+        nonlocal in_use
+        in_use += display.pen_colours[pen][:2] != (0xFF, 0x00)  # Not an old highlight
+        update_pen(pen, r, g, b)
+
+    display.update_pen = recycle
+    for n in range(frames):
+        card.title_colour = 0xFF0000 + n  # A colour not seen before
+        for item in container.charts:
+            item.mark_dirty()
+        container.update()
+    return display.counts["update_pen"] / frames, in_use
+
+def main():
+    display = dashboard()
+    registry = pichart.pen_registry(display)
+    print(f"dashboard: {display.counts['create_pen']} pens created for {len(registry)} colours, "
+          f"{registry.hits} hits, {registry.misses} misses over {FRAMES} frames")
+
+    colours = [n * 0x111111 for n in range(12)]
+    registry, slots = recycling(8, colours, 10_000)
+    print(f"recycling: limit {registry.limit}, {len(colours)} colours -> {slots} palette slots used, "
+          f"{registry.evictions} evictions, {registry.hits} hits, {registry.misses} misses")
+
+    recycled, in_use = highlighted(FRAMES)
+    assert in_use == 0, in_use
+    print(f"recycling dashboard, highlight changed every frame: {recycled:.2f} pens recycled per frame, "
+          f"{in_use} of them in use")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+# bench_render_suite.py
+# Render benchmarks for every pichart widget on FakePicoGraphics: Chart
+# across series lengths and layouts, Card with short and wrapped text,
+# Container dashboards redrawn in full and with one reading streamed per
+# frame, and ImageTile with the jpegdec stub. Each scenario reports time per
+# frame, primitives per frame and pixels touched per frame.
+#
+# Results are compared with render_baseline.json next to this file. Primitive
+# and pixel counts must match exactly; exits with status 1 if they don't.
+# Frame times are stored relative to a fixed pure-Python workload timed in
+# the same run, so they carry between machines, and are reported for
+# information. --check-time also fails on a relative slowdown beyond
+# --tolerance.
+#
+# Run from the repository root:
+#   python benchmarks/bench_render_suite.py            compare with the baseline
+#   python benchmarks/bench_render_suite.py --save     record a new baseline
+#   python benchmarks/bench_render_suite.py --check-time
+#                                                      also gate on frame time
+#   python benchmarks/bench_render_suite.py --snapshots DIR
+#                                                      also save each scenario's
+#                                                      framebuffer as DIR/<name>.npy
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pichart
+import jpegdec_stub
+from display_stub import FakePicoGraphics
+
+BASELINE = os.path.join(os.path.dirname(__file__), "render_baseline.json")
+LENGTHS = (24, 240, 2400)
+LAYOUTS = {
+    "lines": {"show_lines": True},
+    "points": {"show_lines": True, "show_datapoints": True},
+    "bars": {"show_bars": True},
+}
+FORECASTS = ("Stable conditions", "Fair weather, rising pressure", "Rain likely, pressure falling")
+COLOURS = {"background_colour": 0x000000, "border_colour": 0x4060A0, "grid_colour": 0x202020,
+           "title_colour": 0xFFFFFF, "data_colour": 0x40C0FF}
+
+def readings(count, seed):
+    random.seed(seed)
+    return [round(1010 + random.uniform(-8, 8), 1) for _ in range(count)]
+
+def styled(item):
+    for name, colour in COLOURS.items():
+        if hasattr(item, name):
+            setattr(item, name, colour)
+    return item
+
+# Each scenario builds its widgets on a display and returns a function that
+# renders one frame
+
+def chart_scenario(length, layout):
+    def build(display):
+        chart = styled(pichart.Chart(display, title="Pressure (hPa)"))
+        chart.set_values(readings(length, length))
+        chart.width, chart.height = 240, 240
+        chart.scale_to_fit = True
+        for name, value in LAYOUTS[layout].items():
+            setattr(chart, name, value)
+        return chart.draw
+    return build
+
+def card_scenario(text):
+    def build(display):
+        card = styled(pichart.Card(display, width=240, height=120, title=text))
+        return card.draw
+    return build
+
+def dashboard(display, cols, charts, cards):
+    container = styled(pichart.Container(display))
+    container.cols = cols
+    for n in range(charts):
+        chart = pichart.Chart(display, title=f"Sensor {n}", capacity=24)
+        chart.show_lines = True
+        chart.set_values(readings(24, n))
+        container.add_chart(chart)
+    for n in range(cards):
+        container.add_chart(pichart.Card(display, title=FORECASTS[n % len(FORECASTS)]))
+    return container
+
+def container_full(cols, charts, cards):
+    def build(display):
+        container = dashboard(display, cols, charts, cards)
+        def frame():
+            for item in container.charts:
+                item.mark_dirty()
+            container.update()
+        return frame
+    return build
+
+def container_streaming(cols, charts, cards):
+    def build(display):
+        container = dashboard(display, cols, charts, cards)
+        container.update()
+        values = readings(1000, 1)
+        state = [0]
+        def frame():
+            state[0] += 1
+            container.charts[state[0] % charts].append(values[state[0] % len(values)])
+            container.update()
+        return frame
+    return build
+
+def image_tiles(paths):
+    def build(display):
+        tiles = [pichart.ImageTile(display, paths[i], x=i * 96, width=96, height=96)
+                 for i in range(len(paths))]
+        def frame():
+            for tile in tiles:
+                tile.draw()
+        return frame
+    return build
+
+def scenarios(icon_paths):
+    found = {}
+    for length in LENGTHS:
+        for layout in LAYOUTS:
+            found[f"chart/{layout}/{length}"] = chart_scenario(length, layout)
+    found["card/short"] = card_scenario("21.5")
+    found["card/wrapped"] = card_scenario(FORECASTS[2])
+    found["container/2x2/full"] = container_full(2, 2, 2)
+    found["container/2x2/streaming"] = container_streaming(2, 2, 2)
+    found["container/3x3/full"] = container_full(3, 9, 0)
+    found["container/3x3/streaming"] = container_streaming(3, 9, 0)
+    found["image_tile/4"] = image_tiles(icon_paths)
+    return found
+
+def reference_us(repeats=5):
+    """ Best time of a fixed interpreter-bound loop, the unit for frame times """
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        total = 0
+        for i in range(100_000):
+            total += i * i % 7
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1e6
+
+def measure(build, frames, framebuffer=False, repeats=5):
+    """ Return (us per frame, primitives per frame, pixels per frame, framebuffer) """
+    best = None
+    for _ in range(repeats):
+        display = FakePicoGraphics(count_pixels=False)
+        frame = build(display)
+        frame()  # Warm up caches and pens
+        start = time.perf_counter()
+        for _ in range(frames):
+            frame()
+        elapsed = (time.perf_counter() - start) / frames
+        best = elapsed if best is None else min(best, elapsed)
+
+    # Count on a fresh build, so the counted frames are the ones timed
+    display = FakePicoGraphics(framebuffer=framebuffer)
+    frame = build(display)
+    frame()
+    display.reset()
+    for _ in range(frames):
+        frame()
+    return best * 1e6, display.primitives / frames, display.pixels / frames, display.framebuffer
+
+def compare(results, baseline, tolerance, check_time):
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if result["primitives"] != reference["primitives"]:
+            regressions.append(f"{name}: primitives {reference['primitives']} -> {result['primitives']}")
+        if result["pixels"] != reference["pixels"]:
+            regressions.append(f"{name}: pixels {reference['pixels']} -> {result['pixels']}")
+        if check_time and result["frame_units"] > reference["frame_units"] * (1 + tolerance):
+            regressions.append(f"{name}: relative frame time {reference['frame_units']:.4f} -> {result['frame_units']:.4f}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--frames", type=int,
+                        help="frames per scenario (default: as in the baseline, else 50)")
+    parser.add_argument("--check-time", action="store_true",
+                        help="also fail on a relative frame time slowdown beyond --tolerance")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative frame time slowdown with --check-time (default 0.25)")
+    parser.add_argument("--snapshots", metavar="DIR", help="save each scenario's framebuffer as .npy")
+    args = parser.parse_args()
+
+    pichart.jpegdec = jpegdec_stub
+    baseline = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE) as f:
+            saved = json.load(f)
+        if args.frames in (None, saved["frames"]):
+            baseline = saved["scenarios"]
+            args.frames = saved["frames"]
+        else:
+            print(f"baseline was recorded over {saved['frames']} frames, not comparing")
+    args.frames = args.frames or 50
+
+    unit = reference_us()
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        icon_paths = []
+        for name in ("sun", "cloud", "rain", "storm"):
+            path = os.path.join(directory, name + ".jpg")
+            with open(path, "wb") as f:
+                f.write(jpegdec_stub.make_jpeg(200, 200))
+            icon_paths.append(path)
+
+        print(f"{'scenario':<26} {'frame':>10} {'primitives':>11} {'pixels':>10} {'baseline':>10}")
+        for name, build in scenarios(icon_paths).items():
+            frame_us, primitives, pixels, framebuffer = measure(build, args.frames, bool(args.snapshots))
+            results[name] = {"frame_us": round(frame_us, 1), "frame_units": round(frame_us / unit, 4),
+                             "primitives": round(primitives, 2), "pixels": round(pixels, 2)}
+            reference = baseline.get(name)
+            change = (f"{results[name]['frame_units'] / reference['frame_units'] - 1:+9.0%}"
+                      if reference else f"{'new':>9}")
+            print(f"{name:<26} {frame_us:>7.1f} us {primitives:>11.1f} {pixels:>10.0f} {change:>10}")
+            if args.snapshots:
+                import numpy
+                os.makedirs(args.snapshots, exist_ok=True)
+                numpy.save(os.path.join(args.snapshots, name.replace("/", "_") + ".npy"), framebuffer)
+
+    if args.save:
+        with open(BASELINE, "w") as f:
+            json.dump({"frames": args.frames, "python": sys.version.split()[0], "reference_us": round(unit, 1),
+                       "scenarios": results},
+                      f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baseline written to {BASELINE}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance, args.check_time)
+    for regression in regressions:
+        print("REGRESSION", regression)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
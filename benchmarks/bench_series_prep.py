@@ -0,0 +1,65 @@
+# bench_series_prep.py
+# Micro-benchmark of turning one InfluxDB hourly result into the published
+# values: the pandas path forecast.py used to take, against the NumPy path of
+# forecast.hourly_frame(). Checks both produce identical output.
+#
+# Run from the repository root: python benchmarks/bench_series_prep.py
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+import pandas as pd
+from influxdb.resultset import ResultSet
+
+import forecast
+from influx_stub import HOUR, rfc3339
+
+ROWS = (25, 169, 1441)
+REPEAT = 2000
+
+def make_series(rows, epoch):
+    rng = np.random.default_rng(rows)
+    start = 1_790_000_000 // HOUR * HOUR - (rows - 1) * HOUR
+    values = 1010 + np.cumsum(rng.normal(0, 0.4, rows))
+    return {
+        "name": "weather",
+        "tags": {"location": "Summerhouse"},
+        "columns": ["time", "pressure"],
+        "values": [[start + i * HOUR if epoch else rfc3339(start + i * HOUR), float(v)]
+                   for i, v in enumerate(values)],
+    }
+
+def pandas_path(result):
+    """ The DataFrame build get_pressure_data() used to do """
+    df = pd.DataFrame(list(result.get_points()))
+    df["time"] = pd.to_datetime(df["time"])
+    df.set_index("time", inplace=True)
+    df = df.sort_index()
+    df["pressure"] = df["pressure"].round(1)
+    return df["pressure"].iloc[-1], df["pressure"].tail(24).tolist(), df.index
+
+def numpy_path(series_list):
+    frame = forecast.hourly_frame(series_list, ["Summerhouse"], "")
+    pressure = forecast.get_hourly_data(frame, "Summerhouse", "pressure")
+    return float(pressure.values[-1]), pressure.values[-24:].tolist(), pressure.times
+
+def main():
+    for rows in ROWS:
+        result = ResultSet({"statement_id": 0, "series": [make_series(rows, epoch=False)]})
+        series_list = [make_series(rows, epoch=True)]
+
+        current_a, last_24_a, index = pandas_path(result)
+        current_b, last_24_b, times = numpy_path(series_list)
+        assert current_a == current_b and last_24_a == last_24_b
+        assert (index.as_unit("s").asi8 == times).all()
+
+        pandas_us = timeit.timeit(lambda: pandas_path(result), number=REPEAT) / REPEAT * 1e6
+        numpy_us = timeit.timeit(lambda: numpy_path(series_list), number=REPEAT) / REPEAT * 1e6
+        print(f"{rows:>5} rows | pandas {pandas_us:8.1f} us | numpy {numpy_us:8.1f} us | {pandas_us / numpy_us:5.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# bench_startup.py
+# Tracks forecast.py cold-start cost: the import time of the module itself
+# (python -X importtime) and the wall time from process start to the first
+# publish of current values and to the first forecast, against the stubs.
+# Exits non-zero if the first publish misses FIRST_PUBLISH_BUDGET.
+#
+# Run from the repository root: python benchmarks/bench_startup.py
+
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from influx_stub import StubInflux, make_points
+from mqtt_stub import StubBroker
+
+REPO = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SITES = ["Summerhouse", "RobotLab"]
+FIRST_PUBLISH_BUDGET = 1.0  # Seconds
+FORECAST_TIMEOUT = 60
+
+def import_times():
+    """ Return (total forecast import time in ms, [(ms, module)] slowest imports) """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import forecast"],
+                            cwd=REPO, capture_output=True, text=True, check=True)
+    children = []
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( +)(\S+)", line)
+        if not match:
+            continue
+        ms, depth, name = int(match.group(1)) / 1000, len(match.group(2)), match.group(3)
+        if depth == 1:  # Top level: children are listed before their parent
+            if name == "forecast":
+                return ms, sorted(children, reverse=True)[:5]
+            children = []
+        elif depth == 3:
+            children.append((ms, name))
+    raise RuntimeError("forecast import not found in -X importtime output")
+
+def first_publish_times(influx, broker):
+    """ Start forecast.main() in a child process and time its first publishes """
+    driver = (
+        "import forecast\n"
+        f"forecast.INFLUXDB_HOST, forecast.INFLUXDB_PORT = '127.0.0.1', {influx.port}\n"
+        f"forecast.MQTT_HOST, forecast.MQTT_PORT = '127.0.0.1', {broker.port}\n"
+        "forecast.main()\n"
+    )
+    start = time.perf_counter()
+    child = subprocess.Popen([sys.executable, "-c", driver], cwd=REPO, start_new_session=True,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    first = forecast = None
+    try:
+        while forecast is None and time.perf_counter() - start < FORECAST_TIMEOUT:
+            topics = [topic for topic, *_ in list(broker.published)]
+            now = time.perf_counter() - start
+            if first is None and topics:
+                first = now
+            if "weather/prediction" in topics:
+                forecast = now
+            time.sleep(0.001)
+    finally:
+        os.killpg(child.pid, signal.SIGTERM)
+        child.wait()
+    return first, forecast
+
+def main():
+    influx = StubInflux(make_points(SITES, int(time.time())), int(time.time())).start()
+    broker = StubBroker().start()
+    try:
+        total, slowest = import_times()
+        first, forecast = first_publish_times(influx, broker)
+    finally:
+        influx.stop()
+        broker.stop()
+
+    print(f"import forecast       : {total:7.1f} ms")
+    for ms, name in slowest:
+        print(f"    {name:<18}: {ms:7.1f} ms")
+    print(f"first publish         : {first * 1000:7.1f} ms (budget {FIRST_PUBLISH_BUDGET * 1000:.0f} ms)")
+    print(f"first forecast publish: {forecast * 1000:7.1f} ms" if forecast else "first forecast publish: timed out")
+    if first is None or first > FIRST_PUBLISH_BUDGET:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# display_stub.py
+# A stand-in for a PicoGraphics display so pichart can be exercised on CPython.
+# Every drawing call is counted by name and, when recording, appended to
+# ``calls`` so two renders can be compared primitive for primitive.
+# FakePicoGraphics adds pixel counts and an optional NumPy framebuffer.
+
+from collections import Counter
+
+PRIMITIVES = ("rectangle", "line", "circle", "text", "pixel", "polygon", "triangle")
+
+class StubDisplay:
+    def __init__(self, width=480, height=480, record=False):
+        self.width = width
+        self.height = height
+        self.record = record
+        self.counts = Counter()
+        self.calls = []
+        self.pen_colours = []  # Pen -> (r, g, b), as a palette would hold them
+
+    def _call(self, name, args):
+        self.counts[name] += 1
+        if self.record:
+            self.calls.append((name, args))
+
+    def reset(self):
+        self.counts.clear()
+        self.calls = []
+
+    @property
+    def primitives(self):
+        """ Number of drawing primitives since the last reset """
+        return sum(self.counts[name] for name in PRIMITIVES)
+
+    def get_bounds(self):
+        return self.width, self.height
+
+    def create_pen(self, r, g, b):
+        self._call("create_pen", (r, g, b))
+        self.pen_colours.append((r, g, b))
+        return len(self.pen_colours) - 1
+
+    def update_pen(self, pen, r, g, b):
+        self._call("update_pen", (pen, r, g, b))
+        self.pen_colours[pen] = (r, g, b)
+
+    def text_width(self, text, scale=2):
+        return len(text) * 6 * scale
+
+    def measure_text(self, text, scale=2, spacing=1, fixed_width=False):
+        self._call("measure_text", (text, scale))
+        return self.text_width(text, scale)
+
+    def set_pen(self, *args):
+        self._call("set_pen", args)
+
+    def set_font(self, *args):
+        self._call("set_font", args)
+
+    def set_clip(self, *args):
+        self._call("set_clip", args)
+
+    def remove_clip(self):
+        self._call("remove_clip", ())
+
+    def rectangle(self, *args):
+        self._call("rectangle", args)
+
+    def line(self, *args):
+        self._call("line", args)
+
+    def circle(self, *args):
+        self._call("circle", args)
+
+    def text(self, *args, **kwargs):
+        self._call("text", args)
+
+    def update(self):
+        self._call("update", ())
+
+class FakePicoGraphics(StubDisplay):
+    """ A StubDisplay that also works out the pixels each primitive touches
+
+    Pixels are counted inside the current clip, set with PicoGraphics'
+    set_clip(x, y, w, h) convention. With framebuffer=True every primitive is
+    also rasterised into ``framebuffer``, a (height, width) NumPy array of
+    0xRRGGBB ints, so renders can be compared or saved as images. Text is
+    rasterised as its bounding box, circles are filled. With
+    count_pixels=False only calls are counted, for timing runs.
+    """
+
+    def __init__(self, width=480, height=480, record=False, framebuffer=False, count_pixels=True):
+        super().__init__(width, height, record)
+        self.count_pixels = count_pixels or framebuffer
+        self.pixels = 0
+        self.updates = 0
+        self.pen = 0
+        self.font = "bitmap8"
+        self.clip = (0, 0, width, height)
+        self.framebuffer = None
+        if framebuffer:
+            import numpy  # Only needed to rasterise
+            self.framebuffer = numpy.zeros((height, width), dtype=numpy.uint32)
+
+    def reset(self):
+        super().reset()
+        self.pixels = 0
+        self.updates = 0
+
+    def _colour(self):
+        r, g, b = self.pen_colours[self.pen]
+        return (r << 16) | (g << 8) | b
+
+    def _fill(self, x0, y0, x1, y1):
+        """ Fill [x0, x1) x [y0, y1) inside the clip, returning the pixel count """
+        cx0, cy0, cx1, cy1 = self.clip
+        x0, y0 = max(x0, cx0), max(y0, cy0)
+        x1, y1 = min(x1, cx1), min(y1, cy1)
+        if x1 <= x0 or y1 <= y0:
+            return 0
+        if self.framebuffer is not None:
+            self.framebuffer[y0:y1, x0:x1] = self._colour()
+        return (x1 - x0) * (y1 - y0)
+
+    def set_pen(self, pen):
+        super().set_pen(pen)
+        self.pen = pen
+
+    def set_font(self, font):
+        super().set_font(font)
+        self.font = font
+
+    def set_clip(self, x, y, w, h):
+        super().set_clip(x, y, w, h)
+        self.clip = (max(x, 0), max(y, 0), min(x + w, self.width), min(y + h, self.height))
+
+    def remove_clip(self):
+        super().remove_clip()
+        self.clip = (0, 0, self.width, self.height)
+
+    def rectangle(self, x, y, w, h):
+        super().rectangle(x, y, w, h)
+        if not self.count_pixels:
+            return
+        self.pixels += self._fill(x, y, x + w, y + h)
+
+    def line(self, x1, y1, x2, y2, thickness=1):
+        super().line(x1, y1, x2, y2, thickness)
+        if not self.count_pixels:
+            return
+        steps = max(abs(x2 - x1), abs(y2 - y1))
+        if x1 == x2 or y1 == y2:  # Borders and grid lines, filled as one span
+            self.pixels += self._fill(min(x1, x2), min(y1, y2), max(x1, x2) + 1, max(y1, y2) + 1)
+            return
+        for i in range(steps + 1):
+            x = x1 + round((x2 - x1) * i / steps)
+            y = y1 + round((y2 - y1) * i / steps)
+            self.pixels += self._fill(x, y, x + 1, y + 1)
+
+    def circle(self, x, y, r):
+        super().circle(x, y, r)
+        if not self.count_pixels:
+            return
+        for dy in range(-r, r + 1):
+            half = int((r * r - dy * dy) ** 0.5)
+            self.pixels += self._fill(x - half, y + dy, x + half + 1, y + dy + 1)
+
+    def text(self, text, x, y, wordwrap=-1, scale=2, angle=0, spacing=1):
+        super().text(text, x, y, wordwrap, scale)
+        if not self.count_pixels:
+            return
+        self.pixels += self._fill(x, y, x + self.text_width(text, scale), y + 8 * scale)
+
+    def decoded_image(self, x, y, w, h):
+        """ Called by jpegdec_stub for the area a decode writes """
+        if self.count_pixels:
+            self.pen, pen = len(self.pen_colours), self.pen
+            self.pen_colours.append((128, 128, 128))
+            self.pixels += self._fill(x, y, x + w, y + h)
+            self.pen_colours.pop()
+            self.pen = pen
+
+    def update(self):
+        super().update()
+        self.updates += 1
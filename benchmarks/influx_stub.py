@@ -0,0 +1,143 @@
+# influx_stub.py
+# A local stand-in for the InfluxDB 1.x HTTP /query endpoint, used by the
+# forecast.py benchmarks. It understands just enough InfluxQL to answer the
+# hourly MEAN queries forecast.py sends, computed from raw points held in memory.
+
+import json
+import re
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+HOUR = 3600
+
+def make_points(locations, now, hours=30, step=60, seed=1):
+    """ Build raw readings every ``step`` seconds for the ``hours`` before ``now``.
+
+    Returns:
+        Dict of location to a list of (epoch seconds, {field: value}) tuples.
+    """
+    points = {}
+    for n, location in enumerate(locations):
+        rng = np.random.default_rng(seed + n)
+        count = hours * HOUR // step
+        pressure = 1010 + np.cumsum(rng.normal(0, 0.05, count))
+        temperature = 20 + np.cumsum(rng.normal(0, 0.02, count))
+        start = now - count * step
+        points[location] = [
+            (start + (i + 1) * step, {"pressure": float(pressure[i]), "temperature": float(temperature[i])})
+            for i in range(count)
+        ]
+    return points
+
+def rfc3339(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def parse_rfc3339(text):
+    return int(datetime.strptime(text[:19], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc).timestamp())
+
+class StubInflux:
+    """ Serves hourly means of ``points`` over HTTP, counting requests and bytes.
+
+    Attributes:
+        now: Server clock in epoch seconds, used for ``now()`` and the open bucket.
+        requests: Number of /query requests served.
+        bytes_sent: Total response body size in bytes.
+        points_scanned: Total raw points that fell inside a query's time range.
+    """
+
+    def __init__(self, points, now):
+        self.points = points
+        self.now = now
+        self.requests = 0
+        self.bytes_sent = 0
+        self.points_scanned = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                params = parse_qs(urlparse(self.path).query)
+                epoch = params.get("epoch", [None])[0]
+                body = json.dumps(stub.answer(params["q"][0], epoch)).encode()
+                stub.requests += 1
+                stub.bytes_sent += len(body)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_POST = do_GET
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def answer(self, query, epoch=None):
+        """ Evaluate ;-separated hourly MEAN queries the way InfluxDB 1.x would.
+
+        Times are RFC3339 strings, or epoch seconds when ``epoch`` is "s".
+        """
+        statements = [statement for statement in query.split(";") if statement.strip()]
+        return {"results": [self._statement(statement, epoch, i) for i, statement in enumerate(statements)]}
+
+    def _statement(self, query, epoch, statement_id):
+        fields = re.findall(r'MEAN\("(\w+)"\)', query)
+        locations = re.findall(r"\"location\" = '([^']+)'", query)
+        by_location = 'GROUP BY time(1h), "location"' in query
+
+        relative = re.search(r"time > now\(\) - (\d+)h", query)
+        until = re.search(r"time < now\(\) - (\d+)h", query)
+        upper = self.now - int(until.group(1)) * HOUR if until else self.now
+        absolute = re.search(r"time (>=?) '([^']+)'", query)
+        seconds = re.search(r"time (>=?) (\d+)s", query)
+        if relative:
+            lower, inclusive = self.now - int(relative.group(1)) * HOUR, False
+        elif absolute:
+            lower, inclusive = parse_rfc3339(absolute.group(2)), absolute.group(1) == ">="
+        else:
+            lower, inclusive = int(seconds.group(2)), seconds.group(1) == ">="
+
+        first_bucket = lower // HOUR * HOUR
+        buckets = range(first_bucket, upper // HOUR * HOUR + 1, HOUR)
+        series = []
+        for location in locations:
+            sums = {}
+            for t, values in self.points.get(location, []):
+                if t > self.now or t < lower or (t == lower and not inclusive) or (until and t >= upper):
+                    continue
+                self.points_scanned += 1
+                bucket = sums.setdefault(t // HOUR * HOUR, {field: [] for field in fields})
+                for field in fields:
+                    bucket[field].append(values[field])
+            if not sums:
+                continue
+            rows = []
+            for bucket in buckets:
+                means = sums.get(bucket)
+                rows.append([bucket if epoch == "s" else rfc3339(bucket)] + [
+                    sum(means[field]) / len(means[field]) if means else None for field in fields
+                ])
+            entry = {"name": "weather", "columns": ["time"] + fields, "values": rows}
+            if by_location:
+                entry["tags"] = {"location": location}
+            series.append(entry)
+
+        statement = {"statement_id": statement_id}
+        if series:
+            statement["series"] = series
+        return statement
@@ -0,0 +1,67 @@
+# jpegdec_stub.py
+# A stand-in for the jpegdec module so pichart.ImageTile can be exercised on
+# CPython. Nothing is decoded; the image size is read from the SOF marker and
+# every decoder, file open and decode is counted, along with the pixels a real
+# decode at the requested scale would have produced. A FakePicoGraphics target
+# is told the area each decode covers.
+
+import struct
+
+JPEG_SCALE_FULL = 0
+JPEG_SCALE_HALF = 2
+JPEG_SCALE_QUARTER = 4
+JPEG_SCALE_EIGHTH = 8
+
+DIVISORS = {JPEG_SCALE_FULL: 1, JPEG_SCALE_HALF: 2, JPEG_SCALE_QUARTER: 4, JPEG_SCALE_EIGHTH: 8}
+
+counts = {"decoders": 0, "file_reads": 0, "bytes_read": 0, "decodes": 0, "pixels": 0}
+
+def reset():
+    for name in counts:
+        counts[name] = 0
+
+def make_jpeg(width, height, size=4096):
+    """ Bytes that start like a baseline JPEG of the given size, padded to size """
+    header = b"\xff\xd8" + b"\xff\xc0" + struct.pack(">HBHHB", 11, 8, height, width, 1) + b"\x01\x11\x00"
+    return header + bytes(size - len(header) - 2) + b"\xff\xd9"
+
+def image_size(data):
+    """ (width, height) from the first SOF0/SOF2 marker """
+    i = 2
+    while i < len(data) - 9:
+        marker, length = data[i + 1], struct.unpack(">H", data[i + 2:i + 4])[0]
+        if marker in (0xC0, 0xC2):
+            height, width = struct.unpack(">HH", data[i + 5:i + 9])
+            return width, height
+        i += 2 + length
+    raise ValueError("no SOF marker")
+
+class JPEG:
+    def __init__(self, display):
+        counts["decoders"] += 1
+        self.display = display
+        self.size = None
+
+    def open_file(self, filename):
+        with open(filename, "rb") as f:
+            data = f.read()
+        counts["file_reads"] += 1
+        counts["bytes_read"] += len(data)
+        self.size = image_size(data)
+
+    def open_RAM(self, data):
+        self.size = image_size(data)
+
+    def get_width(self):
+        return self.size[0]
+
+    def get_height(self):
+        return self.size[1]
+
+    def decode(self, x=0, y=0, scale=JPEG_SCALE_FULL, dither=True):
+        divisor = DIVISORS[scale]
+        counts["decodes"] += 1
+        width, height = self.size[0] // divisor, self.size[1] // divisor
+        counts["pixels"] += width * height
+        if hasattr(self.display, "decoded_image"):
+            self.display.decoded_image(x, y, width, height)
@@ -0,0 +1,228 @@
+# mqtt_stub.py
+# A small in-process MQTT 3.1.1 broker for the benchmarks. It accepts
+# connections on localhost, acknowledges subscriptions and QoS 1 and 2
+# publishes (optionally after a delay), stores retained messages, and
+# forwards publishes to subscribers (at QoS 0) using +/# filters.
+
+import socket
+import struct
+import threading
+
+def topic_matches(topic_filter, topic):
+    """ Return True if ``topic`` matches the MQTT ``topic_filter`` """
+    filter_levels = topic_filter.split("/")
+    topic_levels = topic.split("/")
+    for i, level in enumerate(filter_levels):
+        if level == "#":
+            return True
+        if i >= len(topic_levels) or (level != "+" and level != topic_levels[i]):
+            return False
+    return len(filter_levels) == len(topic_levels)
+
+def encode_length(n):
+    out = bytearray()
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        out.append(byte | 0x80 if n else byte)
+        if not n:
+            return bytes(out)
+
+def publish_packet(topic, payload, retain=False):
+    topic = topic.encode() if isinstance(topic, str) else topic
+    payload = payload.encode() if isinstance(payload, str) else payload
+    body = struct.pack("!H", len(topic)) + topic + payload
+    return bytes([0x30 | retain]) + encode_length(len(body)) + body
+
+class _Session:
+    def __init__(self, broker, sock):
+        self.broker = broker
+        self.sock = sock
+        self.filters = []
+        self.lock = threading.Lock()
+
+    def send(self, data):
+        with self.lock:
+            self.sock.sendall(data)
+
+    def acknowledge(self, data):
+        """ Send an ack, after the broker's ack_delay if it has one """
+        if not self.broker.ack_delay:
+            self.send(data)
+            return
+        def send():
+            try:
+                self.send(data)
+            except OSError:
+                pass
+        threading.Timer(self.broker.ack_delay, send).start()
+
+    def read_exact(self, n):
+        data = bytearray()
+        while len(data) < n:
+            chunk = self.sock.recv(n - len(data))
+            if not chunk:
+                raise ConnectionError("client closed")
+            data += chunk
+        return bytes(data)
+
+    def read_packet(self):
+        header = self.read_exact(1)[0]
+        length = 0
+        shift = 0
+        while True:
+            byte = self.read_exact(1)[0]
+            length |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                break
+            shift += 7
+        return header, self.read_exact(length)
+
+    def run(self):
+        try:
+            while True:
+                header, body = self.read_packet()
+                if not self.handle(header, body):
+                    break
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.broker._drop(self)
+
+    def handle(self, header, body):
+        kind = header >> 4
+        broker = self.broker
+        if kind == 1:  # CONNECT
+            broker.connections += 1
+            self.send(b"\x20\x02\x00\x00")
+        elif kind == 3:  # PUBLISH
+            qos = (header >> 1) & 3
+            retain = bool(header & 1)
+            topic_len = struct.unpack_from("!H", body)[0]
+            topic = body[2:2 + topic_len].decode()
+            offset = 2 + topic_len
+            if qos:
+                pid = body[offset:offset + 2]
+                offset += 2
+            payload = body[offset:]
+            broker._received(topic, payload, qos, retain)
+            if qos == 1:
+                self.acknowledge(b"\x40\x02" + pid)
+            elif qos == 2:
+                self.acknowledge(b"\x50\x02" + pid)
+        elif kind == 6:  # PUBREL
+            self.acknowledge(b"\x70\x02" + body[:2])
+        elif kind == 8:  # SUBSCRIBE
+            pid = body[:2]
+            offset = 2
+            granted = bytearray()
+            filters = []
+            while offset < len(body):
+                length = struct.unpack_from("!H", body, offset)[0]
+                filters.append(body[offset + 2:offset + 2 + length].decode())
+                granted.append(0)  # Forwarded at QoS 0
+                offset += 3 + length
+            self.filters += filters
+            broker.subscribe_packets += 1
+            reply = b"\x90" + encode_length(2 + len(granted)) + pid + bytes(granted)
+            for topic, payload in list(broker.retained.items()):
+                if any(topic_matches(f, topic) for f in filters):
+                    reply += publish_packet(topic, payload, retain=True)
+            self.acknowledge(reply)
+        elif kind == 12:  # PINGREQ
+            self.send(b"\xd0\x00")
+        elif kind == 14:  # DISCONNECT
+            return False
+        return True
+
+class StubBroker:
+    """ Threaded MQTT broker stand-in on 127.0.0.1.
+
+    Attributes:
+        port: TCP port the broker listens on.
+        ack_delay: Seconds before PUBACK, PUBREC, PUBCOMP and SUBACK are
+            sent, to stand in for network round trips.
+        connections: Number of CONNECT packets accepted.
+        subscribe_packets: Number of SUBSCRIBE packets received.
+        published: List of (topic, payload, qos, retain) received from clients.
+        retained: Dict of topic to the last retained payload.
+        refusing: When true, new connections are closed straight away, as
+            while the broker is down.
+    """
+
+    def __init__(self, ack_delay=0.0):
+        self.ack_delay = ack_delay
+        self.connections = 0
+        self.subscribe_packets = 0
+        self.published = []
+        self.retained = {}
+        self.refusing = False
+        self._sessions = []
+        self._lock = threading.Lock()
+        self._listener = socket.socket()
+        self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind(("127.0.0.1", 0))
+        self._listener.listen(16)
+        self.port = self._listener.getsockname()[1]
+        self._running = False
+
+    def start(self):
+        self._running = True
+        threading.Thread(target=self._accept, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._running = False
+        self._listener.close()
+        self.drop_clients()
+
+    def drop_clients(self):
+        """ Close every client connection, as a broker restart or network blip would """
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            try:
+                session.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            session.sock.close()
+
+    def broadcast(self, topic, payload, retain=False):
+        """ Publish ``payload`` on ``topic`` to every matching subscriber """
+        if retain:
+            self.retained[topic] = payload
+        packet = publish_packet(topic, payload, retain=False)
+        with self._lock:
+            sessions = list(self._sessions)
+        for session in sessions:
+            if any(topic_matches(f, topic) for f in session.filters):
+                try:
+                    session.send(packet)
+                except OSError:
+                    pass
+
+    def _accept(self):
+        while self._running:
+            try:
+                sock, _ = self._listener.accept()
+            except OSError:
+                return
+            if self.refusing:
+                sock.close()
+                continue
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            session = _Session(self, sock)
+            with self._lock:
+                self._sessions.append(session)
+            threading.Thread(target=session.run, daemon=True).start()
+
+    def _drop(self, session):
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+        session.sock.close()
+
+    def _received(self, topic, payload, qos, retain):
+        with self._lock:
+            self.published.append((topic, payload, qos, retain))
+        self.broadcast(topic, payload, retain)
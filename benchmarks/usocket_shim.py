@@ -0,0 +1,75 @@
+# usocket_shim.py
+# MicroPython-style sockets on CPython, so umqttsimple can talk to the stub
+# broker. Blocking read()/readinto() do no short reads, as on MicroPython;
+# non-blocking ones, and non-blocking write(), return None when they would
+# block. Every read call and every recv() system call made to serve it is
+# counted in ``stats``.
+
+import socket as _socket
+
+stats = {"reads": 0, "recv": 0, "bytes": 0}
+
+def reset():
+    for name in stats:
+        stats[name] = 0
+
+def getaddrinfo(host, port):
+    return _socket.getaddrinfo(host, port, 0, _socket.SOCK_STREAM)
+
+class socket:
+    def __init__(self):
+        self._sock = _socket.socket()
+        self._sock.setsockopt(_socket.IPPROTO_TCP, _socket.TCP_NODELAY, 1)
+        self._blocking = True
+
+    def connect(self, addr):
+        self._sock.connect(addr)
+
+    def fileno(self):
+        return self._sock.fileno()
+
+    def setblocking(self, flag):
+        self._blocking = flag
+        self._sock.setblocking(flag)
+
+    def _recv_into(self, view):
+        stats["recv"] += 1
+        try:
+            got = self._sock.recv_into(view)
+        except BlockingIOError:
+            return None
+        stats["bytes"] += got
+        return got
+
+    def readinto(self, buf, nbytes=None):
+        stats["reads"] += 1
+        view = memoryview(buf)[:nbytes]
+        got = self._recv_into(view)
+        if got is None or not self._blocking:
+            return got
+        while got and got < len(view):
+            more = self._recv_into(view[got:])
+            if not more:
+                break
+            got += more
+        return got
+
+    def read(self, n):
+        buf = bytearray(n)
+        got = self.readinto(buf)
+        return None if got is None else bytes(buf[:got])
+
+    def write(self, buf, n=None):
+        if isinstance(buf, str):  # MicroPython streams accept str
+            buf = buf.encode()
+        data = memoryview(buf)[:n]
+        if not self._blocking:
+            try:
+                return self._sock.send(data)
+            except BlockingIOError:
+                return None
+        self._sock.sendall(data)
+        return len(data)
+
+    def close(self):
+        self._sock.close()
@@ -1,61 +1,546 @@
-from influxdb import InfluxDBClient
-import pandas as pd
 import json
-from time import sleep
-import paho.mqtt.client as mqtt
-from statsmodels.tsa.arima.model import ARIMA
+import os
+import sys
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from time import gmtime, perf_counter, sleep, strftime
+
+# The heavy dependencies (influxdb, which pulls in pandas, numpy, statsmodels
+# and paho) are imported in the functions that use them, so startup and the
+# first publish of current values don't wait seconds for them to load.
 
 # Setup MQTT Connection
 MQTT_HOST = "192.168.1.152"
 MQTT_PORT = 1883
-
-# Use modern callback API and MQTT v3.1.1
-mqtt_client = mqtt.Client(callback_api_version=mqtt.CallbackAPIVersion.VERSION2, protocol=mqtt.MQTTv311)
+MQTT_QOS = 1  # Acknowledged, so queued messages survive a reconnect
+MQTT_PUBLISH_TIMEOUT = 5  # Seconds to wait for a cycle's acknowledgements
+MQTT_MAX_QUEUED = 64  # Unacknowledged messages paho may hold; more are retried next cycle
 
 # InfluxDB Connection (for InfluxDB 1.x)
 INFLUXDB_HOST = "192.168.1.10"
 INFLUXDB_PORT = 8086
 DATABASE = "weather"
+INFLUXDB_TIMEOUT = 10  # Seconds before the async runtime gives up on a query
+
+client = None  # Created on first use by get_client()
+
+def get_client():
+    """ Return the InfluxDB client, creating it on first use """
+    global client
+    if client is None:
+        from influxdb import InfluxDBClient
+        client = InfluxDBClient(host=INFLUXDB_HOST, port=INFLUXDB_PORT, database=DATABASE)
+    return client
+
+# Sensor sites to forecast. Each one publishes under weather/<location>/...
+SITES = ["Summerhouse", "RobotLab"]
+
+# The Presto dashboard subscribes to the original un-prefixed weather/... topics,
+# which carry pressure from one site and temperature from another
+DASHBOARD_PRESSURE_SITE = "Summerhouse"
+DASHBOARD_TEMPERATURE_SITE = "RobotLab"
+
+# Fields fetched for every site
+FIELDS = ("pressure", "temperature")
+
+CYCLE_SECONDS = 5  # Time between publish cycles
+
+# Forecast settings
+ARIMA_ORDER = (2, 1, 0)  # Simple model to reduce non-stationarity issues
+FORECAST_STEPS = 3  # Hours ahead
+
+class Forecaster:
+    """ Base class for forecasting engines.
+
+    An engine turns an hourly series into a value ``steps`` hours ahead.
+    Instances are pickled to worker processes, so they only hold settings.
+
+    Attributes:
+        name: Key of the engine in ``FORECASTERS``.
+        runs_inline: True if a fit is cheap enough to run in the publisher
+            rather than in the process pool.
+    """
+    name = ""
+    runs_inline = True
+
+    def fit(self, values, steps, params=None, refit=True):
+        """ Fit the series and forecast ahead.
+
+        Args:
+            values: float64 array of the hourly series, oldest first. May hold NaN.
+            steps: Number of hours to forecast ahead.
+            params: Parameters returned by the previous fit, if any.
+            refit: False if only the newest bucket changed since that fit.
+
+        Returns:
+            Tuple of (forecast at ``steps`` ahead, parameters for the next call).
+        """
+        raise NotImplementedError
+
+class ArimaForecaster(Forecaster):
+    """ statsmodels ARIMA, warm-started from the previous fit. """
+    name = "arima"
+    runs_inline = False
+
+    def __init__(self, order=ARIMA_ORDER):
+        self.order = order
+
+    def fit(self, values, steps, params=None, refit=True):
+        """ Fit or re-filter an ARIMA model and forecast ``steps`` hours ahead.
+
+        With ``refit`` the parameters are re-estimated, starting from
+        ``params``. Without it the Kalman filter just runs over the new values
+        with ``params`` unchanged.
+        """
+        from statsmodels.tsa.arima.model import ARIMA
+
+        model = ARIMA(values, order=self.order)
+        if refit or params is None:
+            model_fit = model.fit(start_params=params)
+        else:
+            model_fit = model.filter(params)
+        forecast = model_fit.forecast(steps=steps)
+        return forecast[-1], model_fit.params
+
+class AR2Forecaster(Forecaster):
+    """ AR(2) on first differences, solved by least squares in NumPy.
+
+    The closed-form counterpart of ARIMA(2,1,0): no constant, no MA terms.
+    """
+    name = "ar2"
+
+    def fit(self, values, steps, params=None, refit=True):
+        import numpy as np
+
+        values = values[~np.isnan(values)]
+        diffs = np.diff(values)
+        if len(diffs) < 4:
+            return values[-1], None
+        lags = np.column_stack((diffs[1:-1], diffs[:-2]))
+        phi, *_ = np.linalg.lstsq(lags, diffs[2:], rcond=None)
+
+        level, d1, d2 = values[-1], diffs[-1], diffs[-2]
+        for _ in range(steps):
+            d1, d2 = phi[0] * d1 + phi[1] * d2, d1
+            level += d1
+        return level, phi
+
+class HoltForecaster(Forecaster):
+    """ Holt linear exponential smoothing with fixed smoothing factors. """
+    name = "holt"
+
+    def __init__(self, alpha=0.5, beta=0.3):
+        self.alpha = alpha  # Level smoothing
+        self.beta = beta  # Trend smoothing
+
+    def fit(self, values, steps, params=None, refit=True):
+        import numpy as np
+
+        values = values[~np.isnan(values)]
+        if len(values) < 2:
+            return values[-1], None
+        level, trend = values[0], values[1] - values[0]
+        for value in values[1:]:
+            previous = level
+            level = self.alpha * value + (1 - self.alpha) * (level + trend)
+            trend = self.beta * (level - previous) + (1 - self.beta) * trend
+        return level + steps * trend, None
+
+class LinearTrendForecaster(Forecaster):
+    """ Straight line through the last ``window`` hours, extrapolated. """
+    name = "linear"
+
+    def __init__(self, window=6):
+        self.window = window
+
+    def fit(self, values, steps, params=None, refit=True):
+        import numpy as np
+
+        hours = np.flatnonzero(~np.isnan(values))[-self.window:]
+        if len(hours) < 2:
+            return values[hours[-1]], None
+        slope, intercept = np.polyfit(hours, values[hours], 1)
+        return intercept + slope * (len(values) - 1 + steps), None
+
+FORECASTERS = {engine.name: engine for engine in
+               (ArimaForecaster, AR2Forecaster, HoltForecaster, LinearTrendForecaster)}
+FORECASTER = "arima"  # Engine used for published forecasts
+
+class ForecastEngine:
+    """ Keeps a site's forecaster state between publish cycles.
+
+    The hourly means only gain a new bucket once an hour, so a full fit runs
+    only when one arrives (for ARIMA, warm-started from the previous
+    parameters). While the current hour is still filling up, the forecaster is
+    told only the newest bucket changed, and an unchanged series just returns
+    the cached forecast.
+
+    The fit itself is split into ``plan()`` and ``commit()`` so it can run in a
+    worker process while the engine state stays in the publisher.
+    """
+
+    def __init__(self, forecaster=None, steps=FORECAST_STEPS):
+        self.forecaster = forecaster or FORECASTERS[FORECASTER]()
+        self.steps = steps
+        self.predicted = None
+        self._params = None
+        self._last_bucket = None
+        self._last_values = None
+        self._pending = None
+
+    def plan(self, last_bucket, values):
+        """ Work out whether ``values`` needs a fit.
+
+        Args:
+            last_bucket: Timestamp of the newest hourly bucket in ``values``.
+            values: Hourly series, oldest first.
+
+        Returns:
+            Tuple of (function, *args) to call for the fit, or None if the
+            cached forecast still holds.
+        """
+        import numpy as np
+
+        values = np.asarray(values, dtype=float)
+        if self.predicted is not None and last_bucket == self._last_bucket:
+            if np.array_equal(values, self._last_values, equal_nan=True):
+                return None
+            refit = False
+        else:
+            refit = True
+
+        self._pending = (last_bucket, values)
+        return (self.forecaster.fit, values, self.steps, self._params, refit)
+
+    def commit(self, result):
+        """ Store the result of the fit returned by ``plan()``.
+
+        Args:
+            result: Return value of the fit.
 
-client = InfluxDBClient(host=INFLUXDB_HOST, port=INFLUXDB_PORT, database=DATABASE)
+        Returns:
+            Forecast value ``steps`` hours ahead, rounded to 1 decimal place.
+        """
+        forecast, self._params = result
+        self.predicted = round(forecast, 1)
+        self._last_bucket, self._last_values = self._pending
+        self._pending = None
+        return self.predicted
 
-def get_pressure_data():
-    """ Get latest pressure data from InfluxDB for Summerhouse location """
-    query = """
-        SELECT MEAN("pressure") AS "pressure"
+    def forecast(self, last_bucket, values):
+        """ Return the forecast for ``values``, fitting in-process only when needed.
+
+        Args:
+            last_bucket: Timestamp of the newest hourly bucket in ``values``.
+            values: Hourly series, oldest first.
+
+        Returns:
+            Forecast value ``steps`` hours ahead, rounded to 1 decimal place.
+        """
+        job = self.plan(last_bucket, values)
+        if job is None:
+            return self.predicted
+        fit, *args = job
+        return self.commit(fit(*args))
+
+engines = {}  # One ForecastEngine per site
+
+def hourly_query(locations, fields, since=None, hours=24, span=None):
+    """ Build the InfluxQL query for hourly means of every field at every location.
+
+    Args:
+        locations: Site names to fetch.
+        fields: Measurement fields to average, e.g. ("pressure", "temperature").
+        since: Start of the first bucket to fetch, in epoch seconds. Defaults
+            to the last ``hours``.
+        hours: Length of the window when ``since`` isn't given.
+        span: Only fetch the first ``span`` hours of that window.
+
+    Returns:
+        Tuple of (query, description of the period for error messages).
+    """
+    selects = ", ".join(f'MEAN("{field}") AS "{field}"' for field in fields)
+    wheres = " OR ".join(f"\"location\" = '{location}'" for location in locations)
+    if since is None and span is not None:
+        window = f"time > now() - {hours}h AND time < now() - {hours - span}h"
+        period = f"{hours} to {hours - span} hours ago"
+    elif since is None:
+        window, period = f"time > now() - {hours}h", f"in the last {hours} hours"
+    else:
+        window, period = f"time >= {since}s", strftime("since %Y-%m-%d %H:%M UTC", gmtime(since))
+    # fill(null) gives every location the same bucket grid, so the columns
+    # can share one time index
+    query = f"""
+        SELECT {selects}
         FROM "weather"
-        WHERE "location" = 'Summerhouse'
-        AND time > now() - 24h
-        GROUP BY time(1h)
+        WHERE ({wheres})
+        AND {window}
+        GROUP BY time(1h), "location" fill(null)
         ORDER BY time ASC
     """
-    result = client.query(query)
-    
-    data = list(result.get_points())
-    if not data:
-        raise ValueError("No data returned for Summerhouse location in the last 24 hours")
-    
-    df = pd.DataFrame(data)
-    df["time"] = pd.to_datetime(df["time"])
-    df.set_index("time", inplace=True)
-    df = df.sort_index()
-    
-    df["pressure"] = df["pressure"].round(1)
-    
-     # Ensure we have enough data for ARIMA (at least 6 points for order=(2,1,0))
-    if len(df) < 6:
-        raise ValueError("Not enough valid pressure data points for ARIMA model")
-    
-    # Use a simpler ARIMA model to reduce non-stationarity issues
-    model = ARIMA(df['pressure'], order=(2,1,0))
-    model_fit = model.fit()
-    forecast = model_fit.forecast(steps=3)
-    predicted_pressure = round(forecast.iloc[-1], 1)
-
-    last_24_pressures = df["pressure"].tail(24).tolist()
-    current_pressure = df["pressure"].iloc[-1]
-    
-    return current_pressure, predicted_pressure, last_24_pressures
+    return query, period
+
+HourlySeries = namedtuple("HourlySeries", "times values")
+HourlySeries.__doc__ = """ One field at one location: int64 bucket times (epoch seconds) and float64 means """
+
+class HourlyFrame:
+    """ Hourly means for several locations and fields, held in NumPy arrays.
+
+    Attributes:
+        times: Bucket start times as int64 epoch seconds, oldest first.
+        columns: List of (location, field) pairs, one per column of ``values``.
+        values: float64 array of shape (len(times), len(columns)), NaN where a
+            bucket had no data.
+    """
+
+    def __init__(self, times, columns, values):
+        self.times = times
+        self.columns = columns
+        self.values = values
+        self._index = {column: i for i, column in enumerate(columns)}
+
+    def __len__(self):
+        return len(self.times)
+
+    def __contains__(self, column):
+        return column in self._index
+
+    def __getitem__(self, column):
+        """ Return the HourlySeries for a (location, field) column, sharing memory with the frame """
+        return HourlySeries(self.times, self.values[:, self._index[column]])
+
+    def head(self, n):
+        """ Return a frame of the first ``n`` buckets """
+        return HourlyFrame(self.times[:n], self.columns, self.values[:n])
+
+    def tail(self, n):
+        """ Return a frame of the last ``n`` buckets """
+        start = max(len(self) - n, 0)
+        return HourlyFrame(self.times[start:], self.columns, self.values[start:])
+
+    def extend(self, other):
+        """ Return a frame with the buckets of ``other`` appended after this one's """
+        import numpy as np
+
+        columns = self.columns + [column for column in other.columns if column not in self]
+        values = np.full((len(self) + len(other), len(columns)), np.nan)
+        values[:len(self), :len(self.columns)] = self.values
+        for i, column in enumerate(other.columns):
+            values[len(self):, columns.index(column)] = other.values[:, i]
+        return HourlyFrame(np.concatenate((self.times, other.times)), columns, values)
+
+def hourly_frame(series_list, locations, period):
+    """ Build an HourlyFrame from the raw series of an ``hourly_query`` result.
+
+    Each series' rows go through one vectorised conversion into a preallocated
+    block of the frame. Missing means (None) become NaN.
+
+    Raises:
+        ValueError: If no location returned any data.
+    """
+    if not series_list:
+        raise ValueError(f"No data returned for {', '.join(locations)} {period}")
+
+    import numpy as np
+
+    # fill(null) gives every series the same bucket grid
+    rows = len(series_list[0]["values"])
+    width = sum(len(series["columns"]) - 1 for series in series_list)
+    values = np.empty((rows, width))
+    columns = []
+    for series in series_list:
+        block = np.array(series["values"], dtype=np.float64)
+        values[:, len(columns):len(columns) + block.shape[1] - 1] = block[:, 1:]
+        columns += [(series["tags"]["location"], name) for name in series["columns"][1:]]
+    times = block[:, 0].astype(np.int64)
+
+    if np.any(times[1:] < times[:-1]):
+        order = np.argsort(times, kind="stable")
+        times, values = times[order], values[order]
+    return HourlyFrame(times, columns, np.round(values, 1))
+
+def fetch_hourly(locations, fields, since=None):
+    """ Fetch hourly means of every field for every location in a single query.
+
+    Args:
+        locations: Site names to fetch.
+        fields: Measurement fields to average, e.g. ("pressure", "temperature").
+        since: Start of the first bucket to fetch. Defaults to the last 24 hours.
+
+    Returns:
+        HourlyFrame with one (location, field) column per location that
+        returned data, rounded to 1 decimal place.
+
+    Raises:
+        ValueError: If no location returned any data.
+    """
+    query, period = hourly_query(locations, fields, since)
+    result = get_client().query(query, epoch="s")
+    return hourly_frame(result.raw.get("series", []), locations, period)
+
+def fetch_current(locations, fields):
+    """ Fetch the current hour's means straight over HTTP, without pandas or the InfluxDB client.
+
+    Used for a quick first publish while the heavy dependencies load.
+
+    Returns:
+        Dict of location to {field: value}, rounded to 1 decimal place.
+    """
+    from urllib.parse import urlencode
+    from urllib.request import urlopen
+
+    query, _ = hourly_query(locations, fields, hours=1)
+    url = f"http://{INFLUXDB_HOST}:{INFLUXDB_PORT}/query?" + urlencode({"db": DATABASE, "q": query})
+    with urlopen(url, timeout=INFLUXDB_TIMEOUT) as response:
+        result = json.load(response)["results"][0]
+
+    current = {}
+    for series in result.get("series", []):
+        row = series["values"][-1]
+        values = {name: round(value, 1) for name, value in zip(series["columns"][1:], row[1:]) if value is not None}
+        if values:
+            current[series["tags"]["location"]] = values
+    return current
+
+class HourlyCache:
+    """ Rolling in-memory copy of the hourly means for the last 24 hours.
+
+    Only the newest (open) bucket can still change, so after the first full
+    fetch each refresh asks InfluxDB for the buckets from the open one onwards
+    and merges them in. Buckets before the open one are closed and are kept
+    until they fall out of the window.
+
+    The oldest bucket is the exception: a full query only averages the part
+    of it inside the last 24 hours, and that part shrinks every cycle. Each
+    refresh fetches it again, trimmed the same way, in the same request, so
+    the frame matches a full query exactly.
+
+    The open bucket is whichever bucket InfluxDB returns last, so the split
+    follows the database clock rather than this host's.
+    """
+
+    def __init__(self, locations, fields, window=24):
+        self.locations = locations
+        self.fields = fields
+        self.window = window  # Closed buckets to keep
+        self.frame = None
+
+    @property
+    def since(self):
+        """ Start of the open bucket to fetch from, or None before the first fetch """
+        return None if self.frame is None else int(self.frame.times[-1])
+
+    def queries(self):
+        """ Return the ``hourly_query`` (query, period) pairs for the next refresh.
+
+        The first refresh fetches the whole window. Later ones fetch from the
+        open bucket onwards, then the window's first hour for the oldest bucket.
+        """
+        if self.frame is None:
+            return [hourly_query(self.locations, self.fields, hours=self.window)]
+        return [hourly_query(self.locations, self.fields, since=self.since),
+                hourly_query(self.locations, self.fields, hours=self.window, span=1)]
+
+    def merge(self, frame):
+        """ Merge a ``fetch_hourly`` result starting at ``since`` into the cache.
+
+        Returns:
+            HourlyFrame of the closed buckets in the window followed by the
+            open bucket.
+        """
+        if self.frame is not None:
+            frame = self.frame.head(len(self.frame) - 1).extend(frame)
+        self.frame = frame.tail(self.window + 1)
+        return self.frame
+
+    def trim(self, oldest):
+        """ Replace the oldest bucket's means with those of a trimmed ``span=1`` fetch.
+
+        Args:
+            oldest: HourlyFrame from the ``span=1`` query, or None if it
+                returned no data. Only its first bucket is used; a location
+                missing from it had no readings there, so gets NaN.
+        """
+        import numpy as np
+
+        frame = self.frame
+        if oldest is not None and oldest.times[0] != frame.times[0]:
+            return  # The hour turned between the two queries; trim on the next refresh
+        values = frame.values.copy()  # Earlier frames may still be in use
+        values[0] = np.nan
+        if oldest is not None:
+            for i, column in enumerate(frame.columns):
+                if column in oldest:
+                    values[0, i] = oldest[column].values[0]
+        self.frame = HourlyFrame(frame.times, frame.columns, values)
+
+    def update(self, results):
+        """ Merge the raw InfluxDB statement results for ``queries()`` into the cache.
+
+        Returns:
+            HourlyFrame of the closed buckets in the window followed by the
+            open bucket.
+
+        Raises:
+            ValueError: If the first fetch returned no data.
+        """
+        queries = self.queries()
+        series_lists = [result.get("series", []) for result in results]
+        if self.frame is None:
+            return self.merge(hourly_frame(series_lists[0], self.locations, queries[0][1]))
+        if series_lists[0]:
+            self.merge(hourly_frame(series_lists[0], self.locations, queries[0][1]))
+        if len(self.frame) > self.window:
+            oldest = hourly_frame(series_lists[1], self.locations, queries[1][1]) if series_lists[1] else None
+            self.trim(oldest)
+        return self.frame
+
+    def refresh(self):
+        """ Bring the cache up to date with one InfluxDB request.
+
+        Returns:
+            HourlyFrame of the closed buckets in the window followed by the
+            open bucket.
+        """
+        result = get_client().query("; ".join(query for query, _ in self.queries()), epoch="s")
+        results = result if isinstance(result, list) else [result]
+        return self.update([r.raw for r in results])
+
+cache = HourlyCache(SITES, FIELDS)
+
+def get_hourly_data(frame, location, field):
+    """ Get the hourly ``field`` HourlySeries for ``location`` from a ``fetch_hourly`` frame """
+    import numpy as np
+
+    column = (location, field)
+    if column not in frame or np.isnan(frame[column].values).all():
+        raise ValueError(f"No {field} data returned for {location} location in the last 24 hours")
+    return frame[column]
+
+def get_pressure_data(frame, location):
+    """ Get latest pressure data for ``location`` """
+    pressure = get_hourly_data(frame, location, "pressure")
+
+    # Ensure we have enough data for ARIMA (at least 6 points for order=(2,1,0))
+    if len(pressure.times) < 6:
+        raise ValueError(f"Not enough valid pressure data points for ARIMA model at {location}")
+
+    return pressure
+
+def get_temperature_data(frame, location):
+    """ Get latest temperature data for ``location`` """
+    return get_hourly_data(frame, location, "temperature")
+
+def get_site_data(frame, location):
+    """ Get every reading for ``location``, skipping any field it has no data for """
+    readings = {}
+    for field, getter in (("pressure", get_pressure_data), ("temperature", get_temperature_data)):
+        try:
+            readings[field] = getter(frame, location)
+        except ValueError as e:
+            print(f"Error: {e}")
+    return readings
 
 def interpret_weather(current, future):
     change = future - current
@@ -70,65 +555,440 @@ def interpret_weather(current, future):
     else:
         return "Storm approaching, prepare for bad weather."
 
-def get_temperature_data():
-    """ Get latest temperature data from InfluxDB for RobotLab location """
-    query = """
-        SELECT MEAN("temperature") AS "temperature"
-        FROM "weather"
-        WHERE "location" = 'RobotLab'
-        AND time > now() - 24h
-        GROUP BY time(1h)
-        ORDER BY time ASC
+def forecast_sites(executor, pressures):
+    """ Forecast every site's pressure, running the fits side by side.
+
+    Args:
+        executor: ``concurrent.futures`` executor to run the fits on.
+        pressures: Dict of location to hourly pressure series.
+
+    Returns:
+        Dict of location to predicted pressure.
+    """
+    futures = {}
+    for location, pressure in pressures.items():
+        engine = engines.setdefault(location, ForecastEngine())
+        if engine.forecaster.runs_inline:
+            engine.forecast(pressure.times[-1], pressure.values)
+            continue
+        job = engine.plan(pressure.times[-1], pressure.values)
+        if job is not None:
+            futures[location] = executor.submit(*job)
+
+    for location, future in futures.items():
+        engines[location].commit(future.result())
+
+    return {location: engines[location].predicted for location in pressures}
+
+class PublishTracker:
+    """ Remembers the last payload sent on each topic.
+
+    Messages are published retained, so the broker hands the latest state to
+    new subscribers and unchanged topics never need to be sent again. That
+    spares the displays a wakeup and a JSON parse for every repeat.
+    """
+
+    def __init__(self):
+        self._sent = {}
+
+    def changed(self, messages):
+        """ Return the (topic, payload) pairs that differ from what was last sent """
+        return [(topic, payload) for topic, payload in messages if self._sent.get(topic) != payload]
+
+    def mark_sent(self, messages):
+        """ Record (topic, payload) pairs as delivered """
+        self._sent.update(messages)
+
+    def reset(self):
+        """ Forget what was sent, so every topic goes out again on the next cycle """
+        self._sent = {}
+
+publish_tracker = PublishTracker()
+
+class MQTTPublisher:
+    """ A long-lived MQTT connection for the forecast topics.
+
+    The paho network loop runs in its own thread and reconnects with
+    exponential backoff when the broker goes away. Each cycle's messages are
+    queued back to back and then acknowledged together, so they share one
+    round trip rather than paying for a connection each.
+
+    Nothing is handed to paho while the broker is unreachable, and paho holds
+    at most MQTT_MAX_QUEUED unacknowledged messages, so an outage doesn't
+    build a backlog of stale forecasts. ``publish()`` reports what was
+    acknowledged; with PublishTracker the rest go out in a later cycle, with
+    the latest payload for each topic.
+
+    Attributes:
+        connected: Event set while the broker connection is up.
+        stats: Per-cycle publish metrics: cycles, messages, and the last, max
+            and total time in milliseconds from the first publish to the last
+            acknowledgement.
+    """
+
+    def __init__(self, host, port, qos=MQTT_QOS, timeout=MQTT_PUBLISH_TIMEOUT, on_session=None):
+        """ Create the publisher. Call ``start()`` to connect.
+
+        Args:
+            host: Broker host name or address.
+            port: Broker port.
+            qos: QoS level for every publish.
+            timeout: Seconds ``publish()`` waits for acknowledgements.
+            on_session: Called with no arguments whenever a new broker session
+                starts, e.g. to resend retained state after a broker restart.
+        """
+        self.host = host
+        self.port = port
+        self.qos = qos
+        self.timeout = timeout
+        self.on_session = on_session
+        self.connected = threading.Event()
+        self.stats = {"cycles": 0, "messages": 0, "last_ms": 0.0, "max_ms": 0.0, "total_ms": 0.0}
+        self._acked = set()
+        self._acked_changed = threading.Condition()
+
+        import paho.mqtt.client as mqtt
+
+        # Use modern callback API and MQTT v3.1.1
+        self._client = mqtt.Client(callback_api_version=mqtt.CallbackAPIVersion.VERSION2, protocol=mqtt.MQTTv311)
+        self._client.reconnect_delay_set(min_delay=1, max_delay=60)
+        self._client.max_queued_messages_set(MQTT_MAX_QUEUED)
+        self._client.on_connect = self._on_connect
+        self._client.on_disconnect = self._on_disconnect
+        self._client.on_publish = self._on_publish
+
+    def start(self):
+        """ Start the network loop, which connects (and reconnects) in the background """
+        self._client.connect_async(self.host, self.port)
+        self._client.loop_start()
+
+    def stop(self):
+        """ Disconnect and stop the network loop """
+        self._client.disconnect()
+        self._client.loop_stop()
+
+    def publish(self, messages):
+        """ Publish (topic, payload) pairs as retained messages.
+
+        Waits up to the timeout for the broker connection, then for the
+        acknowledgements. Nothing is published if the broker stays
+        unreachable.
+
+        Args:
+            messages: List of (topic, payload) pairs.
+
+        Returns:
+            List of the (topic, payload) pairs the broker acknowledged within
+            the timeout (at QoS 0, every pair paho accepted).
+        """
+        import paho.mqtt.client as mqtt
+
+        start = perf_counter()
+        if not self.connected.wait(self.timeout):
+            return []
+        with self._acked_changed:
+            self._acked.clear()
+        accepted = []
+        for topic, payload in messages:
+            info = self._client.publish(topic, payload, qos=self.qos, retain=True)
+            if info.rc == mqtt.MQTT_ERR_SUCCESS:
+                accepted.append((info.mid, (topic, payload)))
+        if self.qos == 0:
+            delivered = [message for _, message in accepted]
+        else:
+            mids = {mid for mid, _ in accepted}
+            with self._acked_changed:
+                self._acked_changed.wait_for(lambda: mids <= self._acked, self.timeout)
+                delivered = [message for mid, message in accepted if mid in self._acked]
+
+        elapsed = (perf_counter() - start) * 1000
+        self.stats["cycles"] += 1
+        self.stats["messages"] += len(messages)
+        self.stats["last_ms"] = elapsed
+        self.stats["max_ms"] = max(self.stats["max_ms"], elapsed)
+        self.stats["total_ms"] += elapsed
+        return delivered
+
+    def _on_connect(self, client, userdata, flags, reason_code, properties):
+        if reason_code.is_failure:
+            print(f"MQTT connect failed: {reason_code}")
+            return
+        print(f"Connected to MQTT broker {self.host}:{self.port}")
+        self.connected.set()
+        if self.on_session and not flags.session_present:
+            self.on_session()
+
+    def _on_disconnect(self, client, userdata, flags, reason_code, properties):
+        self.connected.clear()
+        if reason_code != 0:
+            print(f"MQTT connection lost ({reason_code}), reconnecting")
+
+    def _on_publish(self, client, userdata, mid, reason_code, properties):
+        with self._acked_changed:
+            self._acked.add(mid)
+            self._acked_changed.notify_all()
+
+publisher = None  # MQTTPublisher, created by main()
+
+def site_messages(prefix, pressure=None, temperature=None, predicted_pressure=None):
+    """ Build the (topic, payload) pairs to publish under ``prefix`` """
+    messages = []
+    if pressure is not None:
+        current_pressure = float(pressure.values[-1])
+        messages.append((f"{prefix}/pressure", json.dumps({"last_24_pressures": pressure.values[-24:].tolist()})))
+        messages.append((f"{prefix}/current_pressure", json.dumps({"current_pressure": current_pressure})))
+        if predicted_pressure is not None:
+            messages.append((f"{prefix}/prediction", interpret_weather(current_pressure, predicted_pressure)))
+    if temperature is not None:
+        messages.append((f"{prefix}/temperature", json.dumps({"last_24_temperatures": temperature.values[-24:].tolist()})))
+        messages.append((f"{prefix}/current_temperature", json.dumps({"current_temperature": float(temperature.values[-1])})))
+    return messages
+
+def dashboard_messages(location, readings, predicted_pressure=None):
+    """ Build the un-prefixed weather/... messages that ``location`` feeds, if any """
+    pressure_site = location == DASHBOARD_PRESSURE_SITE
+    temperature_site = location == DASHBOARD_TEMPERATURE_SITE
+    return site_messages("weather",
+                         readings.get("pressure") if pressure_site else None,
+                         readings.get("temperature") if temperature_site else None,
+                         predicted_pressure if pressure_site else None)
+
+def current_messages(current):
+    """ Build the current_<field> messages from a ``fetch_current`` result """
+    dashboard_sites = {"pressure": DASHBOARD_PRESSURE_SITE, "temperature": DASHBOARD_TEMPERATURE_SITE}
+    messages = []
+    for location, values in current.items():
+        for field, value in values.items():
+            payload = json.dumps({f"current_{field}": value})
+            messages.append((f"weather/{location}/current_{field}", payload))
+            if dashboard_sites.get(field) == location:
+                messages.append((f"weather/current_{field}", payload))
+    return messages
+
+def run_cycle(executor):
+    """ Query, forecast and publish every site once """
+    frame = cache.refresh()
+    readings = {location: get_site_data(frame, location) for location in SITES}
+    if not any(readings.values()):
+        raise ValueError("No data returned for any site in the last 24 hours")
+
+    pressures = {location: data["pressure"] for location, data in readings.items() if "pressure" in data}
+
+    predictions = forecast_sites(executor, pressures)
+
+    messages = []
+    for location, data in readings.items():
+        messages += site_messages(f"weather/{location}", data.get("pressure"), data.get("temperature"),
+                                  predictions.get(location))
+        messages += dashboard_messages(location, data, predictions.get(location))
+
+    publish_changes(messages)
+
+def publish_changes(messages):
+    """ Publish the messages whose payload changed since they were last sent """
+    changed = publish_tracker.changed(messages)
+    if not changed:
+        print("No changes to publish")
+        return
+
+    print("Publishing changed pressure and temperature data to MQTT")
+    for topic, payload in changed:
+        print(f"{topic}: {payload}")
+
+    delivered = publisher.publish(changed)
+    publish_tracker.mark_sent(delivered)
+
+    stats = publisher.stats
+    print(f"Published {len(changed)} messages in {stats['last_ms']:.1f} ms"
+          f" (avg {stats['total_ms'] / stats['cycles']:.1f} ms, max {stats['max_ms']:.1f} ms)")
+    if len(delivered) < len(changed):
+        print(f"{len(changed) - len(delivered)} messages not acknowledged, they will be retried next cycle")
+
+def main():
+    global publisher
+    publisher = MQTTPublisher(MQTT_HOST, MQTT_PORT, on_session=publish_tracker.reset)
+    publisher.start()
+
+    # Get the current values out before the model and its dependencies are ready
+    try:
+        publish_changes(current_messages(fetch_current(SITES, FIELDS)))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+
+    workers = min(len(SITES), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            print("Waking up")
+            try:
+                run_cycle(executor)
+                print(f"Sleeping for {CYCLE_SECONDS} seconds")
+                sleep(CYCLE_SECONDS)
+            except ValueError as e:
+                print(f"Error: {e}")
+                print(f"Sleeping for {CYCLE_SECONDS} seconds before retrying")
+                sleep(CYCLE_SECONDS)
+
+# Asyncio runtime (python forecast.py --async), needs aiohttp and aiomqtt.
+# One refresh per cycle fetches every site, then each site runs its own
+# fit -> publish loop, so a slow fit for one site doesn't hold up the others.
+
+import asyncio
+
+class Outbox:
+    """ The latest unpublished batch of messages from each source.
+
+    A source's new batch replaces the one still waiting, so a broker outage
+    holds at most one batch per site in memory and only the newest state is
+    sent on reconnect.
+    """
+
+    def __init__(self):
+        self._batches = {}
+        self._ready = asyncio.Event()
+
+    def put(self, source, messages):
+        """ Queue ``messages`` from ``source``, replacing its unpublished batch """
+        self._batches[source] = messages
+        self._ready.set()
+
+    async def take(self):
+        """ Wait for batches, then return and remove them all as {source: messages} """
+        await self._ready.wait()
+        self._ready.clear()
+        batches, self._batches = self._batches, {}
+        return batches
+
+    def restore(self, batches):
+        """ Put back batches that failed to publish, unless a newer one has arrived """
+        for source, messages in batches.items():
+            self._batches.setdefault(source, messages)
+        if self._batches:
+            self._ready.set()
+
+class FrameFeed:
+    """ The latest HourlyFrame from the shared refresh, for every site to read.
+
+    One refresh per cycle serves all sites with a single InfluxDB request. A
+    site still busy with an earlier frame skips straight to the newest one.
     """
-    result = client.query(query)
-    
-    data = list(result.get_points())
-    if not data:
-        raise ValueError("No data returned for RobotLab location in the last 24 hours")
-    
-    df = pd.DataFrame(data)
-    df["time"] = pd.to_datetime(df["time"])
-    df.set_index("time", inplace=True)
-    df = df.sort_index()
-    
-    df["temperature"] = df["temperature"].round(1)
-    
-    last_24_temperatures = df["temperature"].tail(24).tolist()
-    current_temperature = df["temperature"].iloc[-1]
-    
-    return current_temperature, last_24_temperatures
-
-while True:
-    print("Waking up")
+
+    def __init__(self):
+        self.frame = None
+        self.version = 0
+        self._changed = asyncio.Condition()
+
+    async def put(self, frame):
+        """ Hand ``frame`` to the sites """
+        async with self._changed:
+            self.frame = frame
+            self.version += 1
+            self._changed.notify_all()
+
+    async def next(self, seen):
+        """ Wait for a frame newer than version ``seen``, then return (version, frame) """
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.version > seen)
+            return self.version, self.frame
+
+async def query_async(session, query):
+    """ Run InfluxQL ``query`` over an ``aiohttp.ClientSession``, returning the raw statement results """
+    url = f"http://{INFLUXDB_HOST}:{INFLUXDB_PORT}/query"
+    async with session.get(url, params={"db": DATABASE, "q": query, "epoch": "s"}) as response:
+        response.raise_for_status()
+        body = await response.json()
+    for result in body["results"]:
+        if "error" in result:
+            raise ValueError(f"InfluxDB error: {result['error']}")
+    return body["results"]
+
+async def refresh_async(cache, session):
+    """ Async version of ``HourlyCache.refresh`` """
+    return cache.update(await query_async(session, "; ".join(query for query, _ in cache.queries())))
+
+async def refresh_sites(cache, session, feed):
+    """ Refresh the shared cache for every site each cycle and feed the frame to the sites """
+    import aiohttp
+
+    while True:
+        try:
+            await feed.put(await refresh_async(cache, session))
+        except (ValueError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error: {e!r}")
+        await asyncio.sleep(CYCLE_SECONDS)
+
+async def run_site(location, feed, executor, outbox):
+    """ Forecast and queue the messages for one site from each frame the feed hands out """
+    loop = asyncio.get_running_loop()
+    engine = engines.setdefault(location, ForecastEngine())
+    version = 0
+    while True:
+        version, frame = await feed.next(version)
+        try:
+            data = get_site_data(frame, location)
+            if "pressure" in data:
+                pressure = data["pressure"]
+                if engine.forecaster.runs_inline:
+                    engine.forecast(pressure.times[-1], pressure.values)
+                else:
+                    job = engine.plan(pressure.times[-1], pressure.values)
+                    if job is not None:
+                        engine.commit(await loop.run_in_executor(executor, *job))
+            predicted = engine.predicted if "pressure" in data else None
+            outbox.put(location, site_messages(f"weather/{location}", data.get("pressure"), data.get("temperature"), predicted)
+                       + dashboard_messages(location, data, predicted))
+        except ValueError as e:
+            print(f"Error for {location}: {e!r}")
+
+async def publish_async(outbox):
+    """ Publish the outbox over one async MQTT connection, reconnecting with backoff """
+    import aiomqtt
+
+    delay = 1
+    while True:
+        try:
+            async with aiomqtt.Client(MQTT_HOST, MQTT_PORT, protocol=aiomqtt.ProtocolVersion.V311) as mqtt_client:
+                print(f"Connected to MQTT broker {MQTT_HOST}:{MQTT_PORT}")
+                delay = 1
+                publish_tracker.reset()
+                while True:
+                    batches = await outbox.take()
+                    changed = publish_tracker.changed([message for messages in batches.values() for message in messages])
+                    if not changed:
+                        continue
+                    start = perf_counter()
+                    try:
+                        await asyncio.gather(*(mqtt_client.publish(topic, payload, qos=MQTT_QOS, retain=True)
+                                               for topic, payload in changed))
+                    except aiomqtt.MqttError:
+                        outbox.restore(batches)
+                        raise
+                    publish_tracker.mark_sent(changed)
+                    print(f"Published {len(changed)} messages in {(perf_counter() - start) * 1000:.1f} ms")
+        except aiomqtt.MqttError as e:
+            print(f"MQTT connection lost ({e}), reconnecting in {delay} s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 60)
+
+async def main_async():
+    import aiohttp
+
+    loop = asyncio.get_running_loop()
+    outbox = Outbox()
     try:
-        current_pressure, predicted_pressure, last_24_pressures = get_pressure_data()
-        current_temperature, last_24_temperatures = get_temperature_data()
-        
-        prediction = interpret_weather(current_pressure, predicted_pressure)
-        print(f"Predicted weather: {prediction}")
-
-        pressure_payload = json.dumps({"last_24_pressures": last_24_pressures})
-        temperature_payload = json.dumps({"last_24_temperatures": last_24_temperatures})
-        current_pressure_payload = json.dumps({"current_pressure": current_pressure})
-        current_temperature_payload = json.dumps({"current_temperature": current_temperature})
-        
-        print("Publishing pressure and temperature data to MQTT")
-        print("Pressure:", pressure_payload)
-        print("Temperature:", temperature_payload)
-        print("Current Pressure:", current_pressure_payload)
-        print("Current Temperature:", current_temperature_payload)
-
-        mqtt_client.connect(MQTT_HOST, MQTT_PORT)
-        mqtt_client.publish("weather/pressure", pressure_payload)
-        mqtt_client.publish("weather/current_pressure", current_pressure_payload)
-        mqtt_client.publish("weather/temperature", temperature_payload)
-        mqtt_client.publish("weather/current_temperature", current_temperature_payload)
-        mqtt_client.publish("weather/prediction", prediction)
-        mqtt_client.disconnect()
-        
-        print("Sleeping for 5 seconds")
-        sleep(5)
-    except ValueError as e:
+        outbox.put("current", current_messages(await loop.run_in_executor(None, fetch_current, SITES, FIELDS)))
+    except (OSError, ValueError) as e:
         print(f"Error: {e}")
-        print("Sleeping for 5 seconds before retrying")
-        sleep(5)
+
+    feed = FrameFeed()
+    workers = min(len(SITES), os.cpu_count() or 1)
+    timeout = aiohttp.ClientTimeout(total=INFLUXDB_TIMEOUT)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            await asyncio.gather(publish_async(outbox), refresh_sites(cache, session, feed),
+                                 *(run_site(location, feed, executor, outbox) for location in SITES))
+
+if __name__ == "__main__":
+    if "--async" in sys.argv[1:]:
+        asyncio.run(main_async())
+    else:
+        main()
@@ -5,7 +5,12 @@
 
 VERSION = "2.2.0"
 
-import jpegdec
+from array import array
+
+try:
+    import jpegdec
+except ImportError:  # Not on PicoGraphics builds without JPEG support, or off-device
+    jpegdec = None
 
 # Module-level constants
 DEFAULT_COLORS = {
@@ -23,6 +28,9 @@ DEFAULT_SIZES = {
     'GRID_SPACING': 10,
     'BAR_GAP': 3,
 }
+PEN_CACHE_LIMIT = 64  # Pens kept per display before the least recently used is evicted
+IMAGE_CACHE_BYTES = 32 * 1024  # JPEG data kept in RAM for ImageTile, shared by all tiles
+IMAGE_SNAPSHOT_BYTES = 32 * 1024  # Largest decoded image an ImageTile keeps a pixel copy of
 DEBUG = False  # Toggle for debug output
 
 def log_debug(message: str) -> None:
@@ -34,12 +42,525 @@ def log_debug(message: str) -> None:
     if DEBUG:
         print(f"DEBUG: {message}")
 
+# Frame state per display, reused every frame: [open, x0, y0, x1, y1]
+_frames = {}
+
+def pack_colour(colour) -> int:
+    """Return a colour as an int in 0xRRGGBB form.
+
+    Args:
+        colour: An int already in 0xRRGGBB form, or a dict with 'red', 'green',
+            'blue' keys (0-255).
+
+    Returns:
+        The packed colour.
+    """
+    if isinstance(colour, int):
+        return colour
+    return (colour['red'] << 16) | (colour['green'] << 8) | colour['blue']
+
+def frame_open(display) -> bool:
+    """Whether begin_frame() has been called on a display without end_frame()."""
+    frame = _frames.get(id(display))
+    return frame is not None and frame[0]
+
+def begin_frame(display) -> None:
+    """Start a frame on a display.
+
+    Until end_frame() is called, widget update() calls only draw into the
+    framebuffer and record the area they touched.
+
+    Args:
+        display: The display object (e.g., PicoGraphics).
+    """
+    frame = _frames.get(id(display))
+    if frame is None:
+        frame = _frames[id(display)] = [False, 0, 0, 0, 0]
+    frame[0] = True
+    frame[1] = frame[2] = 0x7FFF
+    frame[3] = frame[4] = -1
+
+def add_damage(display, x: int, y: int, width: int, height: int) -> None:
+    """Record an area drawn during the open frame, or flush it if no frame is open.
+
+    Args:
+        display: The display object the area was drawn on.
+        x, y: Top left corner of the area.
+        width, height: Size of the area.
+    """
+    frame = _frames.get(id(display))
+    if frame is None or not frame[0]:
+        display.update()
+        return
+    if x < frame[1]:
+        frame[1] = x
+    if y < frame[2]:
+        frame[2] = y
+    if x + width > frame[3]:
+        frame[3] = x + width
+    if y + height > frame[4]:
+        frame[4] = y + height
+
+def end_frame(display, presenter=None) -> bool:
+    """Finish the frame on a display and present it once.
+
+    Only the union of the areas drawn during the frame is pushed when the
+    presenter has a partial_update(x, y, w, h) method (such as Presto);
+    otherwise the whole framebuffer is pushed with update().
+
+    Args:
+        display: The display object passed to begin_frame().
+        presenter: Object to present with (defaults to the display).
+
+    Returns:
+        True if anything was presented, False if nothing was drawn.
+    """
+    frame = _frames.get(id(display))
+    if frame is None or not frame[0]:
+        return False
+    frame[0] = False
+    if frame[3] < 0:
+        return False
+    presenter = presenter or display
+    screen_width, screen_height = display.get_bounds()
+    x0 = frame[1] if frame[1] > 0 else 0
+    y0 = frame[2] if frame[2] > 0 else 0
+    x1 = frame[3] if frame[3] < screen_width else screen_width
+    y1 = frame[4] if frame[4] < screen_height else screen_height
+    if hasattr(presenter, "partial_update") and (x1 - x0 < screen_width or y1 - y0 < screen_height):
+        presenter.partial_update(x0, y0, x1 - x0, y1 - y0)
+    else:
+        presenter.update()
+    return True
+
+class PenRegistry:
+    """Pens for one display, shared by every widget that draws on it.
+
+    Get one with pen_registry(display). Each colour gets a single pen however many
+    widgets use it. Once limit pens are held, the least recently used one is evicted.
+    Widgets look their pens up at the start of every draw, so a pen counts as used
+    each time it is drawn with, not just when its colour was set. On palette modes,
+    where pens are palette slots, set recycle to reuse the evicted slot for the new
+    colour with update_pen(); generation then changes.
+
+    Attributes:
+        limit: Maximum number of pens held.
+        recycle: Reuse evicted pens with update_pen() instead of creating new ones.
+        hits, misses, evictions: Lookup counters.
+        generation: Bumped whenever a recycled pen changes colour.
+    """
+    __slots__ = ('_display', 'limit', 'recycle', 'hits', 'misses', 'evictions',
+                 'generation', '_pens', '_used', '_clock')
+
+    def __init__(self, display, limit: int = PEN_CACHE_LIMIT, recycle: bool = False):
+        """Create an empty registry.
+
+        Args:
+            display: The display object (e.g., PicoGraphics).
+            limit: Maximum number of pens held (default PEN_CACHE_LIMIT).
+            recycle: Reuse evicted pens with update_pen() (default False).
+        """
+        self._display = display
+        self.limit = limit
+        self.recycle = recycle
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.generation = 0
+        self._pens = {}  # Colour -> pen
+        self._used = {}  # Colour -> clock value of its last use
+        self._clock = 0
+
+    def __len__(self) -> int:
+        return len(self._pens)
+
+    def get(self, colour: int) -> int:
+        """Get the pen for a colour, creating it if needed.
+
+        Args:
+            colour: Colour as 0xRRGGBB.
+
+        Returns:
+            Pen ID for the display.
+        """
+        self._clock += 1
+        pen = self._pens.get(colour)
+        if pen is not None:
+            self.hits += 1
+            self._used[colour] = self._clock
+            return pen
+
+        self.misses += 1
+        red, green, blue = colour >> 16, (colour >> 8) & 0xFF, colour & 0xFF
+        if len(self._pens) >= self.limit:
+            used = self._used
+            oldest = min(used, key=used.get)
+            pen = self._pens.pop(oldest)
+            del used[oldest]
+            self.evictions += 1
+            if self.recycle:
+                self._display.update_pen(pen, red, green, blue)
+                self.generation += 1
+            else:
+                pen = None
+        if pen is None:
+            pen = self._display.create_pen(red, green, blue)
+        self._pens[colour] = pen
+        self._used[colour] = self._clock
+        return pen
+
+class TextLayout:
+    """Measured placement of a widget's text, kept until the text or its box changes.
+
+    Attributes:
+        scale: Text scale chosen to fit the box.
+        text_width: Width of the text at that scale, in pixels.
+        lines: The text wrapped to the box width, or None if it fits on one line.
+    """
+    __slots__ = ('text', 'font', 'width', 'height', 'scale', 'text_width', 'lines')
+
+    def __init__(self):
+        self.text = None
+        self.font = None
+        self.width = -1
+        self.height = -1
+        self.scale = 1
+        self.text_width = 0
+        self.lines = None
+
+    def fit(self, display, text: str, font: str, width: int, height: int,
+            max_scale: int = 1, wrap: bool = False) -> None:
+        """Measure text into a box, unless it was already measured for the same box.
+
+        Tries scales from max_scale down to 1 and keeps the largest that fits. The
+        display's font must already be set to font.
+
+        Args:
+            display: The display object used to measure the text.
+            text: Text to place.
+            font: Font name the text is drawn in.
+            width, height: Size of the box in pixels.
+            max_scale: Largest text scale to try (default 1).
+            wrap: Split text that is still too wide into lines (default False).
+        """
+        if text == self.text and font == self.font and width == self.width and height == self.height:
+            return
+        scale = max_scale
+        while scale > 1:
+            text_width = display.measure_text(text, scale)
+            if text_width <= width and 8 * scale <= height:  # bitmap fonts are 8 pixels per scale
+                break
+            scale -= 1
+        else:
+            text_width = display.measure_text(text, 1)
+        self.lines = None
+        if wrap and text_width > width:
+            self.lines = self._wrap(display, text, scale, width)
+        self.text, self.font, self.width, self.height = text, font, width, height
+        self.scale = scale
+        self.text_width = text_width
+        if DEBUG:
+            log_debug(f"Text layout: width={text_width}, scale={scale}, lines={self.lines}")
+
+    @staticmethod
+    def _wrap(display, text: str, scale: int, width: int) -> list:
+        lines = []
+        line = ""
+        for word in text.split(" "):
+            candidate = line + " " + word if line else word
+            if line and display.measure_text(candidate, scale) > width:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+        return lines
+
+# Pen registries, keyed by display
+_pen_registries = {}
+
+def pen_registry(display) -> PenRegistry:
+    """Get the pen registry shared by every widget on a display.
+
+    Args:
+        display: The display object (e.g., PicoGraphics).
+
+    Returns:
+        The display's PenRegistry, created on first use.
+    """
+    registry = _pen_registries.get(id(display))
+    if registry is None:
+        registry = _pen_registries[id(display)] = PenRegistry(display)
+    return registry
+
+class RingBuffer:
+    """A fixed-capacity rolling series backed by a preallocated array.
+
+    Appending to a full buffer overwrites the oldest value. The lowest and highest
+    values are kept up to date as values arrive, with a rescan only when one of
+    them is overwritten. Indexing and iteration run oldest to newest.
+
+    Attributes:
+        capacity: Maximum number of values held.
+        low, high: Smallest and largest value held (None when empty).
+        total: Number of values appended since creation or the last clear().
+    """
+
+    __slots__ = ('capacity', 'low', 'high', 'total', '_data', '_scratch', '_start',
+                 '_length')
+
+    def __init__(self, capacity: int, typecode: str = 'f'):
+        """Create an empty buffer.
+
+        Args:
+            capacity: Maximum number of values held.
+            typecode: array typecode for the storage (default 'f', 32-bit float).
+
+        Raises:
+            ValueError: If capacity is less than 1.
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        self.capacity = capacity
+        self._data = array(typecode, [0] * capacity)
+        self._scratch = array(typecode, [0])  # Rounds values to the storage type
+        self._start = 0
+        self._length = 0
+        self.total = 0
+        self.low = None
+        self.high = None
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _index(self, index: int) -> int:
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("RingBuffer index out of range")
+        index += self._start
+        return index - self.capacity if index >= self.capacity else index
+
+    def __getitem__(self, index: int):
+        return self._data[self._index(index)]
+
+    def __setitem__(self, index: int, value) -> None:
+        index = self._index(index)
+        old = self._data[index]
+        self._data[index] = value
+        value = self._data[index]
+        if old == self.low or old == self.high:
+            self._rescan()
+        else:
+            self._track(value)
+
+    def __iter__(self):
+        data, capacity = self._data, self.capacity
+        index = self._start
+        for _ in range(self._length):
+            yield data[index]
+            index += 1
+            if index == capacity:
+                index = 0
+
+    def _track(self, value) -> None:
+        if self.low is None or value < self.low:
+            self.low = value
+        if self.high is None or value > self.high:
+            self.high = value
+
+    def _rescan(self) -> None:
+        self.low = self.high = None
+        for value in self:
+            self._track(value)
+
+    def append(self, value) -> None:
+        """Add a value, dropping the oldest one if the buffer is full.
+
+        Args:
+            value: Value to add.
+        """
+        self.total += 1
+        if self._length < self.capacity:
+            index = self._start + self._length
+            if index >= self.capacity:
+                index -= self.capacity
+            self._data[index] = value
+            self._length += 1
+            self._track(self._data[index])
+            return
+        old = self._data[self._start]
+        self._data[self._start] = value
+        value = self._data[self._start]
+        self._start += 1
+        if self._start == self.capacity:
+            self._start = 0
+        if (old == self.low and value > old) or (old == self.high and value < old):
+            self._rescan()
+        else:
+            self._track(value)
+
+    def extend(self, values) -> None:
+        """Add several values, oldest first.
+
+        Args:
+            values: Iterable of values to add.
+        """
+        for value in values:
+            self.append(value)
+
+    def clear(self) -> None:
+        """Remove every value."""
+        self._start = 0
+        self._length = 0
+        self.total = 0
+        self.low = None
+        self.high = None
+
+    def matches(self, values, shift: int = 0) -> bool:
+        """Check whether a sequence holds the buffer's values, as stored.
+
+        Args:
+            values: Sequence to compare, oldest first.
+            shift: Number of buffered values to skip at the start; with shift=1 a
+                match means values is this buffer after one append.
+
+        Returns:
+            True if every compared value is equal after rounding to the storage type.
+        """
+        count = self._length - shift
+        if count < 0 or len(values) != self._length:
+            return False
+        scratch = self._scratch
+        for index in range(count):
+            scratch[0] = values[index]
+            if scratch[0] != self[index + shift]:
+                return False
+        return True
+
+class MinMaxBuckets:
+    """Lowest and highest value of each fixed-size bucket of a series.
+
+    Used to draw series longer than the chart is wide: each bucket becomes one pixel
+    column holding its low and high, so peaks survive the downsampling. Buckets are
+    aligned to absolute sample numbers, so a rolling series only updates the newest
+    and oldest bucket as readings arrive.
+
+    Attributes:
+        size: Samples per bucket.
+        first: Bucket number (absolute sample number // size) of the first bucket.
+        lo, hi: Lowest and highest value of each bucket.
+        lo_at, hi_at: Absolute sample numbers of those values.
+    """
+
+    __slots__ = ('size', 'first', 'lo', 'lo_at', 'hi', 'hi_at')
+
+    def __init__(self, size: int):
+        """Create an empty set of buckets.
+
+        Args:
+            size: Samples per bucket.
+        """
+        self.size = size
+        self.first = 0
+        self.lo = []
+        self.lo_at = []
+        self.hi = []
+        self.hi_at = []
+
+    def build(self, values, start: int = 0) -> None:
+        """Bucket a whole series.
+
+        Args:
+            values: Indexable series, oldest first.
+            start: Absolute sample number of values[0].
+        """
+        self.first = start // self.size
+        self.lo, self.lo_at, self.hi, self.hi_at = [], [], [], []
+        for index in range(len(values)):
+            self.add(values[index], start + index)
+
+    def add(self, value, at: int) -> None:
+        """Add the newest sample.
+
+        Args:
+            value: Sample value.
+            at: Absolute sample number, after every bucketed sample.
+        """
+        if at // self.size - self.first == len(self.lo):
+            self.lo.append(value)
+            self.lo_at.append(at)
+            self.hi.append(value)
+            self.hi_at.append(at)
+            return
+        if value < self.lo[-1]:
+            self.lo[-1] = value
+            self.lo_at[-1] = at
+        if value > self.hi[-1]:
+            self.hi[-1] = value
+            self.hi_at[-1] = at
+
+    def drop(self, at: int, values, start: int) -> None:
+        """Forget the oldest sample.
+
+        Args:
+            at: Absolute sample number being dropped.
+            values: The series without that sample, oldest first.
+            start: Absolute sample number of values[0].
+        """
+        if at + 1 >= (self.first + 1) * self.size:  # It was the first bucket's last sample
+            for column in (self.lo, self.lo_at, self.hi, self.hi_at):
+                column.pop(0)
+            self.first += 1
+        elif at == self.lo_at[0] or at == self.hi_at[0]:
+            self._rescan(0, values, start)
+
+    def update(self, at: int, values, start: int) -> None:
+        """Refresh the bucket holding a sample whose value changed.
+
+        Args:
+            at: Absolute sample number that changed.
+            values: The series, oldest first.
+            start: Absolute sample number of values[0].
+        """
+        self._rescan(at // self.size - self.first, values, start)
+
+    def _rescan(self, bucket: int, values, start: int) -> None:
+        begin = max((self.first + bucket) * self.size, start)
+        end = min((self.first + bucket + 1) * self.size, start + len(values))
+        lo = hi = values[begin - start]
+        lo_at = hi_at = begin
+        for at in range(begin + 1, end):
+            value = values[at - start]
+            if value < lo:
+                lo, lo_at = value, at
+            if value > hi:
+                hi, hi_at = value, at
+        self.lo[bucket], self.lo_at[bucket] = lo, lo_at
+        self.hi[bucket], self.hi_at[bucket] = hi, hi_at
+
+# Chart attributes the cached layout depends on, besides the values themselves
+_LAYOUT_FIELDS = ('_version', 'x', 'y', 'width', 'height', 'border_width', 'text_height',
+                  '_scale_to_fit', 'show_bars', 'bar_gap', 'data_point_width', '_x_scale',
+                  '_min_val', '_max_val')
+
 class Chart:
     """A chart for plotting data on a MicroPython display.
 
     Use this to visualize data as bars, lines, or points. Set position, size, and colors
     after creation if needed.
 
+    Changing the title, values or colours marks the chart dirty so a Container only
+    redraws it when something changed. Call mark_dirty() after changing any other
+    display option, or after editing the values list in place.
+
+    Give a capacity to keep the values in a RingBuffer instead of a list, then
+    stream readings in with append() or extend(): each one only validates and
+    places the new sample unless the value range changes.
+
+    With scale_to_fit on, a series with more points than the plot has pixel
+    columns is drawn as each column's lowest and highest value (see MinMaxBuckets).
+
     Attributes:
         x, y: Position on the display (default 0, 0).
         width, height: Size of the chart (default 100, 100).
@@ -48,9 +569,21 @@ class Chart:
         show_datapoints: Show data points as circles (default False).
         scale_to_fit: Scale data to fit chart width (default False).
     """
+
+    __slots__ = ('_display', '_pens', '_dirty', '_title', 'font', '_text_layout', '_x_label', '_y_label',
+                 'values', '_min_val', '_max_val', '_padded', '_y_scale', '_x_scale',
+                 '_version', '_layout_key', '_plot_height', '_y_base', '_bar_width',
+                 '_xs', '_heights', '_sources', '_buckets', 'x', 'y', 'width', 'height',
+                 'border_width', 'text_height', 'show_datapoints', 'show_lines',
+                 'show_bars', '_show_labels', 'grid', 'grid_spacing', 'bar_gap',
+                 'data_point_radius', 'data_point_width', '_scale_to_fit',
+                 'show_x_axis', 'show_y_axis', '_background_colour', '_border_colour',
+                 '_grid_colour', '_title_colour', '_data_colour', '_axis_label_colour',
+                 '_background_pen', '_border_pen', '_grid_pen', '_title_pen',
+                 '_data_pen', '_data_pen_dim', '_axis_label_pen')
     SHOW_AXES_DEFAULT = False
     def __init__(self, display, title: str = "", x_label: str = None, y_label: str = None, 
-                 values: list = None):
+                 values: list = None, capacity: int = None):
         """Create a new chart.
 
         Args:
@@ -59,6 +592,7 @@ class Chart:
             x_label: X-axis label (optional).
             y_label: Y-axis label (optional).
             values: List of numeric data to plot (default empty list).
+            capacity: Keep at most this many values in a rolling buffer (optional).
 
         Raises:
             ValueError: If display is None or values contain non-numeric data.
@@ -67,15 +601,30 @@ class Chart:
             raise ValueError("Display object is required")
         
         self._display = display
-        self._pen_cache = {}  # Cache for pens to reduce memory usage
-        self.title = title
+        self._pens = pen_registry(display)  # Pens shared with every widget on the display
+        self._dirty = True  # Needs drawing before the next flush
+        self._title = title
+        self.font = "bitmap8"
+        self._text_layout = TextLayout()  # Title measurement, see TextLayout.fit()
         self._x_label = x_label
         self._y_label = y_label
-        self.values = values or []
+        self.values = RingBuffer(capacity) if capacity else []
         self._min_val = None
         self._max_val = None
+        self._padded = False  # True when the range was widened around a flat series
         self._y_scale = 1
         self._x_scale = 1  # New attribute for horizontal scaling
+
+        # Cached plot geometry, see _layout()
+        self._version = 0  # Bumped whenever the values or their scaling change
+        self._layout_key = None
+        self._plot_height = 0
+        self._y_base = 0
+        self._bar_width = 0
+        self._xs = []
+        self._heights = []
+        self._sources = None  # Value index of each drawn point when decimated
+        self._buckets = None  # MinMaxBuckets for series wider than the plot
         
         # Positioning and size
         self.x = 0
@@ -96,27 +645,140 @@ class Chart:
         self.data_point_radius = DEFAULT_SIZES['DATA_POINT_RADIUS']
         self.data_point_width = DEFAULT_SIZES['DATA_POINT_WIDTH']
         
-        # Colors
-        self.background_colour = DEFAULT_COLORS['BACKGROUND'].copy()
-        self.border_colour = DEFAULT_COLORS['BORDER'].copy()
-        self.grid_colour = DEFAULT_COLORS['GRID'].copy()
-        self.title_colour = DEFAULT_COLORS['TITLE'].copy()
-        self.data_colour = DEFAULT_COLORS['DATA'].copy()
+        # Colors, packed as 0xRRGGBB with their pens resolved when set
+        self._background_colour = self._border_colour = self._grid_colour = None
+        self._title_colour = self._data_colour = self._axis_label_colour = None
+        self.background_colour = DEFAULT_COLORS['BACKGROUND']
+        self.border_colour = DEFAULT_COLORS['BORDER']
+        self.grid_colour = DEFAULT_COLORS['GRID']
+        self.title_colour = DEFAULT_COLORS['TITLE']
+        self.data_colour = DEFAULT_COLORS['DATA']
+        self.axis_label_colour = DEFAULT_COLORS['TITLE']
         
         # New scaling option
         self._scale_to_fit = False  # Default to False (manual spacing)
         
         # Validate and scale data if provided
-        if self.values:
-            self._validate_data(self.values)
+        if values:
+            self._validate_data(values)
+            if capacity:
+                self.values.extend(values)
+            else:
+                self.values = list(values)  # A copy, so set_values() can tell what changed
             self._scale_data()
         self.show_x_axis = self.SHOW_AXES_DEFAULT
         self.show_y_axis = self.SHOW_AXES_DEFAULT
-        self.axis_label_colour = DEFAULT_COLORS['TITLE'].copy()
+
+    @property
+    def dirty(self) -> bool:
+        """Whether the chart has changed since it was last drawn."""
+        return self._dirty
+
+    def mark_dirty(self) -> None:
+        """Force the chart to be laid out and redrawn on the next update.
+
+        The scale is recomputed from the values, so edits made to the values list in
+        place are picked up.
+        """
+        self._dirty = True
+        self._buckets = None
+        if self.values:
+            self._scale_data()
+        else:
+            self._version += 1
+
+    @property
+    def title(self) -> str:
+        """The chart title."""
+        return self._title
+
+    @title.setter
+    def title(self, value: str) -> None:
+        if value != self._title:
+            self._title = value
+            self._dirty = True
+
+    @property
+    def background_colour(self) -> int:
+        """Background colour as 0xRRGGBB; also accepts a dict with 'red', 'green', 'blue' keys."""
+        return self._background_colour
+
+    @background_colour.setter
+    def background_colour(self, value) -> None:
+        colour = pack_colour(value)
+        if colour != self._background_colour:
+            self._background_colour = colour
+            self._background_pen = self._get_pen(colour)
+            self._dirty = True
+
+    @property
+    def border_colour(self) -> int:
+        """Border colour as 0xRRGGBB; also accepts a dict with 'red', 'green', 'blue' keys."""
+        return self._border_colour
+
+    @border_colour.setter
+    def border_colour(self, value) -> None:
+        colour = pack_colour(value)
+        if colour != self._border_colour:
+            self._border_colour = colour
+            self._border_pen = self._get_pen(colour)
+            self._dirty = True
+
+    @property
+    def grid_colour(self) -> int:
+        """Grid colour as 0xRRGGBB; also accepts a dict with 'red', 'green', 'blue' keys."""
+        return self._grid_colour
+
+    @grid_colour.setter
+    def grid_colour(self, value) -> None:
+        colour = pack_colour(value)
+        if colour != self._grid_colour:
+            self._grid_colour = colour
+            self._grid_pen = self._get_pen(colour)
+            self._dirty = True
+
+    @property
+    def title_colour(self) -> int:
+        """Title colour as 0xRRGGBB; also accepts a dict with 'red', 'green', 'blue' keys."""
+        return self._title_colour
+
+    @title_colour.setter
+    def title_colour(self, value) -> None:
+        colour = pack_colour(value)
+        if colour != self._title_colour:
+            self._title_colour = colour
+            self._title_pen = self._get_pen(colour)
+            self._dirty = True
+
+    @property
+    def data_colour(self) -> int:
+        """Data colour as 0xRRGGBB; also accepts a dict with 'red', 'green', 'blue' keys."""
+        return self._data_colour
+
+    @data_colour.setter
+    def data_colour(self, value) -> None:
+        colour = pack_colour(value)
+        if colour != self._data_colour:
+            self._data_colour = colour
+            self._data_pen = self._get_pen(colour)
+            self._data_pen_dim = self._get_pen((colour >> 2) & 0x3F3F3F)  # Quarter brightness
+            self._dirty = True
+
+    @property
+    def axis_label_colour(self) -> int:
+        """Axis label colour as 0xRRGGBB; also accepts a dict with 'red', 'green', 'blue' keys."""
+        return self._axis_label_colour
+
+    @axis_label_colour.setter
+    def axis_label_colour(self, value) -> None:
+        colour = pack_colour(value)
+        if colour != self._axis_label_colour:
+            self._axis_label_colour = colour
+            self._axis_label_pen = self._get_pen(colour)
+            self._dirty = True
 
     def _draw_x_axis(self):
-        axis_pen = self._get_pen(self.axis_label_colour)
-        self._display.set_pen(axis_pen)
+        self._display.set_pen(self._axis_label_pen)
         y_pos = self.y + self.height - self.border_width - 10
         # print(f"self.y: {self.y}, ypos: {y_pos}")
         # self._display.line(self.x + self.border_width, y_pos, self.x + self.width - self.border_width, y_pos)
@@ -126,8 +788,7 @@ class Chart:
             self._display.text(str(self.values[-1]), self.x + self.width - self.border_width - 10, y_pos + 2, scale=1)
     
     def _draw_y_axis(self):
-        axis_pen = self._get_pen(self.axis_label_colour)
-        self._display.set_pen(axis_pen)
+        self._display.set_pen(self._axis_label_pen)
         x_pos = self.x + self.border_width + 10
         # print(f"self.x: {self.x}, xpos: {x_pos}")
         # self._display.line(x_pos, self.y + self.border_width, x_pos, self.y + self.height - self.border_width)
@@ -139,14 +800,110 @@ class Chart:
     def set_values(self, new_values: list) -> None:
         """Update the chart data and recalculate scaling.
 
+        The chart keeps its own copy of the values, so a list the caller keeps
+        editing can be passed in again: values equal to the chart's leave it
+        clean, which makes this cheap to call every loop. Passing the chart's own
+        values object back counts as a change (see mark_dirty()).
+
         Args:
             new_values: New list of numeric data to plot.
         """
-        self.values = new_values or []
+        if new_values is self.values:
+            self.mark_dirty()  # Edited in place, nothing to compare against
+            return
+        new_values = new_values or []
+        if isinstance(self.values, RingBuffer):
+            ring = self.values
+            if ring.matches(new_values):
+                return
+            if len(ring) == ring.capacity and ring.matches(new_values, shift=1):
+                self.append(new_values[-1])  # The series moved on by one reading
+                return
+            if new_values:
+                self._validate_data(new_values)
+            ring.clear()
+            ring.extend(new_values)
+        else:
+            if new_values == self.values:
+                return
+            if new_values:
+                self._validate_data(new_values)
+            self.values = list(new_values)
+        self._dirty = True
+        self._buckets = None
         if self.values:
-            self._validate_data(self.values)
             self._scale_data()
 
+    def append(self, value: float) -> None:
+        """Add one reading to a chart created with a capacity.
+
+        The oldest reading is dropped once the buffer is full. Only the new point
+        is laid out unless the value range changes.
+
+        Args:
+            value: New numeric value.
+
+        Raises:
+            ValueError: If value is not numeric.
+            TypeError: If the chart was created without a capacity.
+        """
+        ring = self.values
+        if not isinstance(ring, RingBuffer):
+            raise TypeError("append() needs a chart created with a capacity")
+        self._validate_value(value)
+        full = len(ring) == ring.capacity
+        ring.append(value)
+        self._dirty = True
+        if self._buckets is not None:
+            start = ring.total - len(ring)
+            if full:
+                self._buckets.drop(start - 1, ring, start)
+            self._buckets.add(ring[-1], ring.total - 1)
+            self._layout_key = None  # Columns are rebuilt from the buckets
+        if self._padded or ring.low != self._min_val or ring.high != self._max_val:
+            self._scale_data()
+        elif full and self._layout_key is not None:
+            self._heights.append(int(self.map_value(ring[-1], self._min_val, self._max_val, 0, self._plot_height)))
+
+    def extend(self, values: list) -> None:
+        """Add several readings, oldest first, to a chart created with a capacity.
+
+        Args:
+            values: Numeric values to add.
+
+        Raises:
+            ValueError: If any value is not numeric.
+            TypeError: If the chart was created without a capacity.
+        """
+        for value in values:
+            self.append(value)
+
+    def set_value(self, index: int, value: float) -> None:
+        """Change one data value, recomputing only that point when the scale holds.
+
+        Args:
+            index: Position of the value to change.
+            value: New numeric value.
+
+        Raises:
+            ValueError: If value is not numeric.
+        """
+        self._validate_value(value)
+        old = self.values[index]
+        if value == old:
+            return
+        self.values[index] = value
+        self._dirty = True
+        if self._buckets is not None:
+            start = self.values.total - len(self.values) if isinstance(self.values, RingBuffer) else 0
+            self._buckets.update(start + index % len(self.values), self.values, start)
+            self._layout_key = None  # Columns are rebuilt from the buckets
+        lo, hi = self._min_val, self._max_val
+        if self._padded or not (lo < old < hi and lo <= value <= hi):
+            self._scale_data()  # The range may move, every point changes
+        elif self._layout_key is not None:
+            self._heights[index] = int(self.map_value(self.values[index], lo, hi, 0, self._plot_height))
+
     @property
     def show_labels(self) -> bool:
         """Whether to show data value labels above points or bars."""
@@ -161,6 +918,7 @@ class Chart:
         """
         self._show_labels = bool(value)
         self.data_point_radius = DEFAULT_SIZES['DATA_POINT_RADIUS'] * (4 if value else 1)
+        self._dirty = True
 
     @property
     def scale_to_fit(self) -> bool:
@@ -179,24 +937,34 @@ class Chart:
             value: True to scale width to fit all data, False to use fixed spacing.
         """
         self._scale_to_fit = bool(value)
+        self._dirty = True
         if self.values:
             self._scale_data()  # Recalculate scaling if data exists
 
-    def _get_pen(self, color: dict) -> int:
-        """Get a pen (color) from the cache or create a new one.
+    def _get_pen(self, colour: int) -> int:
+        """Get a pen (color) from the display's shared pen registry.
 
         Args:
-            color: Dict with 'red', 'green', 'blue' keys (0-255).
+            colour: Colour as 0xRRGGBB.
 
         Returns:
             Pen ID for the display.
         """
-        color_key = (color['red'], color['green'], color['blue'])
-        if color_key not in self._pen_cache:
-            self._pen_cache[color_key] = self._display.create_pen(
-                color['red'], color['green'], color['blue']
-            )
-        return self._pen_cache[color_key]
+        return self._pens.get(colour)
+
+    def _resolve_pens(self) -> None:
+        """Look every pen up in the registry.
+
+        Called at the start of each draw, which marks the pens as recently used and
+        picks up any the registry recycled since the last draw.
+        """
+        self._background_pen = self._get_pen(self._background_colour)
+        self._border_pen = self._get_pen(self._border_colour)
+        self._grid_pen = self._get_pen(self._grid_colour)
+        self._title_pen = self._get_pen(self._title_colour)
+        self._data_pen = self._get_pen(self._data_colour)
+        self._data_pen_dim = self._get_pen((self._data_colour >> 2) & 0x3F3F3F)
+        self._axis_label_pen = self._get_pen(self._axis_label_colour)
 
     def _validate_data(self, values: list) -> None:
         """Check that data is valid.
@@ -214,11 +982,31 @@ class Chart:
         if any(v < -1000 or v > 1000 for v in values):
             log_debug("Data values outside typical range (-1000 to 1000)")
 
+    def _validate_value(self, value: float) -> None:
+        """Check that a single new value is valid.
+
+        Args:
+            value: Value to validate.
+
+        Raises:
+            ValueError: If value is not numeric.
+        """
+        if not isinstance(value, (int, float)):
+            raise ValueError("All data values must be numeric")
+        if value < -1000 or value > 1000:
+            log_debug("Data values outside typical range (-1000 to 1000)")
+
     def _scale_data(self) -> None:
         """Adjust data scale to fit both chart height and width if scale_to_fit is True."""
-        self._min_val = min(self.values) if self.values else 0
-        self._max_val = max(self.values) if self.values else 1
-        if self._max_val == self._min_val:
+        self._version += 1
+        if isinstance(self.values, RingBuffer):
+            self._min_val = self.values.low if self.values else 0
+            self._max_val = self.values.high if self.values else 1
+        else:
+            self._min_val = min(self.values) if self.values else 0
+            self._max_val = max(self.values) if self.values else 1
+        self._padded = self._max_val == self._min_val
+        if self._padded:
             self._max_val += 1  # Avoid division by zero
             self._min_val -= 1
 
@@ -239,6 +1027,110 @@ class Chart:
         else:
             self._x_scale = self.data_point_width + self.bar_gap  # Fixed spacing
 
+    def _layout(self) -> None:
+        """Compute the screen coordinates of every data point, if anything moved.
+
+        The result is cached against the data version, position, size and the
+        options that affect spacing, so redraws of an unchanged chart only replay
+        the stored integer coordinates. Series with more points than pixel columns
+        are reduced to each column's low and high first.
+        """
+        key = self._layout_key
+        if key is not None and key[0] is self.values and key[1] == len(self.values):
+            for idx in range(len(_LAYOUT_FIELDS)):
+                if key[idx + 2] != getattr(self, _LAYOUT_FIELDS[idx]):
+                    break
+            else:
+                return
+        key = [self.values, len(self.values)]
+        for name in _LAYOUT_FIELDS:
+            key.append(getattr(self, name))
+
+        plot_area_height = (self.height - self.text_height) - (self.border_width * 2)
+        plot_area_width = self.width - (self.border_width * 2)
+        x_pos = self.x + self.border_width + 2
+        y_base = self.y + self.height - self.border_width - 2
+        num_values = len(self.values)
+
+        map_value = self.map_value
+        lo, hi = self._min_val, self._max_val
+        if self._scale_to_fit and num_values > plot_area_width > 1:
+            self._layout_columns(x_pos, plot_area_width, plot_area_height)
+            self._plot_height = plot_area_height
+            self._y_base = y_base
+            self._bar_width = 1
+            self._layout_key = key
+            return
+        self._buckets = None
+        self._sources = None
+
+        # Calculate bar/point width based on scaling
+        if self._scale_to_fit:
+            if num_values > 1:
+                point_spacing = plot_area_width // (num_values - 1)  # Evenly space points
+            else:
+                point_spacing = plot_area_width  # Single point takes full width
+            bar_width = point_spacing - self.bar_gap if self.show_bars else self.data_point_width
+            if bar_width < 1:
+                bar_width = 1  # Minimum width
+        else:
+            bar_width = self.data_point_width
+            point_spacing = self._x_scale  # Fixed spacing
+
+        if isinstance(self.values, RingBuffer):
+            # Kept in step with the values, so append() can roll it along
+            heights = RingBuffer(self.values.capacity, 'h')
+            for value in self.values:
+                heights.append(int(map_value(value, lo, hi, 0, plot_area_height)))
+        else:
+            heights = [int(map_value(value, lo, hi, 0, plot_area_height)) for value in self.values]
+        self._xs = [x_pos + point_spacing * idx for idx in range(num_values)]
+        self._heights = heights
+        self._plot_height = plot_area_height
+        self._y_base = y_base
+        self._bar_width = bar_width
+        self._layout_key = key
+
+    def _layout_columns(self, x_pos: int, plot_area_width: int, plot_area_height: int) -> None:
+        """Lay out a long series as the low and high of each pixel column.
+
+        Args:
+            x_pos: Screen x of the first column.
+            plot_area_width: Number of pixel columns available.
+            plot_area_height: Height of the plot area in pixels.
+        """
+        values = self.values
+        num_values = len(values)
+        size = -(-num_values // (plot_area_width - 1))  # Ceiling division
+        start = values.total - num_values if isinstance(values, RingBuffer) else 0
+        buckets = self._buckets
+        if buckets is None or buckets.size != size:
+            buckets = self._buckets = MinMaxBuckets(size)
+            buckets.build(values, start)
+
+        map_value = self.map_value
+        lo, hi = self._min_val, self._max_val
+        count = len(buckets.lo)
+        last = count - 1 or 1
+        xs, heights, sources = [], [], []
+        for bucket in range(count):
+            x = x_pos + bucket * plot_area_width // last
+            lo_at, hi_at = buckets.lo_at[bucket], buckets.hi_at[bucket]
+            if lo_at <= hi_at:  # Keep the pair in time order so lines follow the data
+                first, first_at, second, second_at = buckets.lo[bucket], lo_at, buckets.hi[bucket], hi_at
+            else:
+                first, first_at, second, second_at = buckets.hi[bucket], hi_at, buckets.lo[bucket], lo_at
+            xs.append(x)
+            heights.append(int(map_value(first, lo, hi, 0, plot_area_height)))
+            sources.append(first_at - start)
+            if second_at != first_at:
+                xs.append(x)
+                heights.append(int(map_value(second, lo, hi, 0, plot_area_height)))
+                sources.append(second_at - start)
+        self._xs = xs
+        self._heights = heights
+        self._sources = sources
+
     @staticmethod
     def map_value(x: float, in_min: float, in_max: float, out_min: float, out_max: float) -> float:
         """Map a value from one range to another.
@@ -259,8 +1151,7 @@ class Chart:
 
     def draw_border(self) -> None:
         """Draw a border around the chart."""
-        border_pen = self._get_pen(self.border_colour)
-        self._display.set_pen(border_pen)
+        self._display.set_pen(self._border_pen)
         x, y = self.x, self.y
         w, h = self.width, self.height
         x1, y1 = x + w, y + h
@@ -276,8 +1167,7 @@ class Chart:
 
     def draw_grid(self) -> None:
         """Draw a grid inside the chart."""
-        grid_pen = self._get_pen(self.grid_colour)
-        self._display.set_pen(grid_pen)
+        self._display.set_pen(self._grid_pen)
         x, y = self.x, self.y
         w, h = self.width, self.height
 
@@ -290,18 +1180,25 @@ class Chart:
             self._display.line(x, y + self.grid_spacing * j, x + w, y + self.grid_spacing * j)
 
     def update(self) -> None:
-        """Draw the chart on the display.
+        """Draw the chart and flush it to the display.
 
-        Call this to refresh the chart after changing data or settings.
+        Call this to refresh the chart after changing data or settings. Inside
+        begin_frame()/end_frame() the flush is left to end_frame().
         """
+        self.draw()
+        add_damage(self._display, self.x, self.y, self.width, self.height)
+
+    def draw(self) -> None:
+        """Draw the chart into the framebuffer without flushing the display."""
+        self._dirty = False
+        self._resolve_pens()
         try:
             if not self.values:
                 log_debug("No data to display")
                 return
 
             # Clear the chart area
-            background_pen = self._get_pen(self.background_colour)
-            self._display.set_pen(background_pen)
+            self._display.set_pen(self._background_pen)
             self._display.set_clip(self.x, self.y, self.x + self.width, self.y + self.height)
             self._display.rectangle(self.x, self.y, self.width, self.height)
             self._display.remove_clip()
@@ -311,75 +1208,62 @@ class Chart:
                 self.draw_grid()
 
             # Draw title
-            title_pen = self._get_pen(self.title_colour)
-            self._display.set_pen(title_pen)
-            title_x_pos = self.x + (self.width - self._display.measure_text(self.title, 1)) // 2 - self.border_width * 2
+            self._display.set_pen(self._title_pen)
+            self._display.set_font(self.font)
+            layout = self._text_layout
+            layout.fit(self._display, self.title, self.font, self.width, self.height)
+            title_x_pos = self.x + (self.width - layout.text_width) // 2 - self.border_width * 2
             
             # self._display.text(self.title, self.x + self.border_width + 1, self.y + self.border_width + 1, self.width)
             self._display.text(self.title, title_x_pos, 
                              self.y + self.border_width + 1, self.width)
 
             # Prepare data drawing
-            data_pen = self._get_pen(self.data_colour)
-            data_pen_dim = self._get_pen({
-                'red': self.data_colour['red'] // 4,
-                'green': self.data_colour['green'] // 4,
-                'blue': self.data_colour['blue'] // 4
-            })
-            plot_area_height = (self.height - self.text_height) - (self.border_width * 2)
-            plot_area_width = self.width - (self.border_width * 2)
-            x_pos = self.x + self.border_width + 2
-            y_base = self.y + self.height - self.border_width - 2
-            prev_x, prev_y = x_pos, y_base
+            data_pen = self._data_pen
+            data_pen_dim = self._data_pen_dim
 
             self._display.set_clip(self.x + self.border_width, self.y + self.text_height,
                                  self.x + self.width, self.y + self.height - self.border_width)
 
-            num_values = len(self.values)
-            if num_values == 0:
-                return
-
-            # Calculate bar/point width based on scaling
-            if self._scale_to_fit:
-                if num_values > 1:
-                    point_spacing = plot_area_width // (num_values - 1)  # Evenly space points
-                else:
-                    point_spacing = plot_area_width  # Single point takes full width
-                bar_width = point_spacing - self.bar_gap if self.show_bars else self.data_point_width
-#                 print(f'point spacing {point_spacing} bar width {bar_width}')
-                if bar_width < 1:
-                    bar_width = 1  # Minimum width
-            else:
-                bar_width = self.data_point_width
-                point_spacing = self._x_scale  # Fixed spacing
-
-            for idx, value in enumerate(self.values):
-                scaled_height = int(self.map_value(value, self._min_val, self._max_val, 0, plot_area_height))
-                y_pos = y_base - scaled_height
-                log_debug(f"Value: {value}, Scaled height: {scaled_height}, X: {x_pos}, Y: {y_pos}")
+            self._layout()
+            display = self._display
+            xs = self._xs
+            y_base = self._y_base
+            bar_width = self._bar_width
+            half_width = bar_width // 2
+            prev_x, prev_y = xs[0], y_base
+
+            sources = self._sources
+            heights = self._heights
+            for idx in range(len(heights)):
+                height = heights[idx]
+                x_pos = xs[idx]
+                y_pos = y_base - height
+                if DEBUG:
+                    log_debug(f"Scaled height: {height}, X: {x_pos}, Y: {y_pos}")
 
                 if self.show_bars:
-                    self._display.set_pen(data_pen)
-                    self._display.rectangle(x_pos, y_pos, bar_width, scaled_height)
+                    display.set_pen(data_pen)
+                    display.rectangle(x_pos, y_pos, bar_width, height)
 
                 if self.show_datapoints:
-                    center_x = x_pos + bar_width // 2
-                    self._display.set_pen(data_pen_dim)
-                    self._display.circle(center_x, y_pos, self.data_point_radius * 2)
-                    self._display.set_pen(data_pen)
-                    self._display.circle(center_x, y_pos, self.data_point_radius)
+                    center_x = x_pos + half_width
+                    display.set_pen(data_pen_dim)
+                    display.circle(center_x, y_pos, self.data_point_radius * 2)
+                    display.set_pen(data_pen)
+                    display.circle(center_x, y_pos, self.data_point_radius)
 
                 if self.show_lines and idx > 0:
-                    self._display.set_pen(data_pen)
-                    self._display.line(prev_x + bar_width // 2, prev_y, x_pos + bar_width // 2, y_pos)
+                    display.set_pen(data_pen)
+                    display.line(prev_x + half_width, prev_y, x_pos + half_width, y_pos)
 
                 if self._show_labels:
-                    self._display.set_pen(data_pen)
+                    display.set_pen(data_pen)
                     label_x = x_pos if self._scale_to_fit else x_pos - (self.data_point_width // 2)
-                    self._display.text(str(value), label_x, y_pos - 10, self.width - x_pos)
+                    value = self.values[idx if sources is None else sources[idx]]
+                    display.text(str(value), label_x, y_pos - 10, self.width - x_pos)
 
                 prev_x, prev_y = x_pos, y_pos
-                x_pos += point_spacing
 
             if self.show_x_axis:
                 self._draw_x_axis()
@@ -388,7 +1272,6 @@ class Chart:
 
             self._display.remove_clip()
             self.draw_border()
-            self._display.update()
 
         except Exception as e:
             log_debug(f"Chart update error: {e}")
@@ -403,6 +1286,8 @@ class Card(Chart):
         width, height: Size of the card.
     """
 
+    __slots__ = ('_text_scale',)
+
     def __init__(self, display, x: int = 0, y: int = 0, width: int = 100, height: int = 100, 
                  title: str = ""):
         """Create a new card.
@@ -426,73 +1311,142 @@ class Card(Chart):
     def _scale_text(self) -> int:
         """Find the best text scale to fit the title.
 
+        The measurement is cached, so this only calls measure_text when the title,
+        font or card size changed.
+
         Returns:
             Scale factor (1 or higher).
         """
-        self._display.set_font("bitmap8")
-        max_width = self.width - (self.border_width * 2)
-        max_height = self.height - (self.border_width * 2)
-        scale = 2  # Start with a reasonable scale
-
-        while scale > 0:
-            text_width = self._display.measure_text(self.title, scale)
-            text_height = 8 * scale
-            if text_width <= max_width and text_height <= max_height:
-                print(f"Text width: {text_width}, height: {text_height}, scale: {scale}")
-                return scale
-            scale -= 1
-        return 1
-
-    def update(self) -> None:
-        """Draw the card on the display with centered, potentially wrapped text."""
+        self._display.set_font(self.font)
+        self._text_layout.fit(self._display, self.title, self.font,
+                              self.width - (self.border_width * 2),
+                              self.height - (self.border_width * 2), max_scale=2, wrap=True)
+        return self._text_layout.scale
+
+    def draw(self) -> None:
+        """Draw the card into the framebuffer with centered, potentially wrapped text."""
+        self._dirty = False
+        self._resolve_pens()
         try:
-            background_pen = self._get_pen(self.background_colour)
-            title_pen = self._get_pen(self.title_colour)
-            self._display.set_pen(background_pen)
+            self._display.set_pen(self._background_pen)
             self._display.rectangle(self.x, self.y, self.width, self.height)
 
             if self.grid:
                 self.draw_grid()
 
             self.draw_border()
-            self._text_scale = self._scale_text()
-            self._display.set_font("bitmap8")
+            self._text_scale = scale = self._scale_text()
+            layout = self._text_layout
 
             # Calculate available width for text (excluding borders)
             max_text_width = self.width - (self.border_width * 2)
-            text_length = self._display.measure_text(self.title, self._text_scale)
-            
-            # Center the text horizontally
-            title_x = self.x + (self.width - text_length) // 2
-            # Center the text vertically (assuming 8 pixels per line height)
-            title_y = self.y + (self.height - (self._text_scale * 8)) // 2
-
-            self._display.set_pen(title_pen)
-            # Draw text with wrapping if it exceeds max_text_width
-            if text_length > max_text_width:
-                # Use max_text_width as the wordwrap parameter
-                self._display.text(self.title, self.x + self.border_width, title_y, max_text_width, self._text_scale)
-                print(f"Text wrapped: width={text_length}, max_width={max_text_width}, scale={self._text_scale}")
-            else:
-                # Draw centered text without wrapping
-                self._display.text(self.title, title_x, title_y, max_text_width, self._text_scale)
-                print(f"Text centered: width={text_length}, x={title_x}, y={title_y}, scale={self._text_scale}")
+            line_height = scale * 8  # 8 pixels per line at scale 1
 
-            self._display.update()
+            self._display.set_pen(self._title_pen)
+            lines = layout.lines
+            if lines is None:
+                # Draw centered text without wrapping
+                title_x = self.x + (self.width - layout.text_width) // 2
+                title_y = self.y + (self.height - line_height) // 2
+                self._display.text(self.title, title_x, title_y, max_text_width, scale)
+            else:
+                # Draw the wrapped lines as a vertically centered block
+                title_y = self.y + (self.height - line_height * len(lines)) // 2
+                for idx in range(len(lines)):
+                    self._display.text(lines[idx], self.x + self.border_width, title_y, max_text_width, scale)
+                    title_y += line_height
 
         except Exception as e:
             log_debug(f"Card update error: {e}")
 
+# JPEG files read into RAM, shared by every ImageTile: filename -> bytes
+_jpeg_files = {}
+_jpeg_order = []  # Filenames, least recently used first
+_jpeg_bytes = 0
+
+def read_jpeg(filename: str) -> bytes:
+    """Return the contents of a JPEG file, from RAM if it was read before.
+
+    Files are kept until IMAGE_CACHE_BYTES is exceeded, then the least
+    recently used are dropped. A file larger than the whole budget is read
+    but not kept.
+
+    Args:
+        filename: Path to the JPEG file.
+
+    Returns:
+        The file contents.
+    """
+    global _jpeg_bytes
+    data = _jpeg_files.get(filename)
+    if data is not None:
+        if _jpeg_order[-1] != filename:
+            _jpeg_order.remove(filename)
+            _jpeg_order.append(filename)
+        return data
+    with open(filename, "rb") as f:
+        data = f.read()
+    if len(data) > IMAGE_CACHE_BYTES:
+        return data
+    while _jpeg_order and _jpeg_bytes + len(data) > IMAGE_CACHE_BYTES:
+        _jpeg_bytes -= len(_jpeg_files.pop(_jpeg_order.pop(0)))
+    _jpeg_files[filename] = data
+    _jpeg_order.append(filename)
+    _jpeg_bytes += len(data)
+    return data
+
+def jpeg_scale(image_width: int, image_height: int, width: int, height: int) -> int:
+    """Return the largest JPEG decode divisor that fits an image in an area.
+
+    Args:
+        image_width, image_height: Size of the image at full scale.
+        width, height: Size of the area to fit.
+
+    Returns:
+        1, 2, 4 or 8. Images still too big at 1/8 scale get 8 and are clipped.
+    """
+    divisor = 1
+    while divisor < 8 and (image_width // divisor > width or image_height // divisor > height):
+        divisor *= 2
+    return divisor
+
+def framebuffer(display):
+    """Return the display's framebuffer as a memoryview, or None if it has none.
+
+    PicoGraphics exposes its framebuffer through the buffer protocol.
+
+    Args:
+        display: The display object (e.g., PicoGraphics).
+    """
+    try:
+        return memoryview(display)
+    except TypeError:
+        return None
+
 class ImageTile:
     """A tile for showing an image with a border.
 
-    Uses JPEG decoding via the jpegdec library.
+    Uses JPEG decoding via the jpegdec library. The file is read into RAM and
+    the decoder, decode scale and position are kept between draws, so they
+    are only worked out again when the filename or the tile geometry changes.
+    The image is decoded at the largest of full, half, quarter or eighth scale
+    that fits inside the border, and centred in the tile.
+
+    After decoding, the image's pixels are copied out of the framebuffer, and
+    redraws copy them back instead of decoding again. This needs a framebuffer
+    with whole bytes per pixel (such as RGB565 on Presto) and an image of at
+    most IMAGE_SNAPSHOT_BYTES; otherwise every draw decodes.
 
     Attributes:
         x, y: Position on the display.
         width, height: Size of the tile.
     """
 
+    __slots__ = ('_display', '_pens', '_dirty', '_filename', 'x', 'y', 'width', 'height',
+                 '_border_colour', 'border_width', '_jpeg', '_jpeg_data', '_decode_key',
+                 '_decode_x', '_decode_y', '_decode_width', '_decode_height', '_decode_scale',
+                 '_pixels', '_pixel_rect')
+
     def __init__(self, display, filename: str = None, x: int = 0, y: int = 0, 
                  width: int = 100, height: int = 100):
         """Create a new image tile.
@@ -511,20 +1465,64 @@ class ImageTile:
         if not display:
             raise ValueError("Display object is required")
         self._display = display
-        self.filename = filename
+        self._pens = pen_registry(display)
+        self._dirty = True
+        self._filename = filename
         self.x = x
         self.y = y
         self.width = width
         self.height = height
-        self.border_colour = DEFAULT_COLORS['BORDER'].copy()
+        self._border_colour = None
+        self.border_colour = DEFAULT_COLORS['BORDER']
         self.border_width = DEFAULT_SIZES['BORDER_WIDTH']
+        self._jpeg = None
+        self._jpeg_data = None
+        # (filename, x, y, width, height, border_width) the decode settings were worked out for
+        self._decode_key = [None, 0, 0, 0, 0, 0]
+        self._decode_x = 0
+        self._decode_y = 0
+        self._decode_width = 0
+        self._decode_height = 0
+        self._decode_scale = 0
+        self._pixels = None  # Copy of the decoded image, a memoryview of a bytearray
+        # (framebuffer offset, bytes per row, framebuffer stride, rows) of the copy
+        self._pixel_rect = [0, 0, 0, 0]
+
+    @property
+    def dirty(self) -> bool:
+        """Whether the tile has changed since it was last drawn."""
+        return self._dirty
+
+    def mark_dirty(self) -> None:
+        """Force the tile to be redrawn on the next Container update."""
+        self._dirty = True
+
+    @property
+    def filename(self) -> str:
+        """Path to the JPEG file shown in the tile."""
+        return self._filename
+
+    @filename.setter
+    def filename(self, value: str) -> None:
+        if value != self._filename:
+            self._filename = value
+            self._dirty = True
+
+    @property
+    def border_colour(self) -> int:
+        """Border colour as 0xRRGGBB; also accepts a dict with 'red', 'green', 'blue' keys."""
+        return self._border_colour
+
+    @border_colour.setter
+    def border_colour(self, value) -> None:
+        colour = pack_colour(value)
+        if colour != self._border_colour:
+            self._border_colour = colour
+            self._dirty = True
 
     def draw_border(self) -> None:
         """Draw a border around the image."""
-        border_pen = self._display.create_pen(
-            self.border_colour['red'], self.border_colour['green'], self.border_colour['blue']
-        )
-        self._display.set_pen(border_pen)
+        self._display.set_pen(self._pens.get(self._border_colour))
         x, y = self.x, self.y
         w, h = self.width, self.height
         x1, y1 = x + w, y + h
@@ -538,38 +1536,139 @@ class ImageTile:
 
         self._display.remove_clip()
 
+    def _prepare(self) -> None:
+        """Open the image and work out its decode scale and position if the
+        filename or geometry changed since the last draw."""
+        key = self._decode_key
+        if (key[0] == self._filename and key[1] == self.x and key[2] == self.y
+                and key[3] == self.width and key[4] == self.height and key[5] == self.border_width):
+            return
+        self._pixels = None
+        if self._jpeg is None:
+            self._jpeg = jpegdec.JPEG(self._display)
+        if key[0] != self._filename:
+            self._jpeg_data = read_jpeg(self._filename)
+            self._jpeg.open_RAM(self._jpeg_data)
+        image_width = self._jpeg.get_width()
+        image_height = self._jpeg.get_height()
+        inner_width = self.width - 2 * self.border_width
+        inner_height = self.height - 2 * self.border_width
+        divisor = jpeg_scale(image_width, image_height, inner_width, inner_height)
+        if divisor == 1:
+            self._decode_scale = jpegdec.JPEG_SCALE_FULL
+        elif divisor == 2:
+            self._decode_scale = jpegdec.JPEG_SCALE_HALF
+        elif divisor == 4:
+            self._decode_scale = jpegdec.JPEG_SCALE_QUARTER
+        else:
+            self._decode_scale = jpegdec.JPEG_SCALE_EIGHTH
+        self._decode_width = image_width // divisor
+        self._decode_height = image_height // divisor
+        self._decode_x = self.x + max(0, (self.width - self._decode_width) // 2)
+        self._decode_y = self.y + max(0, (self.height - self._decode_height) // 2)
+        key[0] = self._filename
+        key[1] = self.x
+        key[2] = self.y
+        key[3] = self.width
+        key[4] = self.height
+        key[5] = self.border_width
+
     def update(self) -> None:
-        """Draw the image tile on the display."""
+        """Draw the image tile and flush it to the display.
+
+        Inside begin_frame()/end_frame() the flush is left to end_frame().
+        """
+        self.draw()
+        add_damage(self._display, self.x, self.y, self.width, self.height)
+
+    def draw(self) -> None:
+        """Draw the image tile into the framebuffer without flushing the display."""
+        self._dirty = False
         try:
             if not self.filename:
                 log_debug("No image file specified")
                 return
-            j = jpegdec.JPEG(self._display)
-            j.open_file(self.filename)
-            self._display.set_clip(self.x, self.y, self.x + self.width, self.y + self.height)
-            j.decode(self.x, self.y, jpegdec.JPEG_SCALE_HALF)
-            self._display.remove_clip()
+            if jpegdec is None:
+                log_debug("jpegdec is not available")
+                return
+            self._prepare()
+            if self._pixels is not None:
+                self._restore()
+            else:
+                self._display.set_clip(self.x, self.y, self.x + self.width, self.y + self.height)
+                self._jpeg.decode(self._decode_x, self._decode_y, self._decode_scale)
+                self._display.remove_clip()
+                self._snapshot()
             self.draw_border()
-            self._display.update()
         except Exception as e:
+            self._decode_key[0] = None  # Open the file again next time
+            self._pixels = None
             log_debug(f"ImageTile update error: {e}")
 
+    def _snapshot(self) -> None:
+        """Copy the just-decoded image out of the framebuffer, if it can be."""
+        buffer = framebuffer(self._display)
+        if buffer is None:
+            return
+        screen_width, screen_height = self._display.get_bounds()
+        depth = len(buffer) // (screen_width * screen_height)  # Bytes per pixel
+        if depth == 0 or len(buffer) != depth * screen_width * screen_height:
+            return  # Pixels packed into bits, not byte addressable
+        x0 = max(self._decode_x, self.x, 0)
+        y0 = max(self._decode_y, self.y, 0)
+        x1 = min(self._decode_x + self._decode_width, self.x + self.width, screen_width)
+        y1 = min(self._decode_y + self._decode_height, self.y + self.height, screen_height)
+        if x1 <= x0 or y1 <= y0 or (x1 - x0) * (y1 - y0) * depth > IMAGE_SNAPSHOT_BYTES:
+            return
+        row = (x1 - x0) * depth
+        stride = screen_width * depth
+        offset = (y0 * screen_width + x0) * depth
+        rows = y1 - y0
+        pixels = memoryview(bytearray(row * rows))
+        source = offset
+        for i in range(rows):
+            pixels[i * row:(i + 1) * row] = buffer[source:source + row]
+            source += stride
+        self._pixels = pixels
+        rect = self._pixel_rect
+        rect[0] = offset
+        rect[1] = row
+        rect[2] = stride
+        rect[3] = rows
+
+    def _restore(self) -> None:
+        """Copy the decoded image back into the framebuffer."""
+        buffer = framebuffer(self._display)
+        pixels = self._pixels
+        offset, row, stride, rows = self._pixel_rect
+        for i in range(rows):
+            buffer[offset:offset + row] = pixels[i * row:(i + 1) * row]
+            offset += stride
+
 class Container:
     """A container to hold and arrange multiple charts or cards.
 
-    Displays items in a grid layout based on the number of columns set.
+    Displays items in a grid layout based on the number of columns set. Only items
+    that changed since the last update are redrawn, and each update presents the
+    frame once, limited to the changed area where the presenter supports it.
 
     Attributes:
         cols: Number of columns in the grid (default 1).
     """
 
-    def __init__(self, display, width: int = None, height: int = None):
+    __slots__ = ('_display', '_presenter', 'charts', 'cols', 'width', 'height',
+                 '_background_colour', '_title_colour', '_data_colour', '_grid_colour',
+                 '_border_colour', '_border_width')
+
+    def __init__(self, display, width: int = None, height: int = None, presenter=None):
         """Create a new container.
 
         Args:
             display: The display object (e.g., PicoGraphics).
             width: Container width (defaults to display width).
             height: Container height (defaults to display height).
+            presenter: Object that pushes the framebuffer to the screen, e.g. a
+                Presto (defaults to the display).
 
         Raises:
             ValueError: If display is None.
@@ -577,15 +1676,16 @@ class Container:
         if not display:
             raise ValueError("Display object is required")
         self._display = display
+        self._presenter = presenter
         self.charts = []
         self.cols = 1
         self.width = width or display.get_bounds()[0]
         self.height = height or display.get_bounds()[1]
-        self._background_colour = DEFAULT_COLORS['BACKGROUND'].copy()
-        self._title_colour = DEFAULT_COLORS['TITLE'].copy()
-        self._data_colour = DEFAULT_COLORS['DATA'].copy()
-        self._grid_colour = DEFAULT_COLORS['GRID'].copy()
-        self._border_colour = DEFAULT_COLORS['BORDER'].copy()
+        self._background_colour = pack_colour(DEFAULT_COLORS['BACKGROUND'])
+        self._title_colour = pack_colour(DEFAULT_COLORS['TITLE'])
+        self._data_colour = pack_colour(DEFAULT_COLORS['DATA'])
+        self._grid_colour = pack_colour(DEFAULT_COLORS['GRID'])
+        self._border_colour = pack_colour(DEFAULT_COLORS['BORDER'])
         self._border_width = DEFAULT_SIZES['BORDER_WIDTH']
 
     def add_chart(self, item) -> None:
@@ -596,118 +1696,143 @@ class Container:
         """
         if item not in self.charts:
             self.charts.append(item)
-            item.background_colour = self._background_colour
-            item.title_colour = self._title_colour
-            item.data_colour = self._data_colour
-            item.grid_colour = self._grid_colour
+            if isinstance(item, Chart):
+                item.background_colour = self._background_colour
+                item.title_colour = self._title_colour
+                item.data_colour = self._data_colour
+                item.grid_colour = self._grid_colour
             item.border_colour = self._border_colour
             item.border_width = self._border_width
+            item.mark_dirty()
 
-    def update(self) -> None:
-        """Draw all items in the container.
+    def update(self) -> bool:
+        """Redraw the items that changed and present them in one frame.
+
+        Arranges items in a grid based on cols and total items. Items that moved or
+        were resized are redrawn too.
 
-        Arranges items in a grid based on cols and total items.
+        Returns:
+            True if anything was drawn, False if the display was left untouched.
         """
+        if not self.charts:
+            log_debug("No charts in container")
+            return False
+
+        drawn = False
+        own_frame = not frame_open(self._display)  # Else the caller's frame presents
+        if own_frame:
+            begin_frame(self._display)
         try:
-            if not self.charts:
-                log_debug("No charts in container")
-                return
-
             rows = (len(self.charts) + self.cols - 1) // self.cols  # Ceiling division
             item_width = self.width // self.cols
             item_height = self.height // rows
 
-            for idx, item in enumerate(self.charts):
+            for idx in range(len(self.charts)):
+                item = self.charts[idx]
                 col = idx % self.cols
                 row = idx // self.cols
-                item.x = col * item_width
-                item.y = row * item_height
-                item.width = item_width
-                item.height = item_height
-                item.update()
+                x = col * item_width
+                y = row * item_height
+                if item.x != x or item.y != y or item.width != item_width or item.height != item_height:
+                    item.x = x
+                    item.y = y
+                    item.width = item_width
+                    item.height = item_height
+                    item.mark_dirty()
+                if item.dirty:
+                    item.update()
+                    drawn = True
 
         except Exception as e:
             log_debug(f"Container update error: {e}")
+        finally:
+            if own_frame:
+                end_frame(self._display, self._presenter)
+        return drawn
 
     @property
-    def background_colour(self) -> dict:
-        """Get the background color for all items."""
+    def background_colour(self) -> int:
+        """Get the background color for all items, as 0xRRGGBB."""
         return self._background_colour
 
     @background_colour.setter
-    def background_colour(self, value: dict) -> None:
+    def background_colour(self, value) -> None:
         """Set the background color for all items.
 
         Args:
-            value: Dict with 'red', 'green', 'blue' keys (0-255).
+            value: Colour as 0xRRGGBB, or a dict with 'red', 'green', 'blue' keys (0-255).
         """
-        self._background_colour = value
+        self._background_colour = pack_colour(value)
         for item in self.charts:
-            item.background_colour = value
+            if isinstance(item, Chart):
+                item.background_colour = self._background_colour
 
     @property
-    def grid_colour(self) -> dict:
-        """Get the grid color for all items."""
+    def grid_colour(self) -> int:
+        """Get the grid color for all items, as 0xRRGGBB."""
         return self._grid_colour
 
     @grid_colour.setter
-    def grid_colour(self, value: dict) -> None:
+    def grid_colour(self, value) -> None:
         """Set the grid color for all items.
 
         Args:
-            value: Dict with 'red', 'green', 'blue' keys (0-255).
+            value: Colour as 0xRRGGBB, or a dict with 'red', 'green', 'blue' keys (0-255).
         """
-        self._grid_colour = value
+        self._grid_colour = pack_colour(value)
         for item in self.charts:
-            item.grid_colour = value
+            if isinstance(item, Chart):
+                item.grid_colour = self._grid_colour
 
     @property
-    def data_colour(self) -> dict:
-        """Get the data color for all items."""
+    def data_colour(self) -> int:
+        """Get the data color for all items, as 0xRRGGBB."""
         return self._data_colour
 
     @data_colour.setter
-    def data_colour(self, value: dict) -> None:
+    def data_colour(self, value) -> None:
         """Set the data color for all items.
 
         Args:
-            value: Dict with 'red', 'green', 'blue' keys (0-255).
+            value: Colour as 0xRRGGBB, or a dict with 'red', 'green', 'blue' keys (0-255).
         """
-        self._data_colour = value
+        self._data_colour = pack_colour(value)
         for item in self.charts:
-            item.data_colour = value
+            if isinstance(item, Chart):
+                item.data_colour = self._data_colour
 
     @property
-    def title_colour(self) -> dict:
-        """Get the title color for all items."""
+    def title_colour(self) -> int:
+        """Get the title color for all items, as 0xRRGGBB."""
         return self._title_colour
 
     @title_colour.setter
-    def title_colour(self, value: dict) -> None:
+    def title_colour(self, value) -> None:
         """Set the title color for all items.
 
         Args:
-            value: Dict with 'red', 'green', 'blue' keys (0-255).
+            value: Colour as 0xRRGGBB, or a dict with 'red', 'green', 'blue' keys (0-255).
         """
-        self._title_colour = value
+        self._title_colour = pack_colour(value)
         for item in self.charts:
-            item.title_colour = value
+            if isinstance(item, Chart):
+                item.title_colour = self._title_colour
 
     @property
-    def border_colour(self) -> dict:
-        """Get the border color for all items."""
+    def border_colour(self) -> int:
+        """Get the border color for all items, as 0xRRGGBB."""
         return self._border_colour
 
     @border_colour.setter
-    def border_colour(self, value: dict) -> None:
+    def border_colour(self, value) -> None:
         """Set the border color for all items.
 
         Args:
-            value: Dict with 'red', 'green', 'blue' keys (0-255).
+            value: Colour as 0xRRGGBB, or a dict with 'red', 'green', 'blue' keys (0-255).
         """
-        self._border_colour = value
+        self._border_colour = pack_colour(value)
         for item in self.charts:
-            item.border_colour = value
+            item.border_colour = self._border_colour
 
     @property
     def border_width(self) -> int:
@@ -723,4 +1848,5 @@ class Container:
         """
         self._border_width = value
         for item in self.charts:
-            item.border_width = value
\ No newline at end of file
+            item.border_width = value
+            item.mark_dirty()
\ No newline at end of file
@@ -3,26 +3,195 @@ try:
     import usocket as socket
 except:
     import socket
-import ustruct as struct
-from ubinascii import hexlify
+try:
+    import ustruct as struct
+except:
+    import struct
+try:
+    import uselect as select
+except:
+    import select
+try:
+    from time import ticks_ms, ticks_diff
+except:
+    from time import monotonic
+
+    def ticks_ms():
+        return int(monotonic() * 1000)
+
+    def ticks_diff(a, b):
+        return a - b
+
+# Packet types _wait_msg() consumes whole: PUBLISH, PUBACK, PUBREC, PUBREL,
+# PUBCOMP and PINGRESP
+_CONSUMED = (0x30, 0x40, 0x50, 0x60, 0x70, 0xd0)
 
 class MQTTException(Exception):
     pass
 
+class _Node:
+    __slots__ = ("children", "plus", "hash", "handlers")
+
+    def __init__(self):
+        self.children = []  # (topic level bytes, _Node) pairs
+        self.plus = None  # _Node for a "+" level
+        self.hash = None  # Handlers of a "#" level
+        self.handlers = None  # Handlers of filters ending here
+
+# Dispatches messages to handlers registered per topic filter, without
+# copying the topic: it may be a memoryview into the receive buffer (see
+# set_callback(zero_copy=True)) and is only ever indexed and compared.
+#
+# Filters without wildcards are found with two dict lookups, on the topic
+# length and on its byte at the position that best tells topics of that
+# length apart, then one comparison. Filters with "+" or "#" are compiled
+# into a trie of topic levels, walked in place by scanning the topic for
+# "/", so they cost one step per level however many there are. "+" matches
+# one level and "#" any number of trailing levels; neither matches a first
+# level starting with "$". Pass the router's dispatch as the client
+# callback, and subscribe to its filters with one packet:
+#
+#   router.add(b"weather/+/pressure", on_pressure)
+#   client.set_callback(router.dispatch, zero_copy=True)
+#   client.subscribe_many(router.filters)
+class TopicRouter:
+
+    def __init__(self):
+        self._topics = {}  # Length -> [topic, handlers] for filters without wildcards
+        self._exact = {}  # Length -> (byte position, {byte: [[topic, handlers], ...]})
+        self._root = _Node()
+        self._wild = False  # Whether any filter has a wildcard
+        self.filters = []  # (topic filter, qos) in the order added
+
+    def add(self, topic_filter, handler, qos=0):
+        if isinstance(topic_filter, str):
+            topic_filter = topic_filter.encode()
+        levels = topic_filter.split(b"/")
+        if b"+" in levels or b"#" in levels:
+            self._add_wild(levels, handler)
+        else:
+            self._add_exact(topic_filter, handler)
+        for i in range(len(self.filters)):
+            if self.filters[i][0] == topic_filter:
+                if qos > self.filters[i][1]:
+                    self.filters[i] = (topic_filter, qos)
+                return
+        self.filters.append((topic_filter, qos))
+
+    def _add_exact(self, topic, handler):
+        size = len(topic)
+        entries = self._topics.setdefault(size, [])
+        for entry in entries:
+            if entry[0] == topic:
+                entry[1].append(handler)
+                return
+        entries.append([topic, [handler]])
+        # Index on the byte position with the most distinct values
+        best, best_count = 0, 0
+        for pos in range(size):
+            count = len(set(entry[0][pos] for entry in entries))
+            if count > best_count:
+                best, best_count = pos, count
+        groups = {}
+        for entry in entries:
+            groups.setdefault(entry[0][best], []).append(entry)
+        self._exact[size] = (best, groups)
+
+    def _add_wild(self, levels, handler):
+        self._wild = True
+        node = self._root
+        for i in range(len(levels)):
+            level = levels[i]
+            if level == b"#":
+                assert i == len(levels) - 1, "# must be the last level"
+                if node.hash is None:
+                    node.hash = []
+                node.hash.append(handler)
+                return
+            if level == b"+":
+                if node.plus is None:
+                    node.plus = _Node()
+                node = node.plus
+                continue
+            for child_level, child in node.children:
+                if child_level == level:
+                    node = child
+                    break
+            else:
+                child = _Node()
+                node.children.append((level, child))
+                node = child
+        if node.handlers is None:
+            node.handlers = []
+        node.handlers.append(handler)
+
+    # Calls every handler whose filter matches topic with (topic, msg), and
+    # returns how many were called. topic may be bytes or a memoryview.
+    def dispatch(self, topic, msg):
+        called = 0
+        index = self._exact.get(len(topic))
+        if index is not None:
+            entries = index[1].get(topic[index[0]])
+            if entries is not None:
+                for entry in entries:
+                    if topic == entry[0]:
+                        for handler in entry[1]:
+                            handler(topic, msg)
+                        called = len(entry[1])
+                        break
+        if self._wild:
+            called += self._walk(self._root, topic, 0, msg)
+        return called
+
+    def _walk(self, node, topic, pos, msg):
+        # pos is where the next level starts, or past the end if there is none
+        called = 0
+        n = len(topic)
+        wild = pos or n == 0 or topic[0] != 36  # No wildcards for a leading "$"
+        if node.hash is not None and wild:
+            for handler in node.hash:
+                handler(topic, msg)
+            called += len(node.hash)
+        if pos > n:
+            if node.handlers is not None:
+                for handler in node.handlers:
+                    handler(topic, msg)
+                called += len(node.handlers)
+            return called
+        end = pos
+        while end < n and topic[end] != 47:  # "/"
+            end += 1
+        size = end - pos
+        for level, child in node.children:
+            if len(level) != size:
+                continue
+            i = 0
+            while i < size and topic[pos + i] == level[i]:
+                i += 1
+            if i == size:
+                called += self._walk(child, topic, end + 1, msg)
+                break
+        if node.plus is not None and wild:
+            called += self._walk(node.plus, topic, end + 1, msg)
+        return called
+
 class MQTTClient:
 
     def __init__(self, client_id, server, port=0, user=None, password=None, keepalive=0,
-                 ssl=False, ssl_params={}):
+                 ssl=False, ssl_params={}, buffer_size=512, max_packet_size=0, max_inflight=8):
         if port == 0:
             port = 8883 if ssl else 1883
         self.client_id = client_id
         self.sock = None
+        self._poll = None
+        self._wpoll = None
         self.server = server
         self.port = port
         self.ssl = ssl
         self.ssl_params = ssl_params
         self.pid = 0
         self.cb = None
+        self.zero_copy = False
         self.user = user
         self.pswd = password
         self.keepalive = keepalive
@@ -30,23 +199,159 @@ class MQTTClient:
         self.lw_msg = None
         self.lw_qos = 0
         self.lw_retain = False
+        # Receive buffer: bytes [_head, _tail) have been read but not parsed
+        self._buf = bytearray(buffer_size)
+        self._view = memoryview(self._buf)
+        self._head = 0
+        self._tail = 0
+        # PUBLISH packets larger than this are dropped unread (0: no limit)
+        self.max_packet_size = max_packet_size
+        self.skipped = 0
+        self._discard = 0  # Bytes of a dropped packet still to arrive
+        # QoS 1 and 2 messages published but not yet acknowledged, by packet
+        # id: [topic, msg, retain, qos], or None once a QoS 2 message has been
+        # received by the broker and only its PUBREL is outstanding
+        self.max_inflight = max_inflight
+        self._inflight = {}
+        self._received_qos2 = set()  # Packet ids of QoS 2 messages awaiting PUBREL
+        self._ack = bytearray(4)
+
+    def _fill(self, n, block=True):
+        # Make sure at least n unparsed bytes are buffered, reading whatever
+        # has arrived. The socket is non-blocking: with block, this waits for
+        # data with poll(), otherwise it returns False if the bytes have not
+        # all arrived yet, keeping those that have.
+        if self._head == self._tail:
+            self._head = self._tail = 0
+        unread = self._tail - self._head
+        if unread >= n:
+            return True
+        if self._head + n > len(self._buf):
+            if n > len(self._buf):
+                buf = bytearray(n)
+                buf[:unread] = self._view[self._head:self._tail]
+                self._buf = buf
+                self._view = memoryview(buf)
+            else:
+                buf = self._buf
+                head = self._head
+                for i in range(unread):  # Overlapping, so copy forwards
+                    buf[i] = buf[head + i]
+            self._head = 0
+            self._tail = unread
+        while self._tail - self._head < n:
+            got = self.sock.readinto(self._view[self._tail:])
+            if got is None:
+                if not block:
+                    return False
+                self._poll.poll()
+            elif not got:
+                raise OSError(-1)
+            else:
+                self._tail += got
+        return True
+
+    def _read(self, n):
+        # Consume n bytes, returned as a view into the receive buffer that is
+        # only valid until the next read
+        self._fill(n)
+        self._head += n
+        return self._view[self._head - n:self._head]
+
+    def _read_byte(self):
+        self._fill(1)
+        self._head += 1
+        return self._buf[self._head - 1]
+
+    def _skip(self, n):
+        # Discard n bytes, a buffer's worth at a time
+        while n:
+            step = min(n, len(self._buf))
+            self._fill(step)
+            self._head += step
+            n -= step
+
+    def _discard_pending(self, block):
+        # Drop what has arrived of a dropped packet. Returns True once all of
+        # it has gone.
+        while self._discard:
+            if self._head == self._tail and not self._fill(1, block):
+                return False
+            step = min(self._discard, self._tail - self._head)
+            self._head += step
+            self._discard -= step
+        return True
+
+    def _packet_size(self):
+        # Size of the next packet, fixed header included, or 0 if its
+        # remaining length has not all arrived yet
+        buf = self._buf
+        pos = self._head + 1
+        n = 0
+        sh = 0
+        while pos < self._tail:
+            b = buf[pos]
+            pos += 1
+            n |= (b & 0x7f) << sh
+            if not b & 0x80:
+                return pos - self._head + n
+            sh += 7
+        return 0
+
+    def _write(self, data, n=-1):
+        # Write data, or its first n bytes, waiting with poll() whenever the
+        # non-blocking socket's send buffer is full
+        if isinstance(data, str):
+            data = data.encode()
+        view = memoryview(data)
+        if n < 0:
+            n = len(view)
+        pos = 0
+        while pos < n:
+            sent = self.sock.write(view[pos:n])
+            if sent is None:
+                self._wpoll.poll()
+            else:
+                pos += sent
 
     def _send_str(self, s):
-        self.sock.write(struct.pack("!H", len(s)))
-        self.sock.write(s)
+        self._write(struct.pack("!H", len(s)))
+        self._write(s)
+
+    def _send_ack(self, op, pid):
+        # PUBACK, PUBREC, PUBREL or PUBCOMP for a packet id
+        ack = self._ack
+        ack[0] = op
+        ack[1] = 2
+        ack[2] = pid >> 8
+        ack[3] = pid & 0xff
+        self._write(ack)
+
+    def _next_pid(self):
+        pid = self.pid
+        while 1:
+            pid = pid % 65535 + 1
+            if pid not in self._inflight:
+                self.pid = pid
+                return pid
 
     def _recv_len(self):
         n = 0
         sh = 0
         while 1:
-            b = self.sock.read(1)[0]
+            b = self._read_byte()
             n |= (b & 0x7f) << sh
             if not b & 0x80:
                 return n
             sh += 7
 
-    def set_callback(self, f):
+    # With zero_copy, the callback gets the topic and message as memoryviews
+    # into the receive buffer instead of new bytes. They are only valid until
+    # the callback returns, so copy anything that is kept, and don't call the
+    # client's receive methods (or publish with QoS) from the callback.
+    def set_callback(self, f, zero_copy=False):
         self.cb = f
+        self.zero_copy = zero_copy
 
     def set_last_will(self, topic, msg, retain=False, qos=0):
         assert 0 <= qos <= 2
@@ -58,11 +363,19 @@ class MQTTClient:
 
     def connect(self, clean_session=True):
         self.sock = socket.socket()
+        self._head = self._tail = 0
         addr = socket.getaddrinfo(self.server, self.port)[0][-1]
         self.sock.connect(addr)
         if self.ssl:
             import ussl
             self.sock = ussl.wrap_socket(self.sock, **self.ssl_params)
+        # From here on the socket never blocks; poll() does the waiting
+        self.sock.setblocking(False)
+        self._poll = select.poll()
+        self._poll.register(self.sock, select.POLLIN)
+        self._wpoll = select.poll()
+        self._wpoll.register(self.sock, select.POLLOUT)
+        self._discard = 0
         premsg = bytearray(b"\x10\0\0\0\0\0")
         msg = bytearray(b"\x04MQTT\x04\x02\0\0")
 
@@ -87,9 +400,8 @@ class MQTTClient:
             i += 1
         premsg[i] = sz
 
-        self.sock.write(premsg, i + 2)
-        self.sock.write(msg)
-        #print(hex(len(msg)), hexlify(msg, ":"))
+        self._write(premsg, i + 2)
+        self._write(msg)
         self._send_str(self.client_id)
         if self.lw_topic:
             self._send_str(self.lw_topic)
@@ -97,22 +409,54 @@ class MQTTClient:
         if self.user is not None:
             self._send_str(self.user)
             self._send_str(self.pswd)
-        resp = self.sock.read(4)
+        resp = self._read(4)
         assert resp[0] == 0x20 and resp[1] == 0x02
         if resp[3] != 0:
             raise MQTTException(resp[3])
-        return resp[2] & 1
+        present = resp[2] & 1
+        if clean_session:
+            self._received_qos2.clear()
+        self._resend()
+        return present
+
+    # Sends again, in packet id order, what the broker had not acknowledged
+    # when the last connection dropped: QoS 1 and 2 messages with the DUP
+    # flag set, and PUBREL for QoS 2 messages it had already received.
+    def _resend(self):
+        for pid in sorted(self._inflight):
+            entry = self._inflight[pid]
+            if entry is None:
+                self._send_ack(0x62, pid)
+            else:
+                self._send_publish(entry[0], entry[1], entry[2], entry[3], pid, True)
 
     def disconnect(self):
-        self.sock.write(b"\xe0\0")
+        self._write(b"\xe0\0")
         self.sock.close()
 
     def ping(self):
-        self.sock.write(b"\xc0\0")
+        self._write(b"\xc0\0")
 
+    # Publishes msg on topic. QoS 1 and 2 messages don't wait for their
+    # acknowledgement: up to max_inflight of them may be outstanding, and
+    # publish() only waits, processing incoming packets, once the window is
+    # full. Returns the packet id (0 for QoS 0). Call flush() to wait until
+    # every message has been acknowledged.
     def publish(self, topic, msg, retain=False, qos=0):
+        assert 0 <= qos <= 2
+        pid = 0
+        if qos:
+            while len(self._inflight) >= self.max_inflight:
+                self._process(True)
+            pid = self._next_pid()
+            # Kept before sending, so it is resent if the connection drops
+            self._inflight[pid] = [topic, msg, retain, qos]
+        self._send_publish(topic, msg, retain, qos, pid, False)
+        return pid
+
+    def _send_publish(self, topic, msg, retain, qos, pid, dup):
         pkt = bytearray(b"\x30\0\0\0")
-        pkt[0] |= qos << 1 | retain
+        pkt[0] |= dup << 3 | qos << 1 | retain
         sz = 2 + len(topic) + len(msg)
         if qos > 0:
             sz += 2
@@ -123,86 +467,194 @@ class MQTTClient:
             sz >>= 7
             i += 1
         pkt[i] = sz
-        #print(hex(len(pkt)), hexlify(pkt, ":"))
-        self.sock.write(pkt, i + 1)
+        self._write(pkt, i + 1)
         self._send_str(topic)
         if qos > 0:
-            self.pid += 1
-            pid = self.pid
             struct.pack_into("!H", pkt, 0, pid)
-            self.sock.write(pkt, 2)
-        self.sock.write(msg)
-        if qos == 1:
-            while 1:
-                op = self.wait_msg()
-                if op == 0x40:
-                    sz = self.sock.read(1)
-                    assert sz == b"\x02"
-                    rcv_pid = self.sock.read(2)
-                    rcv_pid = rcv_pid[0] << 8 | rcv_pid[1]
-                    if pid == rcv_pid:
-                        return
-        elif qos == 2:
-            assert 0
+            self._write(pkt, 2)
+        self._write(msg)
+
+    # Waits until every QoS 1 and 2 message published has been acknowledged,
+    # delivering any messages that arrive meanwhile
+    def flush(self):
+        while self._inflight:
+            self._process(True)
+
+    @property
+    def inflight(self):
+        return len(self._inflight)
 
     def subscribe(self, topic, qos=0):
+        self.subscribe_many(((topic, qos),))
+
+    # Subscribes to several topic filters, a list of (topic, qos) pairs, with
+    # one SUBSCRIBE packet and a single round trip
+    def subscribe_many(self, topics):
         assert self.cb is not None, "Subscribe callback is not set"
         pkt = bytearray(b"\x82\0\0\0")
-        self.pid += 1
-        struct.pack_into("!BH", pkt, 1, 2 + 2 + len(topic) + 1, self.pid)
-        #print(hex(len(pkt)), hexlify(pkt, ":"))
-        self.sock.write(pkt)
-        self._send_str(topic)
-        self.sock.write(qos.to_bytes(1, "little"))
+        sz = 2
+        for topic, qos in topics:
+            sz += 2 + len(topic) + 1
+        i = 1
+        while sz > 0x7f:
+            pkt[i] = (sz & 0x7f) | 0x80
+            sz >>= 7
+            i += 1
+        pkt[i] = sz
+        self._write(pkt, i + 1)
+        pid = self._next_pid()
+        struct.pack_into("!H", pkt, 0, pid)
+        self._write(pkt, 2)
+        for topic, qos in topics:
+            self._send_str(topic)
+            self._write(qos.to_bytes(1, "little"))
         while 1:
             op = self.wait_msg()
             if op == 0x90:
-                resp = self.sock.read(4)
+                sz = self._recv_len()
+                resp = self._read(sz)
                 #print(resp)
-                assert resp[1] == pkt[2] and resp[2] == pkt[3]
-                if resp[3] == 0x80:
-                    raise MQTTException(resp[3])
+                assert resp[0] == pid >> 8 and resp[1] == pid & 0xff
+                for i in range(2, sz):
+                    if resp[i] == 0x80:
+                        raise MQTTException(resp[i])
                 return
+            if op is not None:
+                self._skip(self._recv_len())
 
     # Wait for a single incoming MQTT message and process it.
     # Subscribed messages are delivered to a callback previously
     # set by .set_callback() method. Other (internal) MQTT
     # messages processed internally.
     def wait_msg(self):
-        res = self.sock.read(1)
-        self.sock.setblocking(True)
-        if res is None:
+        op = self._wait_msg(True)
+        if op is not None and op & 0xf0 not in _CONSUMED:
+            return op
+
+    def _process(self, block):
+        # Process the next packet, discarding the body of any the client has
+        # no use for here, such as a stray SUBACK. Returns its first byte, or
+        # None if no whole packet has arrived and block is False.
+        op = self._wait_msg(block)
+        if op is not None and op & 0xf0 not in _CONSUMED:
+            self._skip(self._recv_len())
+        return op
+
+    def _wait_msg(self, block):
+        # Process the next packet once all of it has arrived and return its
+        # first byte. Without block, returns None if it has not arrived yet,
+        # keeping any part that has for the next call. Packet types in
+        # _CONSUMED are consumed; for others only the first byte is.
+        if self._discard and not self._discard_pending(block):
             return None
-        if res == b"":
-            raise OSError(-1)
-        if res == b"\xd0":  # PINGRESP
-            sz = self.sock.read(1)[0]
-            assert sz == 0
+        if not self._fill(2, block):  # Every packet has at least two bytes
             return None
-        op = res[0]
-        if op & 0xf0 != 0x30:
-            return op
-        sz = self._recv_len()
-        topic_len = self.sock.read(2)
-        topic_len = (topic_len[0] << 8) | topic_len[1]
-        topic = self.sock.read(topic_len)
-        sz -= topic_len + 2
-        if op & 6:
-            pid = self.sock.read(2)
-            pid = pid[0] << 8 | pid[1]
-            sz -= 2
-        msg = self.sock.read(sz)
-        self.cb(topic, msg)
+        size = self._packet_size()
+        while not size:
+            if not self._fill(self._tail - self._head + 1, block):
+                return None
+            size = self._packet_size()
+        buf = self._buf
+        op = buf[self._head]
+        if op & 0xf0 == 0x30 and self.max_packet_size and size > self.max_packet_size:
+            # Too big: drop it as it arrives, keeping only the packet id so it
+            # can still be acknowledged
+            pos = 1
+            while buf[self._head + pos] & 0x80:
+                pos += 1
+            pos += 1
+            if not self._fill(pos + 2, block):
+                return None
+            buf = self._buf
+            pos += 2 + ((buf[self._head + pos] << 8) | buf[self._head + pos + 1])
+            if op & 6:
+                if not self._fill(pos + 2, block):
+                    return None
+                buf = self._buf
+                pid = buf[self._head + pos] << 8 | buf[self._head + pos + 1]
+            self._discard = size
+            self.skipped += 1
+            self._discard_pending(block)
+        else:
+            if not self._fill(size, block):
+                return None
+            self._head += 1
+            if op == 0xd0:  # PINGRESP
+                sz = self._read_byte()
+                assert sz == 0
+                return op
+            kind = op & 0xf0
+            if kind == 0x40 or kind == 0x50 or kind == 0x60 or kind == 0x70:
+                # PUBACK, PUBREC, PUBREL or PUBCOMP: remaining length 2, packet id
+                buf = self._buf
+                pos = self._head + 1
+                pid = buf[pos] << 8 | buf[pos + 1]
+                self._head = pos + 2
+                if kind == 0x40 or kind == 0x70:  # QoS 1 or 2 publish complete
+                    self._inflight.pop(pid, None)
+                elif kind == 0x50:  # Broker has our QoS 2 message
+                    if pid in self._inflight:
+                        self._inflight[pid] = None
+                    self._send_ack(0x62, pid)
+                else:  # Broker released a QoS 2 message sent to us
+                    self._received_qos2.discard(pid)
+                    self._send_ack(0x70, pid)
+                return op
+            if kind != 0x30:
+                return op
+            sz = self._recv_len()
+            # The whole packet is parsed in place from the receive buffer
+            buf = self._buf
+            pos = self._head
+            end = pos + sz
+            topic_len = (buf[pos] << 8) | buf[pos + 1]
+            pos += 2
+            topic = self._view[pos:pos + topic_len]
+            pos += topic_len
+            if op & 6:
+                pid = buf[pos] << 8 | buf[pos + 1]
+                pos += 2
+            msg = self._view[pos:end]
+            self._head = end
+            if op & 6 == 4 and pid in self._received_qos2:
+                pass  # Redelivery of a QoS 2 message already passed on
+            elif self.zero_copy:
+                self.cb(topic, msg)
+            else:
+                self.cb(bytes(topic), bytes(msg))
         if op & 6 == 2:
-            pkt = bytearray(b"\x40\x02\0\0")
-            struct.pack_into("!H", pkt, 2, pid)
-            self.sock.write(pkt)
+            self._send_ack(0x40, pid)
         elif op & 6 == 4:
-            assert 0
+            self._received_qos2.add(pid)
+            self._send_ack(0x50, pid)
+        return op
 
     # Checks whether a pending message from server is available.
     # If not, returns immediately with None. Otherwise, does
-    # the same processing as wait_msg.
+    # the same processing as wait_msg. A message that has only
+    # partly arrived is kept and finished by a later call.
     def check_msg(self):
-        self.sock.setblocking(False)
-        return self.wait_msg()
+        op = self._wait_msg(False)
+        if op is not None and op & 0xf0 not in _CONSUMED:
+            return op
+
+    # Processes every packet that has already arrived, without blocking,
+    # and returns the number of messages received. Stops after
+    # max_messages, or once budget_ms has passed, leaving the rest for
+    # the next call. A packet that has only partly arrived is kept and
+    # finished by a later call. Acknowledgements for published messages
+    # are handled on the way.
+    def drain(self, max_messages=16, budget_ms=50):
+        start = ticks_ms()
+        received = 0
+        while received < max_messages:
+            if self._head == self._tail and not self._poll.poll(0):
+                break
+            op = self._process(False)
+            if op is None:
+                break
+            if op & 0xf0 == 0x30:
+                received += 1
+            if ticks_diff(ticks_ms(), start) >= budget_ms:
+                break
+        return received
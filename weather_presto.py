@@ -1,5 +1,5 @@
 from presto import Presto
-from umqttsimple import MQTTClient
+from umqttsimple import MQTTClient, TopicRouter
 import network
 import gc  # Garbage Collector
 from WIFI_CONFIG import SSID, PASSWORD
@@ -19,11 +19,12 @@ WHITE = display.create_pen(255, 255, 255)
 # MQTT Configuration
 MQTT_SERVER = "192.168.1.152"
 MQTT_PORT = 1883
-MQTT_TOPIC = "weather/prediction"
-PRESSURE_TOPIC = "weather/pressure"
-TEMP_TOPIC = "weather/temperature"
-CURRENT_TEMP = "weather/current_temperature"
+MQTT_TOPIC = b"weather/prediction"
+PRESSURE_TOPIC = b"weather/pressure"
+TEMP_TOPIC = b"weather/temperature"
+CURRENT_TEMP = b"weather/current_temperature"
 MQTT_CLIENT_ID = "weather"
+MQTT_MAX_PACKET = 1024  # Larger payloads are dropped rather than allocated
 
 # Initial pressure list (24 hourly values, default to zeros)
 pressure = [0] * 24  # Matches the 24 hourly values from your Python script
@@ -34,40 +35,52 @@ prediction = "Waiting for prediction..."[:50]
 
 current_temperature = 21
 
-def sub_cb(topic, msg):
-    """ MQTT Subscribe Callback: Updates global variables with received messages. """
-    global prediction, pressure, temperature, current_temperature
-    topic = topic.decode("utf-8")
-    msg = msg.decode("utf-8")
-    
-    if topic == MQTT_TOPIC:  # "weather/prediction"
-        print(f'Received MQTT: topic={topic}, msg={msg}')
-        prediction = msg[:50]  # Trim to 50 chars to avoid memory issues
-    if topic == PRESSURE_TOPIC:  # "weather/pressure"
-        try:
-            payload = json.loads(msg)
-            # Expecting {"last_24_pressures": [list of 24 values]}
-            pressure = payload["last_24_pressures"]
-            print(f"Pressure data received: {pressure}")
-        except (ValueError, KeyError) as e:
-            print(f"Error parsing pressure data: {e}")
-    if topic == TEMP_TOPIC:
-        try:
-            temp_payload = json.loads(msg)
-            # Expecting {"last_24_pressures": [list of 24 values]}
-            temperature = temp_payload["last_24_temperatures"]
-            print(f"Temperature data received: {temperature}")
-        except (ValueError, KeyError) as e:
-            print(f"Error parsing Temperature data: {e}")
-    if topic == CURRENT_TEMP:
-        try:
-            current_temp_payload = json.loads(msg)
-            # Expecting {"last_24_pressures": [list of 24 values]}
-            current_temperature = current_temp_payload["current_temperature"]
-            print(f"Current Temperature data received: {current_temperature}")
-        except (ValueError, KeyError) as e:
-            print(f"Error parsing Current Temperature data: {e}")
-            
+def json_field(msg, key, name):
+    """ Return msg's JSON value for key, or None if the payload is malformed. """
+    try:
+        return json.loads(msg)[key]
+    except (ValueError, KeyError) as e:
+        print(f"Error parsing {name} data: {e}")
+
+# MQTT handlers: topic and msg are memoryviews into the MQTT receive buffer,
+# only valid during the call; json.loads() parses msg without copying it.
+
+def on_prediction(topic, msg):
+    """ weather/prediction: the forecast text. """
+    global prediction
+    prediction = str(msg, "utf-8")[:50]  # Trim to 50 chars to avoid memory issues
+    print(f'Received MQTT: topic={bytes(topic)}, msg={prediction}')
+
+def on_pressure(topic, msg):
+    """ weather/pressure: {"last_24_pressures": [list of 24 values]} """
+    global pressure
+    value = json_field(msg, "last_24_pressures", "pressure")
+    if value is not None:
+        pressure = value
+        print(f"Pressure data received: {pressure}")
+
+def on_temperature(topic, msg):
+    """ weather/temperature: {"last_24_temperatures": [list of 24 values]} """
+    global temperature
+    value = json_field(msg, "last_24_temperatures", "Temperature")
+    if value is not None:
+        temperature = value
+        print(f"Temperature data received: {temperature}")
+
+def on_current_temperature(topic, msg):
+    """ weather/current_temperature: {"current_temperature": value} """
+    global current_temperature
+    value = json_field(msg, "current_temperature", "Current Temperature")
+    if value is not None:
+        current_temperature = value
+        print(f"Current Temperature data received: {current_temperature}")
+
+# Each topic goes straight to its handler; all are subscribed in one packet
+router = TopicRouter()
+router.add(MQTT_TOPIC, on_prediction)
+router.add(PRESSURE_TOPIC, on_pressure)
+router.add(TEMP_TOPIC, on_temperature)
+router.add(CURRENT_TEMP, on_current_temperature)
 
 def connect_wifi():
     """ Connect to Wi-Fi. """
@@ -85,16 +98,13 @@ def connect_wifi():
 
 def connect_and_subscribe():
     """ Connect to MQTT broker and subscribe to topics. """
-    global MQTT_CLIENT_ID, MQTT_SERVER, TEMP_TOPIC
+    global MQTT_CLIENT_ID, MQTT_SERVER
 
     print(f"Connecting to MQTT: {MQTT_CLIENT_ID} @ {MQTT_SERVER}:{MQTT_PORT}")
-    client = MQTTClient(MQTT_CLIENT_ID, MQTT_SERVER, keepalive=30)
-    client.set_callback(sub_cb)
+    client = MQTTClient(MQTT_CLIENT_ID, MQTT_SERVER, keepalive=30, max_packet_size=MQTT_MAX_PACKET)
+    client.set_callback(router.dispatch, zero_copy=True)
     client.connect()
-    client.subscribe(MQTT_TOPIC)
-    client.subscribe(PRESSURE_TOPIC)
-    client.subscribe(TEMP_TOPIC)
-    client.subscribe(CURRENT_TEMP)
+    client.subscribe_many(router.filters)
     return client
 
 def restart_reconnect():
@@ -121,29 +131,24 @@ except OSError:
     restart_reconnect()
 
 # Initialize PiChart
-pressure_chart = pichart.Chart(display, title="Pressure (hPa)")
+pressure_chart = pichart.Chart(display, title="Pressure (hPa)", capacity=24)
 pressure_chart.set_values(pressure)  # Initial values
-pressure_chart.min_val = 900  # Typical min atmospheric pressure in hPa
-pressure_chart.max_val = 1100  # Typical max atmospheric pressure in hPa
 
-container = pichart.Container(display)
+container = pichart.Container(display, presenter=presto)
 container.add_chart(pressure_chart)
 
 container.data_colour = {'red': 0, 'green': 0, 'blue': 255}  # Blue data
 pressure_chart.show_datapoints = True
 pressure_chart.show_lines = True
-pressure_chart.show_points = False
 pressure_chart.show_bars = False
 pressure_chart.show_y_axis = True
 pressure_chart.grid = True
 pressure_chart.scale_to_fit = True
 pressure_chart.grid_colour = {'red': 222, 'green': 222, 'blue': 222}
 
-temperature_chart = pichart.Chart(display, title="Temp °C")
+temperature_chart = pichart.Chart(display, title="Temp °C", capacity=24)
 
 temperature_chart.set_values(temperature)  # Initial values
-temperature_chart.min_val = -10  # Typical min temperature in °C
-temperature_chart.max_val = 30  # Typical max temperature in °C
 
 temperature_chart.scale_to_fit = True
 temperature_chart.data_colour = {'red': 0 , 'green':255, 'blue': 0}
@@ -157,14 +162,12 @@ forecast_card.title = "Forecast"
 forecast_card.background_colour = {'red': 0, 'green': 0, 'blue': 255}
 forecast_card.data_colour = {'red': 255, 'green': 255, 'blue': 255}
 forecast_card.title_colour = {'red': 0, 'green': 0, 'blue': 255}
-forecast_card.update()
 
 current_temp_card = pichart.Card(display, title="Temp")
 current_temp_card.title = "Current Temperature"
 current_temp_card.background_colour = {'red': 0, 'green': 0, 'blue': 255}
 current_temp_card.data_colour = {'red': 255, 'green': 0, 'blue': 0}
 current_temp_card.title_colour = {'red': 255, 'green': 0, 'blue': 0}
-current_temp_card.update()
 
 container.add_chart(forecast_card)
 container.add_chart(current_temp_card)
@@ -181,19 +184,17 @@ container.border_colour = {'red':242, 'green': 242, 'blue':242}
 current_temp_card.data_colour = {'red': 0, 'green': 255, 'blue': 0}
 temperature_chart.data_colour = GREEN
 pressure_chart.data_colour = ORANGE
-pressure_chart.update()
-temperature_chart.update()
-container.update()
+container.update()  # Draws every tile and presents once
 
 # Main loop: Poll MQTT and update display
 while True:
     try:
-        client.check_msg()  # Process incoming MQTT messages
+        client.drain()  # Process every MQTT message that has arrived
     except OSError as e:
         print(f"MQTT Error: {e}")
         restart_reconnect()
     
-    # Update chart with latest pressure values
+    # Update chart with latest pressure values; an hour's shift is a single append
     pressure_chart.set_values(pressure)  # Update chart data
     forecast_card.title = prediction  # Update forecast
     temperature_chart.set_values(temperature)
@@ -201,8 +202,7 @@ while True:
     current_temp_card.title = str(current_temperature)
 
 
-    container.update()
-    presto.update()
+    container.update()  # Redraws changed tiles and presents just that area
     
     gc.collect()  # Free up memory every loop iteration
     sleep(1)  # 5s update interval
\ No newline at end of file